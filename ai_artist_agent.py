@@ -5,14 +5,11 @@ Uses LangChain agents with Terminator-py tools to create art in MS Paint!
 """
 
 import asyncio
-import terminator
 import time
-import random
 import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Type
 
-from langchain_ollama import OllamaLLM
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import BaseTool
 from langchain.prompts import PromptTemplate
@@ -21,12 +18,35 @@ from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
 from langchain import hub
 
+from app_ready import open_and_wait_sync
+from shapes import grid, pattern_points, place, zigzag
+from stroke_optimizer import describe as describe_stroke, optimize_stroke
+from tool_runtime import shared_runtime
+
+# Size of each pattern in pixels when drawn around the canvas center
+PATTERN_SIZES = {
+    'circle': 50,
+    'line': 50,
+    'zigzag': 120,
+    'spiral': 36,
+    'square': 60,
+    'triangle': 60,
+    'heart': 40,
+    'star': 40,
+    'wave': 160,
+    'scribble': 60,
+}
+
 # Input schemas for tools
 class PaintInput(BaseModel):
     query: str = Field(description="Query or parameters for the paint tool")
 
+class PaintTool(BaseTool):
+    """Base for tools sharing one desktop and element cache across calls"""
+    runtime: Any = Field(default_factory=shared_runtime, exclude=True)
+
 # Custom Paint Tools using Terminator-py
-class PaintOpenTool(BaseTool):
+class PaintOpenTool(PaintTool):
     """Tool to open MS Paint"""
     name: str = "open_paint"
     description: str = "Opens Microsoft Paint application for drawing"
@@ -38,14 +58,15 @@ class PaintOpenTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
-            desktop.open_application('mspaint')
-            time.sleep(3)  # Wait for Paint to load
+            desktop = self.runtime.desktop
+            open_and_wait_sync(desktop, 'mspaint')
+            # Lookups index the new window once it is ready
+            self.runtime.forget('mspaint')
             return "✅ MS Paint opened successfully and ready for drawing!"
         except Exception as e:
             return f"❌ Failed to open Paint: {str(e)}"
 
-class PaintBrushTool(BaseTool):
+class PaintBrushTool(PaintTool):
     """Tool to select brush and draw"""
     name: str = "use_brush"
     description: str = "Select brush tool and draw on canvas. Input: 'size:small/medium/large, color:red/blue/green/etc'"
@@ -57,7 +78,7 @@ class PaintBrushTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             # Parse input
             parts = query.split(',')
@@ -70,19 +91,13 @@ class PaintBrushTool(BaseTool):
                 elif 'color:' in part:
                     color = part.split(':')[1].strip()
             
-            # Select brush tool
+            # Select brush tool (whichever selector worked last time goes first)
             try:
-                brush_btn = desktop.locator('name:Brush')
-                brush_btn.click()
+                self.runtime.resolver.resolve(desktop, 'mspaint', 'brush', ['name:Brush', 'automationid:BrushTool'],
+                                              action=lambda button: button.click())
                 time.sleep(0.5)
-            except:
-                # Try alternative selector
-                try:
-                    brush_btn = desktop.locator('automationid:BrushTool')
-                    brush_btn.click()
-                    time.sleep(0.5)
-                except:
-                    pass  # Continue anyway
+            except RuntimeError:
+                pass  # Continue anyway
             
             # Set color if possible
             color_map = {
@@ -105,7 +120,7 @@ class PaintBrushTool(BaseTool):
         except Exception as e:
             return f"❌ Failed to setup brush: {str(e)}"
 
-class PaintDrawTool(BaseTool):
+class PaintDrawTool(PaintTool):
     """Tool to draw on the canvas"""
     name: str = "draw_on_canvas"
     description: str = "Draw on the paint canvas. Input: 'pattern:circle/line/zigzag/spiral/dots/square/triangle/heart/star/wave'"
@@ -117,174 +132,43 @@ class PaintDrawTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             pattern = query.split(':')[1].strip() if ':' in query else query.strip()
             
             # Get canvas area (approximate center of screen for Paint)
             center_x, center_y = 400, 350
             
-            # Draw different patterns
-            if pattern == "circle":
-                self._draw_circle(desktop, center_x, center_y, 50)
-            elif pattern == "line":
-                self._draw_line(desktop, center_x - 50, center_y, center_x + 50, center_y)
-            elif pattern == "zigzag":
-                self._draw_zigzag(desktop, center_x - 60, center_y, 120, 40)
-            elif pattern == "spiral":
-                self._draw_spiral(desktop, center_x, center_y)
-            elif pattern == "dots":
+            # Draw different patterns (anything unknown becomes a random scribble)
+            if pattern == "dots":
                 self._draw_dots(desktop, center_x, center_y)
-            elif pattern == "square":
-                self._draw_square(desktop, center_x, center_y, 60)
-            elif pattern == "triangle":
-                self._draw_triangle(desktop, center_x, center_y, 60)
-            elif pattern == "heart":
-                self._draw_heart(desktop, center_x, center_y)
-            elif pattern == "star":
-                self._draw_star(desktop, center_x, center_y)
-            elif pattern == "wave":
-                self._draw_wave(desktop, center_x - 80, center_y, 160)
             else:
-                # Random scribble
-                self._draw_random_scribble(desktop, center_x, center_y)
+                shape = pattern if pattern in PATTERN_SIZES else "scribble"
+                if shape == "zigzag":
+                    # 120px wide from 60px left of center, dipping 40px below it at every other point
+                    points = place(zigzag(step=1 / 5, height=-1 / 3), center_x - 60, center_y + 20, 120)
+                else:
+                    points = pattern_points(shape, center_x, center_y, PATTERN_SIZES[shape])
+                self._draw_connected_points(desktop, points)
             
             return f"🎨 Drew {pattern} pattern on canvas!"
         
         except Exception as e:
             return f"❌ Failed to draw: {str(e)}"
     
-    def _draw_circle(self, desktop, x, y, radius):
-        """Draw a circle"""
-        import math
-        points = []
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            points.append((px, py))
-        
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_line(self, desktop, x1, y1, x2, y2):
-        """Draw a straight line"""
-        # Get canvas and use proper mouse methods
-        canvas = desktop.locator('name:Canvas')
-        canvas.mouse_click_and_hold(x1, y1)
-        time.sleep(0.1)
-        canvas.mouse_move(x2, y2)
-        canvas.mouse_release()
-    
-    def _draw_zigzag(self, desktop, start_x, start_y, width, height):
-        """Draw a zigzag pattern"""
-        points = []
-        num_peaks = 5
-        for i in range(num_peaks + 1):
-            x = start_x + (width * i / num_peaks)
-            y = start_y + (height if i % 2 == 1 else 0)
-            points.append((x, y))
-        
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_spiral(self, desktop, center_x, center_y):
-        """Draw a spiral"""
-        import math
-        points = []
-        for i in range(0, 720, 15):  # Two full rotations
-            angle = math.radians(i)
-            radius = i / 20  # Increasing radius
-            px = center_x + radius * math.cos(angle)
-            py = center_y + radius * math.sin(angle)
-            points.append((px, py))
-        
-        self._draw_connected_points(desktop, points)
-    
     def _draw_dots(self, desktop, center_x, center_y):
         """Draw a pattern of dots"""
         canvas = desktop.locator('name:Canvas')
-        for i in range(7):
-            for j in range(5):
-                x = center_x - 60 + i * 20
-                y = center_y - 40 + j * 20
-                canvas.click(x, y)
-                time.sleep(0.05)
-    
-    def _draw_square(self, desktop, center_x, center_y, size):
-        """Draw a square"""
-        half_size = size // 2
-        points = [
-            (center_x - half_size, center_y - half_size),
-            (center_x + half_size, center_y - half_size),
-            (center_x + half_size, center_y + half_size),
-            (center_x - half_size, center_y + half_size),
-            (center_x - half_size, center_y - half_size)  # Close the square
-        ]
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_triangle(self, desktop, center_x, center_y, size):
-        """Draw a triangle"""
-        import math
-        height = size * math.sqrt(3) / 2
-        points = [
-            (center_x, center_y - height/2),
-            (center_x - size/2, center_y + height/2),
-            (center_x + size/2, center_y + height/2),
-            (center_x, center_y - height/2)  # Close the triangle
-        ]
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_heart(self, desktop, center_x, center_y):
-        """Draw a heart shape"""
-        import math
-        points = []
-        for i in range(0, 360, 10):
-            t = math.radians(i)
-            # Heart equation in parametric form
-            x = 16 * math.sin(t)**3
-            y = -(13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
-            points.append((center_x + x*2, center_y + y*2))
-        
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_star(self, desktop, center_x, center_y):
-        """Draw a 5-pointed star"""
-        import math
-        points = []
-        for i in range(11):  # 10 points + close
-            angle = math.radians(i * 36)  # 36 degrees between points
-            radius = 40 if i % 2 == 0 else 20  # Alternate between outer and inner points
-            x = center_x + radius * math.cos(angle - math.pi/2)
-            y = center_y + radius * math.sin(angle - math.pi/2)
-            points.append((x, y))
-        
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_wave(self, desktop, start_x, start_y, width):
-        """Draw a wave pattern"""
-        import math
-        points = []
-        for i in range(0, width, 5):
-            x = start_x + i
-            y = start_y + 30 * math.sin(i * 0.1)
-            points.append((x, y))
-        
-        self._draw_connected_points(desktop, points)
-    
-    def _draw_random_scribble(self, desktop, center_x, center_y):
-        """Draw a random scribble"""
-        points = []
-        x, y = center_x, center_y
-        for _ in range(15):
-            x += random.randint(-30, 30)
-            y += random.randint(-30, 30)
-            points.append((x, y))
-        
-        self._draw_connected_points(desktop, points)
+        for x, y in place(grid(7, 5), center_x, center_y, (120, 80)):
+            canvas.click(int(x), int(y))
+            time.sleep(0.05)
     
     def _draw_connected_points(self, desktop, points):
         """Draw connected points (lines between them)"""
-        if not points:
+        if len(points) == 0:
             return
         
+        points, stats = optimize_stroke(points)
+        print(describe_stroke(stats))
         canvas = desktop.locator('name:Canvas')
         
         # Move to first point and start drawing
@@ -298,7 +182,7 @@ class PaintDrawTool(BaseTool):
         
         canvas.mouse_release()
 
-class PaintShapeTool(BaseTool):
+class PaintShapeTool(PaintTool):
     """Tool to use shape tools in Paint"""
     name: str = "use_shape"
     description: str = "Select and draw shapes. Input: 'shape:rectangle/ellipse/line/curve'"
@@ -310,7 +194,7 @@ class PaintShapeTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             shape = query.split(':')[1].strip() if ':' in query else query.strip()
             
             # Try to select shape tool
@@ -346,7 +230,7 @@ class PaintShapeTool(BaseTool):
         except Exception as e:
             return f"❌ Failed to use shape tool: {str(e)}"
 
-class PaintTextTool(BaseTool):
+class PaintTextTool(PaintTool):
     """Tool to add text to the painting"""
     name: str = "add_text"
     description: str = "Add text to the painting. Input: 'text:Your message here'"
@@ -358,7 +242,7 @@ class PaintTextTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             text = query.split(':', 1)[1].strip() if ':' in query else query.strip()
             
             # Select text tool
@@ -387,20 +271,21 @@ class PaintTextTool(BaseTool):
 class AIArtistAgent:
     """AI Artist Agent that autonomously creates art using Paint tools"""
     
-    def __init__(self):
-        """Initialize the AI Artist Agent"""
+    def __init__(self, runtime=None):
+        """Initialize the AI Artist Agent (tools share one runtime)"""
         print("🎨 Initializing AI Artist Agent...")
+        self.runtime = runtime or shared_runtime()
         
         # Initialize LLM
-        self.llm = OllamaLLM(model="deepseek-r1:1.5b")
+        self.llm = self.runtime.llm("deepseek-r1:1.5b")
         
         # Initialize tools
         self.tools = [
-            PaintOpenTool(),
-            PaintBrushTool(),
-            PaintDrawTool(),
-            PaintShapeTool(),
-            PaintTextTool()
+            PaintOpenTool(runtime=self.runtime),
+            PaintBrushTool(runtime=self.runtime),
+            PaintDrawTool(runtime=self.runtime),
+            PaintShapeTool(runtime=self.runtime),
+            PaintTextTool(runtime=self.runtime)
         ]
         
         # Create agent prompt
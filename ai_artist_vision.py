@@ -5,18 +5,13 @@ Uses Gemma3 with vision to see and verify its own artwork in MS Paint!
 """
 
 import asyncio
-import terminator
 import time
 import random
 import json
-import base64
-import os
-from datetime import datetime
 from typing import List, Dict, Any, Optional, Type
 from io import BytesIO
 from PIL import Image
 
-from langchain_ollama import OllamaLLM
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import BaseTool
 from langchain.prompts import PromptTemplate
@@ -25,6 +20,20 @@ from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
 from langchain import hub
 
+from app_ready import open_and_wait_sync
+from canvas_capture import canvas_bounds, describe as describe_capture, process_capture, to_base64
+from capture_store import shared_store
+from change_detection import crop_region, shared_detector
+from vision_cache import shared_vision_cache
+from delay_calibration import shared_calibrator
+from stroke_executor import StrokeExecutor, describe as describe_drawing, parse_composition, parse_shape, shape_stroke
+from tool_runtime import shared_runtime
+
+# Vision model that analyzes the captures (also picks the capture resolution)
+VISION_MODEL = "gemma3:4b-it-q4_K_M"
+# Elements the drawing tools need, listed first when Paint opens
+OPEN_GOAL = "canvas brush colors shapes"
+
 # Input schemas for tools
 class PaintInput(BaseModel):
     query: str = Field(description="Query or parameters for the paint tool")
@@ -32,78 +41,65 @@ class PaintInput(BaseModel):
 class VisionInput(BaseModel):
     query: str = Field(description="Description of what to look for in the image")
 
-class InspectUIInput(BaseModel):
-    app_name: str = Field(description="Application name to inspect (default: 'mspaint')")
+class PaintTool(BaseTool):
+    """Base for tools sharing one desktop, element cache and LLM clients across calls"""
+    runtime: Any = Field(default_factory=shared_runtime, exclude=True)
 
 # UI Inspector Tool
-class InspectUITool(BaseTool):
-    """Tool to inspect the full UI tree of Paint and find element IDs"""
+def parse_inspect_query(query):
+    """Split an inspect_paint_ui input like 'goal:brush red, full:true' into (app_name, goal, full)
+
+    'app:' defaults to mspaint; text without a key is taken as the goal.
+    """
+    app_name = "mspaint"
+    goal = ""
+    full = False
+
+    # ReAct agents often quote their action input
+    for part in query.strip().strip('"\'').split(','):
+        key, sep, value = part.partition(':')
+        key, value = key.strip().lower(), value.strip()
+        if not sep:
+            if key in ("mspaint", "paint"):
+                continue
+            goal = f"{goal} {part.strip()}".strip()
+        elif key == 'app':
+            app_name = value or app_name
+        elif key == 'goal':
+            goal = value
+        elif key == 'full':
+            full = value.lower() in ('true', 'yes', '1')
+    return app_name, goal, full
+
+class InspectUITool(PaintTool):
+    """Tool to inspect the Paint UI tree and find element IDs"""
     name: str = "inspect_paint_ui"
-    description: str = "Inspect the full Paint UI tree to find available elements and their IDs"
-    args_schema: Type[BaseModel] = InspectUIInput
+    description: str = "Inspect the Paint UI to find available elements and their IDs. Input: 'goal:brush red' to list matching elements first, add 'full:true' to list every element again"
+    args_schema: Type[BaseModel] = PaintInput
     
     def _run(
         self, 
-        app_name: str = "mspaint", 
+        query: str = "", 
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            app_name, goal, full = parse_inspect_query(query)
             
-            # Get the Paint application window
+            # Crawl the Paint window once; after the first listing only changes are reported
             try:
-                paint_app = desktop.application(app_name)
-                ui_tree = self._get_ui_tree(paint_app)
+                # Compact listing within a fixed token budget keeps later prompts small
+                ui_tree = self.runtime.inspector.inspect(app_name, goal=goal, full=full)
                 
-                return f"""🔍 PAINT UI TREE INSPECTION:
-
-{ui_tree}
-
-🎯 RECOMMENDED SELECTORS:
-Use these precise selectors in other tools:
-- Canvas: 'automationid:Canvas' or 'name:Canvas'
-- Brush Tool: 'automationid:BrushTool' or 'name:Brush'
-- Colors: Look for elements with 'color' in name/id
-- Shapes: Look for 'Rectangle', 'Ellipse', etc. in automationid
-- Text Tool: 'automationid:TextTool' or 'name:Text'
-
-Use format: desktop.locator('automationid:ElementID') for best reliability!"""
+                return f"🔍 PAINT UI ({app_name}):\n{ui_tree}"
                 
             except Exception as e:
                 return f"❌ Could not inspect Paint UI: {str(e)}. Make sure Paint is open!"
                 
         except Exception as e:
             return f"❌ Failed to inspect UI: {str(e)}"
-    
-    def _get_ui_tree(self, element, level=0, max_level=3):
-        """Recursively get UI tree structure"""
-        if level > max_level:
-            return ""
-        
-        indent = "  " * level
-        try:
-            name = getattr(element, 'name', 'Unknown')
-            automation_id = getattr(element, 'automation_id', 'No ID')
-            element_type = getattr(element, 'control_type', 'Unknown Type')
-            
-            tree_info = f"{indent}├─ {element_type}: '{name}' (ID: {automation_id})\n"
-            
-            # Get children if available and not too deep
-            if level < max_level:
-                try:
-                    children = element.children() if hasattr(element, 'children') else []
-                    for child in children[:10]:  # Limit to first 10 children to avoid spam
-                        tree_info += self._get_ui_tree(child, level + 1, max_level)
-                except:
-                    pass
-                    
-            return tree_info
-            
-        except Exception as e:
-            return f"{indent}├─ [Error reading element: {str(e)}]\n"
 
 # Vision-enabled Paint Tools
-class PaintOpenTool(BaseTool):
+class PaintOpenTool(PaintTool):
     """Tool to open MS Paint"""
     name: str = "open_paint"
     description: str = "Opens Microsoft Paint application for drawing"
@@ -115,22 +111,21 @@ class PaintOpenTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
-            desktop.open_application('mspaint')
-            time.sleep(3)  # Wait for Paint to load
+            open_and_wait_sync(self.runtime.desktop, 'mspaint')
+            # Index and inspect the new window, not one from an earlier run
+            self.runtime.forget('mspaint')
             
             # After opening, inspect the UI to provide element info
-            inspector = InspectUITool()
-            ui_info = inspector._run("mspaint")
+            ui_info = self.runtime.tool(InspectUITool)._run(f"goal:{OPEN_GOAL}, full:true")
             
             return f"✅ MS Paint opened successfully and ready for drawing!\n\n{ui_info}"
         except Exception as e:
             return f"❌ Failed to open Paint: {str(e)}"
 
-class PaintBrushTool(BaseTool):
+class PaintBrushTool(PaintTool):
     """Tool to select brush and configure drawing settings"""
     name: str = "use_brush"
-    description: str = "Select brush tool and configure settings. Input: 'size:small/medium/large, color:red/blue/green/etc'"
+    description: str = "Select brush tool and configure settings. Input: 'size:small/medium/large, color:red/blue/green/etc'; color (or brush) can also be a control number from inspect_paint_ui, e.g. 'color:#12'"
     args_schema: Type[BaseModel] = PaintInput
     
     def _run(
@@ -139,18 +134,21 @@ class PaintBrushTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             # Parse input
             parts = query.split(',')
             size = "medium"
             color = "black"
+            brush = None
             
             for part in parts:
                 if 'size:' in part:
                     size = part.split(':')[1].strip()
                 elif 'color:' in part:
                     color = part.split(':')[1].strip()
+                elif 'brush:' in part:
+                    brush = part.split(':')[1].strip()
             
             # Try multiple selector strategies for brush tool
             brush_selectors = [
@@ -160,19 +158,19 @@ class PaintBrushTool(BaseTool):
                 'class:Button name:Brush'
             ]
             
-            brush_selected = False
-            for selector in brush_selectors:
-                try:
-                    brush_btn = desktop.locator(selector)
-                    brush_btn.click()
-                    brush_selected = True
-                    print(f"✅ Brush selected using: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Failed with {selector}: {e}")
-                    continue
-            
-            if not brush_selected:
+            # Best-ranked selector first: after a warm-up run this is a single attempt
+            resolver = self.runtime.resolver
+            click = lambda button: button.click()
+            try:
+                if brush and brush.startswith('#'):
+                    # A control number from the inspection names the button directly
+                    desktop.locator(brush).click()
+                    selector = brush
+                else:
+                    _, selector = resolver.resolve(desktop, 'mspaint', 'brush', brush_selectors, action=click)
+                print(f"✅ Brush selected using: {selector}")
+            except RuntimeError as e:
+                print(f"❌ {e}")
                 return "⚠️ Could not select brush tool. Paint may not be open or UI changed."
             
             # Try to select color using multiple strategies
@@ -183,31 +181,27 @@ class PaintBrushTool(BaseTool):
                 f'class:Button name:{color.capitalize()}'
             ]
             
-            color_selected = False
-            for selector in color_selectors:
-                try:
-                    color_btn = desktop.locator(selector)
-                    color_btn.click()
-                    color_selected = True
-                    print(f"✅ Color selected using: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Failed color with {selector}: {e}")
-                    continue
-            
-            if not color_selected:
+            try:
+                if color.startswith('#'):
+                    desktop.locator(color).click()
+                    selector = color
+                else:
+                    _, selector = resolver.resolve(desktop, 'mspaint', f'color:{color.lower()}', color_selectors, action=click)
+                print(f"✅ Color selected using: {selector}")
+            except RuntimeError:
                 print(f"⚠️ Could not select {color} color, using default")
             
+            self.runtime.touched('mspaint')
             time.sleep(0.5)
             return f"🎨 Brush tool configured! Size: {size}, Color: {color}. Ready to draw!"
          
         except Exception as e:
             return f"❌ Failed to setup brush: {str(e)}"
 
-class PaintDrawTool(BaseTool):
+class PaintDrawTool(PaintTool):
     """Tool to draw on the canvas"""
     name: str = "draw_pattern"
-    description: str = "Draw patterns on canvas. Input: 'pattern:circle/line/zigzag/spiral/square/star/heart, x:300, y:200, size:50'"
+    description: str = "Draw patterns on canvas. Input: 'pattern:circle/line/zigzag/spiral/square/star/heart, x:300, y:200, size:50', optionally 'color:red' or a palette control number such as 'color:#12'"
     args_schema: Type[BaseModel] = PaintInput
     
     def _run(
@@ -216,154 +210,45 @@ class PaintDrawTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
-            
-            # Parse parameters
-            params = {}
-            for part in query.split(','):
-                if ':' in part:
-                    key, value = part.split(':', 1)
-                    params[key.strip()] = value.strip()
-            
-            pattern = params.get('pattern', 'circle')
-            x = int(params.get('x', 400))
-            y = int(params.get('y', 300))
-            size = int(params.get('size', 50))
-            
-            # Find canvas using multiple selector strategies
-            canvas_selectors = [
-                'automationid:Canvas',
-                'name:Canvas',
-                'class:Canvas',
-                'automationid:DrawingCanvas'
-            ]
-            
-            canvas = None
-            for selector in canvas_selectors:
-                try:
-                    canvas = desktop.locator(selector)
-                    print(f"✅ Canvas found using: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Failed canvas with {selector}: {e}")
-                    continue
-            
-            if not canvas:
-                return "❌ Could not find Paint canvas. Make sure Paint is open!"
-            
-            # Draw the pattern
-            if pattern == "circle":
-                self._draw_circle(canvas, x, y, size)
-            elif pattern == "square":
-                self._draw_square(canvas, x, y, size)
-            elif pattern == "star":
-                self._draw_star(canvas, x, y, size)
-            elif pattern == "heart":
-                self._draw_heart(canvas, x, y, size)
-            elif pattern == "line":
-                self._draw_line(canvas, x-size, y, x+size, y)
-            elif pattern == "spiral":
-                self._draw_spiral(canvas, x, y, size)
-            elif pattern == "zigzag":
-                self._draw_zigzag(canvas, x, y, size)
-            else:
-                self._draw_circle(canvas, x, y, size)  # Default
-            
-            return f"🎨 Drew {pattern} at position ({x}, {y}) with size {size}!"
+            shape = parse_shape(query)
+            executor = StrokeExecutor(self.runtime.app('mspaint'), calibrator=shared_calibrator(),
+                                      resolver=self.runtime.resolver)
+            print(describe_drawing(executor.execute([shape_stroke(shape)])))
+            # Palette clicks change the selected color in the UI tree
+            self.runtime.touched('mspaint')
+            
+            return f"🎨 Drew {shape['pattern']} at position ({shape['x']}, {shape['y']}) with size {shape['size']}!"
         
         except Exception as e:
             return f"❌ Failed to draw: {str(e)}"
+
+class DrawCompositionTool(PaintTool):
+    """Tool to draw a whole multi-shape composition in one batched session"""
+    name: str = "draw_composition"
+    description: str = "Draw several shapes at once, grouped by color. Input: 'pattern:star, x:300, y:250, size:40, color:blue; pattern:circle, x:500, y:300, size:30, color:red' (colors may also be control numbers such as '#12')"
+    args_schema: Type[BaseModel] = PaintInput
     
-    def _draw_circle(self, canvas, x, y, radius):
-        """Draw a circle"""
-        import math
-        points = []
-        for i in range(0, 360, 10):
-            angle = math.radians(i)
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            points.append((px, py))
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_square(self, canvas, x, y, size):
-        """Draw a square"""
-        half_size = size // 2
-        points = [
-            (x - half_size, y - half_size),
-            (x + half_size, y - half_size),
-            (x + half_size, y + half_size),
-            (x - half_size, y + half_size),
-            (x - half_size, y - half_size)
-        ]
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_star(self, canvas, x, y, size):
-        """Draw a 5-pointed star"""
-        import math
-        points = []
-        for i in range(11):
-            angle = math.radians(i * 36)
-            radius = size if i % 2 == 0 else size//2
-            px = x + radius * math.cos(angle - math.pi/2)
-            py = y + radius * math.sin(angle - math.pi/2)
-            points.append((px, py))
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_heart(self, canvas, x, y, size):
-        """Draw a heart shape"""
-        import math
-        points = []
-        scale = size / 20
-        for i in range(0, 360, 10):
-            t = math.radians(i)
-            px = x + scale * 16 * math.sin(t)**3
-            py = y - scale * (13 * math.cos(t) - 5 * math.cos(2*t) - 2 * math.cos(3*t) - math.cos(4*t))
-            points.append((px, py))
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_line(self, canvas, x1, y1, x2, y2):
-        """Draw a line"""
-        canvas.mouse_click_and_hold(x1, y1)
-        time.sleep(0.1)
-        canvas.mouse_move(x2, y2)
-        canvas.mouse_release()
-     
-    def _draw_spiral(self, canvas, x, y, size):
-        """Draw a spiral"""
-        import math
-        points = []
-        for i in range(0, 720, 15):
-            angle = math.radians(i)
-            radius = (i / 720) * size
-            px = x + radius * math.cos(angle)
-            py = y + radius * math.sin(angle)
-            points.append((px, py))
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_zigzag(self, canvas, x, y, size):
-        """Draw a zigzag pattern"""
-        points = []
-        for i in range(6):
-            px = x + i * (size // 3)
-            py = y + (size // 2) * (1 if i % 2 == 0 else -1)
-            points.append((px, py))
-        self._draw_connected_points(canvas, points)
-    
-    def _draw_connected_points(self, canvas, points):
-        """Draw connected points"""
-        if not points:
-            return
-        
-        canvas.mouse_click_and_hold(int(points[0][0]), int(points[0][1]))
-        time.sleep(0.1)
-        
-        for x, y in points[1:]:
-            canvas.mouse_move(int(x), int(y))
-            time.sleep(0.05)
+    def _run(
+        self, 
+        query: str, 
+        run_manager: Optional[CallbackManagerForToolRun] = None
+    ) -> str:
+        try:
+            shapes = parse_composition(query)
+            if not shapes:
+                return "❌ No shapes given. Separate shapes with ';'"
+            
+            executor = StrokeExecutor(self.runtime.app('mspaint'), calibrator=shared_calibrator(),
+                                      resolver=self.runtime.resolver)
+            stats = executor.execute([shape_stroke(shape) for shape in shapes])
+            self.runtime.touched('mspaint')
+            
+            return f"🎨 {describe_drawing(stats)}: {', '.join(stats['drawn'])}"
         
-        canvas.mouse_release()
+        except Exception as e:
+            return f"❌ Failed to draw composition: {str(e)}"
 
-class CaptureCanvasTool(BaseTool):
+class CaptureCanvasTool(PaintTool):
     """Tool to capture a screenshot of the canvas to see what was drawn"""
     name: str = "capture_canvas"
     description: str = "Capture a screenshot of the Paint canvas to see the current artwork"
@@ -375,7 +260,7 @@ class CaptureCanvasTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             # Use the correct Terminator API we discovered
             print("📸 Capturing screen...")
@@ -392,24 +277,15 @@ class CaptureCanvasTool(BaseTool):
             if not screenshot_data:
                 return "❌ Could not extract image data from screenshot result"
             
-            # Save the screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"paint_capture_{timestamp}.png"
-            
-            with open(filename, 'wb') as f:
-                f.write(screenshot_data)
-            
-            # Verify file was created
-            if os.path.exists(filename):
-                file_size = os.path.getsize(filename)
-                return f"📸 Screen captured and saved as {filename}. Size: {file_size} bytes. Ready for vision analysis!"
-            else:
-                return f"❌ Failed to save screenshot file: {filename}"
+            # Crop to the canvas and shrink to what the vision model works at
+            data, meta = process_capture(screenshot_result, canvas_bounds(desktop), model=VISION_MODEL)
+            handle = shared_store().put(data, **meta)
+            return f"📸 Canvas captured as capture #{handle} ({describe_capture(meta)}, {len(data)} bytes). Ready for vision analysis!"
         
         except Exception as e:
             return f"❌ Failed to capture screen: {str(e)}"
 
-class AnalyzeArtworkTool(BaseTool):
+class AnalyzeArtworkTool(PaintTool):
     """Tool to analyze captured artwork with AI vision using Ollama"""
     name: str = "analyze_artwork"
     description: str = "Analyze the captured artwork to see what was actually drawn and verify correctness"
@@ -421,26 +297,34 @@ class AnalyzeArtworkTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         try:
-            # Find the most recent capture file
-            capture_files = [f for f in os.listdir('.') if f.startswith('paint_capture_') and f.endswith('.png')]
-            if not capture_files:
+            # Take the most recent capture straight from memory
+            store = shared_store()
+            latest_capture = store.latest()
+            if latest_capture is None:
                 return "❌ No captured artwork found. Use capture_canvas tool first."
             
-            latest_capture = max(capture_files, key=os.path.getctime)
-            
-            # Load and encode the image
-            with open(latest_capture, 'rb') as f:
-                image_data = f.read()
-            
-            image_b64 = base64.b64encode(image_data).decode('utf-8')
-            
-            # Use LangChain Ollama for vision analysis
-            try:
-                # Create LLM instance when needed
-                vision_llm = OllamaLLM(model="gemma3:4b-it-q4_K_M")
-                
-                # Create a detailed prompt for vision analysis
-                vision_prompt = f"""You are analyzing a screenshot from MS Paint. The image shows a digital artwork created by an AI artist.
+            image_data = store.get(latest_capture)
+            
+            # Skip the vision call when nothing was drawn since the last analysis
+            detector = shared_detector()
+            change = detector.compare(image_data)
+            if not change['changed']:
+                return (f"♻️ Canvas unchanged since capture #{detector.handle}, previous analysis still applies:\n\n"
+                        f"{detector.reuse()}\n\n📁 Analyzed capture #{latest_capture}")
+            
+            # Small changes: look only at the region that changed
+            region = change['region']
+            meta = store.meta(latest_capture)
+            focus = ""
+            analyzed = image_data
+            cropped = None
+            if region and region[2] * region[3] < 0.5 * meta.get('width', 0) * meta.get('height', 0):
+                analyzed = crop_region(image_data, region)
+                cropped = region
+                focus = f"\nOnly the region that changed since the last analysis is shown (x={region[0]}, y={region[1]}, {region[2]}x{region[3]}).\n"
+            
+            # Create a detailed prompt for vision analysis
+            analysis_prompt = f"""You are analyzing a screenshot from MS Paint. The image shows a digital artwork created by an AI artist.
 
 Please analyze this artwork and provide detailed feedback:
 
@@ -451,24 +335,39 @@ Please analyze this artwork and provide detailed feedback:
 5. COMPLETENESS: Does this look like a finished piece or work in progress?
 
 Specific analysis request: {query}
-
-Be specific and descriptive in your analysis to help improve the artwork.
-
-[Note: This is a Paint canvas screenshot with image data: {image_b64[:100]}...]"""
-
-                # Use the LangChain Ollama LLM
-                response = vision_llm.invoke(vision_prompt)
+{focus}
+Be specific and descriptive in your analysis to help improve the artwork."""
+            
+            # Same canvas, same request, same model: answer from the cache
+            cache = shared_vision_cache()
+            cached = cache.get(analyzed, analysis_prompt, VISION_MODEL)
+            if cached is not None:
+                # A region answer only covers the crop; it is stored with the rest of the frame's analysis
+                detector.remember(latest_capture, image_data, cached, region=cropped)
+                return f"🔍 VISION ANALYSIS (cached): {cached}\n\n📁 Analyzed capture #{latest_capture}"
+            
+            image_b64 = to_base64(analyzed)
+            
+            # Use LangChain Ollama for vision analysis
+            try:
+                # One client for the whole run
+                vision_llm = self.runtime.llm(VISION_MODEL)
+                
+                # The cropped, downscaled capture goes to the model as an image
+                response = vision_llm.invoke(analysis_prompt, images=[image_b64])
+                detector.remember(latest_capture, image_data, response, region=cropped)
+                cache.put(analyzed, analysis_prompt, VISION_MODEL, response)
                 
-                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed file: {latest_capture}"
+                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed capture #{latest_capture}"
             
             except Exception as vision_error:
                 # Enhanced fallback analysis with more detail
                 file_size_mb = len(image_data) / (1024 * 1024)
-                analysis = f"""🔍 VISION ANALYSIS of {latest_capture}:
+                analysis = f"""🔍 VISION ANALYSIS of capture #{latest_capture}:
 
 ✅ TECHNICAL CAPTURE SUCCESS:
 - Screenshot captured successfully ({len(image_data)} bytes / {file_size_mb:.2f} MB)
-- File saved and accessible for analysis
+- Capture held in memory for analysis
 - Paint interface properly captured
 - Canvas area included in screenshot
 
@@ -493,7 +392,7 @@ Be specific and descriptive in your analysis to help improve the artwork.
 ⚠️ Note: Detailed visual analysis temporarily unavailable. Using enhanced technical assessment.
 Vision error: {str(vision_error)}"""
                 
-                return f"{analysis}\n\n📁 Analyzed file: {latest_capture}"
+                return f"{analysis}\n\n📁 Analyzed capture #{latest_capture}"
                 
         except Exception as e:
             return f"❌ Failed to analyze artwork: {str(e)}"
@@ -501,21 +400,23 @@ Vision error: {str(vision_error)}"""
 class AIArtistVisionAgent:
     """AI Artist Agent with Vision Feedback Loop"""
     
-    def __init__(self):
-        """Initialize the Vision-enabled AI Artist Agent"""
+    def __init__(self, runtime=None):
+        """Initialize the Vision-enabled AI Artist Agent (tools share one runtime)"""
         print("🎨👁️ Initializing AI Artist Vision Agent...")
+        self.runtime = runtime or shared_runtime()
         
-        # Use gemma3 model as requested
-        self.llm = OllamaLLM(model="gemma3:4b-it-q4_K_M")
+        # Use gemma3 model as requested (the same client analyzes the artwork)
+        self.llm = self.runtime.llm(VISION_MODEL)
         
         # Initialize tools with vision capabilities and UI inspection
         self.tools = [
-            InspectUITool(),  # New UI inspector tool
-            PaintOpenTool(),
-            PaintBrushTool(), 
-            PaintDrawTool(),
-            CaptureCanvasTool(),
-            AnalyzeArtworkTool()
+            self.runtime.tool(InspectUITool),  # Also used by open_paint
+            PaintOpenTool(runtime=self.runtime),
+            PaintBrushTool(runtime=self.runtime), 
+            PaintDrawTool(runtime=self.runtime),
+            DrawCompositionTool(runtime=self.runtime),
+            CaptureCanvasTool(runtime=self.runtime),
+            AnalyzeArtworkTool(runtime=self.runtime)
         ]
         
         # Create enhanced prompt with UI tree awareness
@@ -525,16 +426,17 @@ class AIArtistVisionAgent:
             system_message="""You are an advanced AI artist with VISION CAPABILITIES and UI INSPECTION abilities that creates and verifies artwork in MS Paint.
 
 Your unique abilities:
-- inspect_paint_ui: Inspect the full Paint UI tree to find available elements and their IDs
+- inspect_paint_ui: List Paint UI elements and their IDs (use format: "goal:brush red" to see matching elements first, add ", full:true" for the whole listing); repeated inspections only show what changed
 - open_paint: Opens MS Paint (automatically includes UI inspection)
 - use_brush: Configure brush settings (use format: "size:medium, color:red")
 - draw_pattern: Draw patterns (use format: "pattern:circle, x:400, y:300, size:60")
+- draw_composition: Draw many shapes in one call (use format: "pattern:star, x:300, y:250, size:40, color:blue; pattern:circle, x:500, y:300, size:30, color:red")
 - capture_canvas: Take screenshots to see your artwork
 - analyze_artwork: Use AI vision to analyze what you actually drew
 
 CRITICAL WORKFLOW WITH UI INSPECTION:
 1. First, open_paint (this automatically inspects the UI and shows available elements)
-2. If you need to find specific elements, use inspect_paint_ui to see the full UI tree
+2. If you need to find specific elements, use inspect_paint_ui with what you are looking for (e.g. "goal:color red")
 3. Setup brush with precise selectors from the UI tree
 4. Draw specific elements using exact coordinates
 5. ALWAYS capture_canvas after drawing to see what you created
@@ -546,6 +448,7 @@ IMPORTANT: Use the UI tree information to select elements reliably!
 - Use 'automationid:ElementID' for most reliable element targeting
 - Fallback to 'name:ElementName' if automation ID is not available
 - The UI inspector will show you exactly what selectors to use
+- A control's number from the listing works too, e.g. use_brush "color:#12"
 
 Example workflow: 
 1. open_paint (includes UI inspection)
@@ -588,10 +491,11 @@ CRITICAL WORKFLOW INSTRUCTIONS:
 2. Use the UI tree information to understand available elements and their IDs
 3. Setup brush with good settings using use_brush with precise selectors
 4. Draw specific elements using draw_pattern with EXACT coordinates like x:400, y:300, size:50
+   (use draw_composition to draw several shapes and colors in a single call; it orders them to avoid palette clicks)
 5. After EACH drawing action, IMMEDIATELY use capture_canvas to see what you drew
 6. Then IMMEDIATELY use analyze_artwork to verify if it matches your intention
 7. Based on the analysis, decide whether to add more elements or make corrections
-8. If you have trouble with element selection, use inspect_paint_ui to get fresh UI tree
+8. If you have trouble with element selection, use inspect_paint_ui with the element you need (e.g. "goal:brush red")
 9. Create multiple elements to make a complete and interesting composition
 
 EXAMPLE SEQUENCE:
@@ -619,6 +523,7 @@ Be methodical, use UI inspection for reliable element targeting, and use vision
             print("-" * 50)
             print(f"Theme: {description}")
             print(f"Vision-Verified Result: {result.get('output', 'Masterpiece created and verified!')}")
+            print(f"Shared tool handles: {self.runtime.stats()}")
             print("-" * 50)
             
             return result
@@ -641,7 +546,7 @@ async def main():
     print("\n" + "="*70)
     print("🎉👁️ Vision AI Artist Demo Complete!")
     print("Your AI artist created artwork AND verified it with vision!")
-    print("Check MS Paint and the saved capture files! 🖼️✨📸")
+    print("Check MS Paint to admire the finished artwork! 🖼️✨📸")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
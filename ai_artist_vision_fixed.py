@@ -10,8 +10,6 @@ import time
 import random
 import json
 import base64
-import os
-from datetime import datetime
 from typing import List, Dict, Any, Optional, Type
 
 from langchain_ollama import OllamaLLM
@@ -22,6 +20,17 @@ from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
 from langchain import hub
 
+from app_ready import open_and_wait
+from canvas_capture import canvas_bounds, describe as describe_capture, process_capture
+from capture_store import shared_store
+from change_detection import shared_detector
+from vision_cache import shared_vision_cache
+from shapes import PATTERNS, pattern_points, polyline
+from stroke_optimizer import describe as describe_stroke, optimize_stroke
+
+# Vision model that analyzes the captures (also picks the capture resolution)
+VISION_MODEL = "gemma3:4b-it-q4_K_M"
+
 # Input schemas
 class PaintInput(BaseModel):
     query: str = Field(description="Parameters for the paint tool")
@@ -40,8 +49,7 @@ class PaintOpenTool(BaseTool):
         async def async_open():
             try:
                 desktop = terminator.Desktop()
-                desktop.open_application('mspaint')
-                await asyncio.sleep(3)
+                await open_and_wait(desktop, 'mspaint')
                 
                 # Get full UI tree
                 ui_info = "🔍 PAINT UI INSPECTION:\n\n"
@@ -121,75 +129,20 @@ class PaintDrawTool(BaseTool):
                 if not canvas:
                     return "❌ Could not find Paint canvas!"
                 
-                # Draw the pattern
-                if pattern == "circle":
-                    # Draw circle using points
-                    import math
-                    points = []
-                    for i in range(0, 360, 15):
-                        angle = math.radians(i)
-                        px = x + size * math.cos(angle)
-                        py = y + size * math.sin(angle)
-                        points.append((int(px), int(py)))
-                    
-                    # Draw connected points
-                    if points:
-                        canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                        await asyncio.sleep(0.1)
-                        for px, py in points[1:]:
-                            canvas.mouse_move(px, py)
-                            await asyncio.sleep(0.02)
-                        canvas.mouse_move(points[0][0], points[0][1])  # Close circle
-                        canvas.mouse_release()
-                
-                elif pattern == "square":
-                    # Draw square
-                    half = size // 2
-                    points = [
-                        (x - half, y - half),
-                        (x + half, y - half),
-                        (x + half, y + half),
-                        (x - half, y + half),
-                        (x - half, y - half)
-                    ]
-                    
-                    canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                    await asyncio.sleep(0.1)
-                    for px, py in points[1:]:
-                        canvas.mouse_move(px, py)
-                        await asyncio.sleep(0.05)
-                    canvas.mouse_release()
-                
-                elif pattern == "star":
-                    # Draw 5-pointed star
-                    import math
-                    points = []
-                    for i in range(11):
-                        angle = math.radians(i * 36 - 90)
-                        radius = size if i % 2 == 0 else size // 2
-                        px = x + radius * math.cos(angle)
-                        py = y + radius * math.sin(angle)
-                        points.append((int(px), int(py)))
-                    
-                    canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                    await asyncio.sleep(0.1)
-                    for px, py in points[1:]:
-                        canvas.mouse_move(px, py)
-                        await asyncio.sleep(0.05)
-                    canvas.mouse_release()
-                
-                elif pattern == "line":
-                    # Draw simple line
-                    canvas.mouse_click_and_hold(x - size, y)
-                    await asyncio.sleep(0.1)
-                    canvas.mouse_move(x + size, y)
-                    canvas.mouse_release()
-                
+                # Draw the pattern (unknown patterns become a dot)
+                if pattern in PATTERNS:
+                    points = pattern_points(pattern, x, y, size)
                 else:
-                    # Default to dot
-                    canvas.mouse_click_and_hold(x, y)
-                    await asyncio.sleep(0.1)
-                    canvas.mouse_release()
+                    points = polyline((x, y))
+                points, stats = optimize_stroke(points)
+                print(describe_stroke(stats))
+                
+                canvas.mouse_click_and_hold(int(points[0][0]), int(points[0][1]))
+                await asyncio.sleep(0.1)
+                for px, py in points[1:]:
+                    canvas.mouse_move(int(px), int(py))
+                    await asyncio.sleep(0.02)
+                canvas.mouse_release()
                 
                 return f"✅ Drew {pattern} at ({x}, {y}) with size {size}!"
                 
@@ -222,18 +175,10 @@ class CaptureCanvasTool(BaseTool):
                 if not screenshot_data:
                     return "❌ No image data captured"
                 
-                # Save screenshot
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"paint_capture_{timestamp}.png"
-                
-                with open(filename, 'wb') as f:
-                    f.write(screenshot_data)
-                
-                if os.path.exists(filename):
-                    file_size = len(screenshot_data)
-                    return f"📸 Screenshot saved as {filename} ({file_size} bytes). Ready for vision analysis!"
-                else:
-                    return f"❌ Failed to save {filename}"
+                # Crop to the canvas and shrink to what the vision model works at
+                data, meta = process_capture(screenshot_result, canvas_bounds(desktop), model=VISION_MODEL)
+                handle = shared_store().put(data, **meta)
+                return f"📸 Canvas captured as capture #{handle} ({describe_capture(meta)}, {len(data)} bytes). Ready for vision analysis!"
                 
             except Exception as e:
                 return f"❌ Capture failed: {str(e)}"
@@ -248,20 +193,24 @@ class AnalyzeArtworkTool(BaseTool):
     
     def _run(self, query: str = "analyze", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            # Find most recent screenshot
-            screenshots = [f for f in os.listdir('.') if f.startswith('paint_capture_') and f.endswith('.png')]
-            if not screenshots:
+            # Take the most recent capture straight from memory
+            store = shared_store()
+            latest = store.latest()
+            if latest is None:
                 return "❌ No screenshots found. Capture first!"
             
-            latest = max(screenshots, key=lambda x: os.path.getctime(x))
+            image_data = store.get(latest)
             
-            # Load image
-            with open(latest, 'rb') as f:
-                image_data = f.read()
+            # Skip the vision call when nothing was drawn since the last analysis
+            detector = shared_detector()
+            change = detector.compare(image_data)
+            if not change['changed']:
+                return (f"♻️ Canvas unchanged since capture #{detector.handle}, previous analysis still applies:\n\n"
+                        f"{detector.reuse()}\n\n📁 Analyzed capture #{latest}")
             
             # Use Gemma3 for analysis (text-only for now)
             try:
-                vision_llm = OllamaLLM(model="gemma3:4b-it-q4_K_M")
+                vision_llm = OllamaLLM(model=VISION_MODEL)
                 
                 prompt = f"""You are analyzing a screenshot from MS Paint. 
 
@@ -276,18 +225,27 @@ Specific analysis request: {query}
 
 Provide detailed feedback to help improve the artwork."""
 
+                # Same canvas, same request, same model: answer from the cache
+                cache = shared_vision_cache()
+                cached = cache.get(image_data, prompt, VISION_MODEL)
+                if cached is not None:
+                    detector.remember(latest, image_data, cached)
+                    return f"🔍 VISION ANALYSIS (cached): {cached}\n\n📁 Analyzed capture #{latest}"
+                
                 response = vision_llm.invoke(prompt)
+                detector.remember(latest, image_data, response)
+                cache.put(image_data, prompt, VISION_MODEL, response)
                 
-                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed: {latest}"
+                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed capture #{latest}"
                 
             except Exception as vision_error:
                 # Fallback analysis
                 file_size_mb = len(image_data) / (1024 * 1024)
-                return f"""🔍 TECHNICAL ANALYSIS of {latest}:
+                return f"""🔍 TECHNICAL ANALYSIS of capture #{latest}:
 
 ✅ CAPTURE SUCCESS:
 - Screenshot: {file_size_mb:.2f} MB ({len(image_data)} bytes)
-- File saved successfully
+- Capture held in memory
 - Paint interface captured
 
 🎨 DRAWING ASSESSMENT:
@@ -302,7 +260,7 @@ Provide detailed feedback to help improve the artwork."""
 - Consider different patterns/colors
 - Build complex compositions
 
-📁 File: {latest}
+📁 Capture: #{latest}
 ⚠️ Vision analysis: {str(vision_error)}"""
                 
         except Exception as e:
@@ -5,22 +5,30 @@ Uses Gemma3 with vision to see and verify its own artwork in MS Paint!
 """
 
 import asyncio
-import terminator
 import time
 import random
 import json
 import base64
-import os
-from datetime import datetime
 from typing import List, Dict, Any, Optional, Type
 
-from langchain_ollama import OllamaLLM
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import BaseTool
 from langchain.prompts import PromptTemplate
 from langchain.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
 
+from app_ready import open_and_wait_sync
+from canvas_capture import canvas_bounds, describe as describe_capture, process_capture
+from capture_store import shared_store
+from change_detection import shared_detector
+from vision_cache import shared_vision_cache
+from shapes import PATTERNS, pattern_points, polyline
+from stroke_optimizer import describe as describe_stroke, optimize_stroke
+from tool_runtime import shared_runtime
+
+# Vision model that analyzes the captures (also picks the capture resolution)
+VISION_MODEL = "gemma3:4b-it-q4_K_M"
+
 # Global event loop for proper async handling
 loop = None
 
@@ -49,8 +57,12 @@ class PaintInput(BaseModel):
 class VisionInput(BaseModel):
     query: str = Field(description="What to analyze in the image")
 
+class PaintTool(BaseTool):
+    """Base for tools sharing one desktop, element cache and LLM clients across calls"""
+    runtime: Any = Field(default_factory=shared_runtime, exclude=True)
+
 # WORKING Paint Tools 
-class PaintOpenTool(BaseTool):
+class PaintOpenTool(PaintTool):
     """Tool to open MS Paint and inspect UI"""
     name: str = "open_paint"
     description: str = "Opens MS Paint and shows full UI tree with all available elements"
@@ -58,9 +70,10 @@ class PaintOpenTool(BaseTool):
     
     def _run(self, query: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            desktop = terminator.Desktop()
-            desktop.open_application('mspaint')
-            time.sleep(4)  # Give Paint time to load
+            desktop = self.runtime.desktop
+            open_and_wait_sync(desktop, 'mspaint')
+            # Lookups index the new window once it is ready
+            self.runtime.forget('mspaint')
             
             # Get UI info without async complications
             ui_info = "🔍 PAINT UI INSPECTION:\n\n"
@@ -85,7 +98,7 @@ class PaintOpenTool(BaseTool):
         except Exception as e:
             return f"❌ Failed to open Paint: {str(e)}"
 
-class PaintDrawTool(BaseTool):
+class PaintDrawTool(PaintTool):
     """Tool to draw on Paint canvas"""
     name: str = "draw_on_canvas"
     description: str = "Draw patterns on Paint canvas using mouse movements"
@@ -93,7 +106,7 @@ class PaintDrawTool(BaseTool):
     
     def _run(self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             # Parse the query
             parts = query.split(',')
@@ -110,92 +123,31 @@ class PaintDrawTool(BaseTool):
                 elif 'size:' in part:
                     size = int(part.split(':')[1].strip())
             
-            # Try multiple ways to find canvas
-            canvas = None
+            # Try multiple ways to find canvas, the one that worked before first
             canvas_selectors = ['name:Canvas', 'class:Canvas', 'automationid:Canvas']
-            
-            for selector in canvas_selectors:
-                try:
-                    canvas = desktop.locator(selector)
-                    print(f"✅ Found canvas with: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Failed {selector}: {e}")
-                    continue
-            
-            if not canvas:
+            try:
+                canvas, selector = self.runtime.resolver.resolve(desktop, 'mspaint', 'canvas', canvas_selectors)
+                print(f"✅ Found canvas with: {selector}")
+            except RuntimeError as e:
+                print(f"❌ {e}")
                 return "❌ Could not find Paint canvas!"
             
             # Draw the pattern using simple synchronous methods
             try:
-                if pattern == "circle":
-                    # Draw circle using points
-                    import math
-                    points = []
-                    for i in range(0, 360, 20):
-                        angle = math.radians(i)
-                        px = x + size * math.cos(angle)
-                        py = y + size * math.sin(angle)
-                        points.append((int(px), int(py)))
-                    
-                    # Draw connected points
-                    if points:
-                        canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                        time.sleep(0.1)
-                        for px, py in points[1:]:
-                            canvas.mouse_move(px, py)
-                            time.sleep(0.02)
-                        canvas.mouse_move(points[0][0], points[0][1])  # Close circle
-                        canvas.mouse_release()
-                
-                elif pattern == "square":
-                    # Draw square
-                    half = size // 2
-                    points = [
-                        (x - half, y - half),
-                        (x + half, y - half),
-                        (x + half, y + half),
-                        (x - half, y + half),
-                        (x - half, y - half)
-                    ]
-                    
-                    canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                    time.sleep(0.1)
-                    for px, py in points[1:]:
-                        canvas.mouse_move(px, py)
-                        time.sleep(0.05)
-                    canvas.mouse_release()
-                
-                elif pattern == "star":
-                    # Draw 5-pointed star
-                    import math
-                    points = []
-                    for i in range(11):
-                        angle = math.radians(i * 36 - 90)
-                        radius = size if i % 2 == 0 else size // 2
-                        px = x + radius * math.cos(angle)
-                        py = y + radius * math.sin(angle)
-                        points.append((int(px), int(py)))
-                    
-                    canvas.mouse_click_and_hold(points[0][0], points[0][1])
-                    time.sleep(0.1)
-                    for px, py in points[1:]:
-                        canvas.mouse_move(px, py)
-                        time.sleep(0.05)
-                    canvas.mouse_release()
-                
-                elif pattern == "line":
-                    # Draw simple line
-                    canvas.mouse_click_and_hold(x - size, y)
-                    time.sleep(0.1)
-                    canvas.mouse_move(x + size, y)
-                    canvas.mouse_release()
-                
+                # Draw the pattern (unknown patterns become a dot)
+                if pattern in PATTERNS:
+                    points = pattern_points(pattern, x, y, size)
                 else:
-                    # Default to dot
-                    canvas.mouse_click_and_hold(x, y)
-                    time.sleep(0.1)
-                    canvas.mouse_release()
+                    points = polyline((x, y))
+                points, stats = optimize_stroke(points)
+                print(describe_stroke(stats))
+                
+                canvas.mouse_click_and_hold(int(points[0][0]), int(points[0][1]))
+                time.sleep(0.1)
+                for px, py in points[1:]:
+                    canvas.mouse_move(int(px), int(py))
+                    time.sleep(0.02)
+                canvas.mouse_release()
                 
                 return f"✅ Drew {pattern} at ({x}, {y}) with size {size}!"
                 
@@ -205,7 +157,7 @@ class PaintDrawTool(BaseTool):
         except Exception as e:
             return f"❌ Failed to draw: {str(e)}"
 
-class CaptureCanvasTool(BaseTool):
+class CaptureCanvasTool(PaintTool):
     """Tool to capture Paint screenshot"""
     name: str = "capture_screen"
     description: str = "Capture a screenshot of the current Paint window"
@@ -213,7 +165,7 @@ class CaptureCanvasTool(BaseTool):
     
     def _run(self, query: str = "capture", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             print("📸 Capturing screen...")
             screenshot_result = desktop.capture_screen()
@@ -224,23 +176,15 @@ class CaptureCanvasTool(BaseTool):
             if not screenshot_data:
                 return "❌ No image data captured"
             
-            # Save screenshot
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"paint_capture_{timestamp}.png"
+            # Crop to the canvas and shrink to what the vision model works at
+            data, meta = process_capture(screenshot_result, canvas_bounds(desktop), model=VISION_MODEL)
+            handle = shared_store().put(data, **meta)
+            return f"📸 Canvas captured as capture #{handle} ({describe_capture(meta)}, {len(data)} bytes). Ready for vision analysis!"
             
-            with open(filename, 'wb') as f:
-                f.write(screenshot_data)
-            
-            if os.path.exists(filename):
-                file_size = len(screenshot_data)
-                return f"📸 Screenshot saved as {filename} ({file_size} bytes). Ready for vision analysis!"
-            else:
-                return f"❌ Failed to save {filename}"
-                
         except Exception as e:
             return f"❌ Capture failed: {str(e)}"
 
-class AnalyzeArtworkTool(BaseTool):
+class AnalyzeArtworkTool(PaintTool):
     """Tool to analyze captured artwork using vision AI"""
     name: str = "analyze_artwork"
     description: str = "Analyze the captured screenshot using AI vision to see what was drawn"
@@ -248,20 +192,24 @@ class AnalyzeArtworkTool(BaseTool):
     
     def _run(self, query: str = "analyze", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            # Find most recent screenshot
-            screenshots = [f for f in os.listdir('.') if f.startswith('paint_capture_') and f.endswith('.png')]
-            if not screenshots:
+            # Take the most recent capture straight from memory
+            store = shared_store()
+            latest = store.latest()
+            if latest is None:
                 return "❌ No screenshots found. Capture first!"
             
-            latest = max(screenshots, key=lambda x: os.path.getctime(x))
+            image_data = store.get(latest)
             
-            # Load image
-            with open(latest, 'rb') as f:
-                image_data = f.read()
+            # Skip the vision call when nothing was drawn since the last analysis
+            detector = shared_detector()
+            change = detector.compare(image_data)
+            if not change['changed']:
+                return (f"♻️ Canvas unchanged since capture #{detector.handle}, previous analysis still applies:\n\n"
+                        f"{detector.reuse()}\n\n📁 Analyzed capture #{latest}")
             
             # Use Gemma3 for analysis
             try:
-                vision_llm = OllamaLLM(model="gemma3:4b-it-q4_K_M")
+                vision_llm = self.runtime.llm(VISION_MODEL)
                 
                 prompt = f"""You are analyzing a screenshot from MS Paint. 
 
@@ -276,18 +224,27 @@ Specific analysis request: {query}
 
 Provide detailed feedback to help improve the artwork."""
 
+                # Same canvas, same request, same model: answer from the cache
+                cache = shared_vision_cache()
+                cached = cache.get(image_data, prompt, VISION_MODEL)
+                if cached is not None:
+                    detector.remember(latest, image_data, cached)
+                    return f"🔍 VISION ANALYSIS (cached): {cached}\n\n📁 Analyzed capture #{latest}"
+                
                 response = vision_llm.invoke(prompt)
+                detector.remember(latest, image_data, response)
+                cache.put(image_data, prompt, VISION_MODEL, response)
                 
-                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed: {latest}"
+                return f"🔍 VISION ANALYSIS: {response}\n\n📁 Analyzed capture #{latest}"
                 
             except Exception as vision_error:
                 # Fallback analysis
                 file_size_mb = len(image_data) / (1024 * 1024)
-                return f"""🔍 TECHNICAL ANALYSIS of {latest}:
+                return f"""🔍 TECHNICAL ANALYSIS of capture #{latest}:
 
 ✅ CAPTURE SUCCESS:
 - Screenshot: {file_size_mb:.2f} MB ({len(image_data)} bytes)
-- File saved successfully
+- Capture held in memory
 - Paint interface captured
 
 🎨 DRAWING ASSESSMENT:
@@ -302,13 +259,13 @@ Provide detailed feedback to help improve the artwork."""
 - Consider different patterns/colors
 - Build complex compositions
 
-📁 File: {latest}
+📁 Capture: #{latest}
 ⚠️ Vision analysis: {str(vision_error)}"""
                 
         except Exception as e:
             return f"❌ Analysis failed: {str(e)}"
 
-class SelectColorTool(BaseTool):
+class SelectColorTool(PaintTool):
     """Tool to select colors in Paint"""
     name: str = "select_color"
     description: str = "Select a color in Paint for drawing"
@@ -316,7 +273,7 @@ class SelectColorTool(BaseTool):
     
     def _run(self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         try:
-            desktop = terminator.Desktop()
+            desktop = self.runtime.app('mspaint')
             
             # Extract color from query
             color = query.lower().strip()
@@ -330,17 +287,15 @@ class SelectColorTool(BaseTool):
                 f'class:Button name:{color.capitalize()}'
             ]
             
-            for selector in color_selectors:
-                try:
-                    color_btn = desktop.locator(selector)
-                    color_btn.click()
-                    time.sleep(0.3)
-                    return f"✅ Selected {color} color!"
-                except Exception as e:
-                    print(f"❌ Color {selector}: {e}")
-                    continue
+            try:
+                self.runtime.resolver.resolve(desktop, 'mspaint', f'color:{color}', color_selectors,
+                                              action=lambda button: button.click())
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return f"⚠️ Could not find {color} color, using default"
             
-            return f"⚠️ Could not find {color} color, using default"
+            time.sleep(0.3)
+            return f"✅ Selected {color} color!"
                 
         except Exception as e:
             return f"❌ Color selection failed: {str(e)}"
@@ -349,17 +304,18 @@ class SelectColorTool(BaseTool):
 class AIArtistVisionAgent:
     """AI Artist that creates and verifies artwork with vision feedback"""
     
-    def __init__(self):
+    def __init__(self, runtime=None):
         print("🎨👁️ Initializing WORKING AI Artist Vision Agent...")
+        self.runtime = runtime or shared_runtime()
         
-        self.llm = OllamaLLM(model="gemma3:4b-it-q4_K_M")
+        self.llm = self.runtime.llm(VISION_MODEL)
         
         self.tools = [
-            PaintOpenTool(),
-            SelectColorTool(),
-            PaintDrawTool(),
-            CaptureCanvasTool(),
-            AnalyzeArtworkTool()
+            PaintOpenTool(runtime=self.runtime),
+            SelectColorTool(runtime=self.runtime),
+            PaintDrawTool(runtime=self.runtime),
+            CaptureCanvasTool(runtime=self.runtime),
+            AnalyzeArtworkTool(runtime=self.runtime)
         ]
         
         # AMAZING PROMPT with full context
@@ -12,6 +12,13 @@ from langchain_ollama import OllamaLLM
 from langchain.prompts import PromptTemplate
 from langchain.schema import BaseOutputParser
 
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+from llm_cache import CachedLLM, describe, shared_llm_cache
+from llm_client import ainvoke
+from model_manager import DEFAULT_KEEP_ALIVE, warm_up
+from text_entry import write_text
+
 class AutomationTaskParser(BaseOutputParser):
     """Parse AI responses into automation tasks"""
     
@@ -34,7 +41,11 @@ class AIAutomationAgent:
     def __init__(self, model_name="llama3.2"):
         """Initialize the AI agent"""
         print(f"🤖 Initializing AI Agent with model: {model_name}")
-        self.llm = OllamaLLM(model=model_name)
+        # Load the model while the first apps open
+        warm_up(model_name)
+        self.llm = OllamaLLM(model=model_name, keep_alive=DEFAULT_KEEP_ALIVE)
+        # JSON plans are generated greedily, so repeated runs can reuse them
+        self.planner = CachedLLM(OllamaLLM(model=model_name, temperature=0, keep_alive=DEFAULT_KEEP_ALIVE))
         self.parser = AutomationTaskParser()
         self.desktop = terminator.Desktop()
         
@@ -60,7 +71,7 @@ Only return the JSON, no other text.
         """)
         
         print("🧮 AI is generating calculator problems...")
-        response = self.llm.invoke(prompt.format())
+        response = await ainvoke(self.planner, prompt.format())
         tasks = self.parser.parse(response)
         
         if "problems" in tasks:
@@ -77,59 +88,21 @@ Only return the JSON, no other text.
         """Execute calculator automation with AI-generated problems"""
         print("🔢 Executing AI-generated calculator tasks...")
         
-        self.desktop.open_application('calc')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'calc')
         
         results = []
         
         for i, problem in enumerate(problems, 1):
             print(f"  Problem {i}: {problem['description']} = {problem['expression']}")
             
-            # Clear calculator
-            try:
-                clear_btn = self.desktop.locator('name:Clear')
-                clear_btn.click()
-                await asyncio.sleep(0.3)
-            except:
-                pass
-            
-            # Input the expression
-            expression = problem['expression']
-            for char in expression:
-                if char.isdigit():
-                    btn = self.desktop.locator(f'name:{char}')
-                    btn.click()
-                elif char == '+':
-                    btn = self.desktop.locator('name:Plus')
-                    btn.click()
-                elif char == '-':
-                    btn = self.desktop.locator('name:Minus')
-                    btn.click()
-                elif char == '*':
-                    btn = self.desktop.locator('name:Multiply by')
-                    btn.click()
-                elif char == '/':
-                    btn = self.desktop.locator('name:Divide by')
-                    btn.click()
-                elif char == '.':
-                    btn = self.desktop.locator('name:Decimal separator')
-                    btn.click()
-                elif char == '(':
-                    btn = self.desktop.locator('name:Open parenthesis')
-                    btn.click()
-                elif char == ')':
-                    btn = self.desktop.locator('name:Close parenthesis')
-                    btn.click()
-                
-                await asyncio.sleep(0.2)
-            
-            # Get result
-            equals_btn = self.desktop.locator('name:Equals')
-            equals_btn.click()
-            await asyncio.sleep(0.5)
+            # Clear and replay the compiled expression
+            result = await calculator_for(self.desktop).calculate_async(problem['expression'])
+            if not result['success']:
+                print(f"  ❌ Failed: {problem['expression']} ({result['error']})")
+                continue
             
             results.append(problem)
-            print(f"  ✓ Completed: {problem['expression']}")
+            print(f"  ✓ Completed: {problem['expression']} ({result['latency']:.2f}s)")
         
         return results
     
@@ -143,15 +116,14 @@ The story should be suitable for displaying in a text editor.
         """)
         
         print("📝 AI is generating creative content...")
-        response = self.llm.invoke(prompt.format())
+        response = await ainvoke(self.llm, prompt.format())
         return response.strip()
     
     async def execute_notepad_automation(self, content):
         """Execute notepad automation with AI-generated content"""
         print("📄 Creating AI-generated document in Notepad...")
         
-        self.desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'notepad')
         
         editor = self.desktop.locator('name:Edit')
         
@@ -172,7 +144,7 @@ Technical Details:
 This document was created entirely through AI-powered automation! 🤖✨
 """
         
-        editor.type_text(document)
+        write_text(editor, document)
         print("✓ AI-generated content written to Notepad")
         
         return document
@@ -198,7 +170,7 @@ Make it creative but practical. Only return JSON.
         """)
         
         print("🔄 AI is planning automation workflow...")
-        response = self.llm.invoke(prompt.format())
+        response = await ainvoke(self.planner, prompt.format())
         workflow = self.parser.parse(response)
         
         # Fallback workflow if parsing fails
@@ -226,48 +198,23 @@ Make it creative but practical. Only return JSON.
             print(f"\n📋 Step {step['step']}: {step['description']}")
             
             if step['action'] == 'open_calculator':
-                self.desktop.open_application('calc')
-                await asyncio.sleep(2)
+                await open_and_wait(self.desktop, 'calc')
                 results.append("Calculator opened")
                 
             elif step['action'] == 'calculate':
-                # Clear and calculate
-                try:
-                    clear_btn = self.desktop.locator('name:Clear')
-                    clear_btn.click()
-                    await asyncio.sleep(0.3)
-                except:
-                    pass
-                
                 expression = step.get('expression', '1+1')
                 print(f"   Calculating: {expression}")
                 
-                for char in expression:
-                    if char.isdigit():
-                        btn = self.desktop.locator(f'name:{char}')
-                        btn.click()
-                    elif char == '+':
-                        btn = self.desktop.locator('name:Plus')
-                        btn.click()
-                    elif char == '-':
-                        btn = self.desktop.locator('name:Minus')
-                        btn.click()
-                    elif char == '*':
-                        btn = self.desktop.locator('name:Multiply by')
-                        btn.click()
-                    elif char == '/':
-                        btn = self.desktop.locator('name:Divide by')
-                        btn.click()
-                    await asyncio.sleep(0.2)
-                
-                equals_btn = self.desktop.locator('name:Equals')
-                equals_btn.click()
-                await asyncio.sleep(0.5)
-                results.append(f"Calculated: {expression}")
+                # Clear and calculate
+                result = await calculator_for(self.desktop).calculate_async(expression)
+                if result['success']:
+                    results.append(f"Calculated: {expression}")
+                else:
+                    print(f"   ❌ Calculation failed: {result['error']}")
+                    results.append(f"Calculation failed: {expression}")
                 
             elif step['action'] == 'document':
-                self.desktop.open_application('notepad')
-                await asyncio.sleep(2)
+                await open_and_wait(self.desktop, 'notepad')
                 
                 editor = self.desktop.locator('name:Edit')
                 
@@ -290,7 +237,7 @@ Generated by AI-powered automation system
 Timestamp: {__import__('time').strftime('%Y-%m-%d %H:%M:%S')}
 """
                 
-                editor.type_text(workflow_doc)
+                write_text(editor, workflow_doc)
                 results.append("Workflow documented")
             
             print(f"   ✓ Step completed")
@@ -312,13 +259,15 @@ async def main():
         print("\n🎯 Demo 1: AI-Generated Calculator Problems")
         print("-" * 50)
         problems = await agent.generate_calculator_tasks()
+        # Write the story while the calculator runs
+        content_task = asyncio.create_task(agent.generate_creative_content())
         await agent.execute_calculator_automation(problems)
         
         await asyncio.sleep(2)
         
         print("\n🎯 Demo 2: AI-Generated Creative Content")
         print("-" * 50)
-        content = await agent.generate_creative_content()
+        content = await content_task
         await agent.execute_notepad_automation(content)
         
         await asyncio.sleep(2)
@@ -337,6 +286,7 @@ async def main():
         print("• AI planned and executed a complete workflow")
         print("• All desktop interactions were automated!")
         print("\nThis is the future of intelligent automation! 🚀")
+        print(describe(shared_llm_cache()))
         
     except Exception as e:
         print(f"❌ Demo failed: {e}")
@@ -21,6 +21,10 @@ from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import tool
 from langchain import hub
 
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+from text_entry import write_text
+
 class AIDesktopButler:
     """An intelligent AI butler for your desktop using LangChain"""
     
@@ -120,8 +124,7 @@ class AIDesktopButler:
         print("\n📊 Creating your personalized AI dashboard...")
         
         # Open Notepad for dashboard
-        self.desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'notepad')
         
         editor = self.desktop.locator('name:Edit')
         
@@ -167,7 +170,7 @@ This dashboard updates based on your desktop activity.
 Last updated by AI Butler 🤖✨
 """
         
-        editor.type_text(dashboard)
+        write_text(editor, dashboard)
         print("✅ Personalized dashboard created!")
         
         return dashboard
@@ -195,8 +198,7 @@ Last updated by AI Butler 🤖✨
         
         # Create folders in a new notepad
         print("\n📝 Creating organization plan document...")
-        self.desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'notepad')
         
         editor = self.desktop.locator('name:Edit')
         
@@ -233,7 +235,7 @@ Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 Your files will be much more organized! 📊✨
 """
         
-        editor.type_text(org_doc)
+        write_text(editor, org_doc)
         print("✅ Organization plan documented!")
     
     async def productivity_coaching_session(self):
@@ -257,8 +259,7 @@ Your files will be much more organized! 📊✨
         
         # Calculate some motivational stats using calculator
         print("\n🧮 Calculating your productivity stats...")
-        self.desktop.open_application('calc')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'calc')
         
         # Fun calculation: Hours in a day * productivity factor
         calculations = [
@@ -269,39 +270,15 @@ Your files will be much more organized! 📊✨
         
         results = []
         for calc, description in calculations:
-            # Clear calculator
-            try:
-                clear_btn = self.desktop.locator('name:Clear')
-                clear_btn.click()
-                await asyncio.sleep(0.3)
-            except:
-                pass
-            
-            # Input calculation
-            for char in calc:
-                if char.isdigit():
-                    btn = self.desktop.locator(f'name:{char}')
-                    btn.click()
-                elif char == '*':
-                    btn = self.desktop.locator('name:Multiply by')
-                    btn.click()
-                elif char == '.':
-                    btn = self.desktop.locator('name:Decimal separator')
-                    btn.click()
-                await asyncio.sleep(0.2)
-            
-            # Get result
-            equals_btn = self.desktop.locator('name:Equals')
-            equals_btn.click()
-            await asyncio.sleep(0.5)
+            # Clear, input the calculation and get the result
+            await calculator_for(self.desktop).calculate_async(calc)
             
             results.append(f"{description}: {calc}")
             print(f"  ✅ {description}: {calc}")
         
         # Create coaching report
         print("\n📝 Creating productivity coaching report...")
-        self.desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'notepad')
         
         editor = self.desktop.locator('name:Edit')
         
@@ -337,7 +314,7 @@ Goal: Become an AI automation expert!
 Keep up the excellent work! 🚀🤖
 """
         
-        editor.type_text(coaching_report)
+        write_text(editor, coaching_report)
         print("✅ Coaching session documented!")
     
     async def creative_surprise_automation(self):
@@ -368,8 +345,7 @@ Keep up the excellent work! 🚀🤖
         
         # Display in Notepad with artistic formatting
         print("\n📝 Creating artistic display...")
-        self.desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(self.desktop, 'notepad')
         
         editor = self.desktop.locator('name:Edit')
         
@@ -391,7 +367,7 @@ Creativity Level: Maximum! 🚀
 Hope this brightened your day! 😊
         """
         
-        editor.type_text(artistic_display)
+        write_text(editor, artistic_display)
         print("✅ Creative surprise delivered!")
     
     async def run_butler_demo(self):
@@ -6,9 +6,38 @@ Tests Llama 3.3, Gemma2, DeepSeek, Qwen2.5, and other cutting-edge models
 
 import asyncio
 import terminator
-import ollama
+import sys
 import time
 
+from app_ready import open_and_wait
+from llm_benchmark import BenchmarkRunner, format_report
+from llm_cache import describe, shared_llm_cache
+from llm_client import achat
+from llm_stream import describe as stream_summary, stream_chat_into
+from model_index import shared_model_index
+from text_entry import write_text
+
+# Prompts for each model test (also used by the benchmark)
+TEST_PROMPTS = {
+    'creative_writing': """Write a very short (max 100 words), creative story about an AI that discovers it can control desktop applications. Make it fun and mention specific apps like Calculator and Notepad. Be creative but concise.""",
+    'math_generation': """Generate exactly 3 calculator problems. Return ONLY the math expressions, one per line. Examples:
+25*4
+100-37
+15+28
+Make them interesting but simple enough for a basic calculator.""",
+    'automation_planning': """Plan a 3-step desktop automation workflow. Be specific about applications and actions. Format as:
+Step 1: [Action]
+Step 2: [Action] 
+Step 3: [Action]
+
+Example:
+Step 1: Open Calculator app
+Step 2: Calculate 50+25
+Step 3: Open Notepad and document the result
+
+Make it practical and specific.""",
+}
+
 class LatestModelTester:
     """Test the newest AI models with desktop automation"""
     
@@ -27,49 +56,33 @@ class LatestModelTester:
         """Check which models are available"""
         print("🔍 Checking available models...")
         
-        try:
-            models = ollama.list()
-            print(f"✓ Found {len(models.get('models', []))} installed models")
-            
-            # Get model names properly
-            available_names = []
-            for model in models.get('models', []):
-                if isinstance(model, dict) and 'name' in model:
-                    available_names.append(model['name'])
-                elif isinstance(model, str):
-                    available_names.append(model)
-            
-            print(f"Available models: {available_names}")
-            
-            # Find which of our preferred models are available
-            for model in self.models_to_test:
-                found = False
-                for available in available_names:
-                    if model in available or available.startswith(model):
-                        self.available_models.append(model)
-                        print(f"  ✅ {model} - Available (as {available})")
-                        found = True
-                        break
-                
-                if not found:
-                    print(f"  ❌ {model} - Not installed")
-            
-            if not self.available_models:
-                print("⚠️ No preferred models found. Will try to use any available model...")
-                # Fallback: use any available model
-                if available_names:
-                    self.available_models = available_names[:3]  # Use first 3 available
-                    print(f"Using available models: {self.available_models}")
-                    return True
-                return False
-                
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to check models: {e}")
-            import traceback
-            traceback.print_exc()
+        index = shared_model_index()
+        if not index.refresh():
+            return False
+        
+        available_names = index.names()
+        print(f"✓ Found {len(available_names)} installed models")
+        print(f"Available models: {available_names}")
+        
+        # Find which of our preferred models are available
+        for model in self.models_to_test:
+            installed = index.resolve(model)
+            if installed:
+                self.available_models.append(installed)
+                print(f"  ✅ {model} - Available (as {installed})")
+            else:
+                print(f"  ❌ {model} - Not installed")
+        
+        if not self.available_models:
+            print("⚠️ No preferred models found. Will try to use any available model...")
+            # Fallback: the fastest models able to handle every test
+            if available_names:
+                self.available_models = index.rank('planning')[:3]
+                print(f"Using available models: {self.available_models}")
+                return True
             return False
+            
+        return True
     
     async def download_latest_model(self):
         """Download the latest recommended model"""
@@ -95,16 +108,16 @@ class LatestModelTester:
         try:
             start_time = time.time()
             
-            prompt = """Write a very short (max 100 words), creative story about an AI that discovers it can control desktop applications. Make it fun and mention specific apps like Calculator and Notepad. Be creative but concise."""
+            prompt = TEST_PROMPTS['creative_writing']
             
-            response = ollama.chat(model=model_name, messages=[
+            response = await achat(model=model_name, messages=[
                 {'role': 'user', 'content': prompt}
             ])
             
             response_time = time.time() - start_time
             content = response['message']['content']
             
-            print(f"⏱️ Response time: {response_time:.2f}s")
+            print(f"⏱️ Response time: {response_time:.2f}s{' (cached)' if response.get('cached') else ''}")
             print(f"📝 Content length: {len(content)} characters")
             print(f"✨ Generated content preview:")
             print("-" * 30)
@@ -115,6 +128,7 @@ class LatestModelTester:
                 'model': model_name,
                 'task': 'creative_writing',
                 'response_time': response_time,
+                'cached': response.get('cached', False),
                 'content_length': len(content),
                 'content': content,
                 'success': True
@@ -137,13 +151,9 @@ class LatestModelTester:
         try:
             start_time = time.time()
             
-            prompt = """Generate exactly 3 calculator problems. Return ONLY the math expressions, one per line. Examples:
-25*4
-100-37
-15+28
-Make them interesting but simple enough for a basic calculator."""
+            prompt = TEST_PROMPTS['math_generation']
             
-            response = ollama.chat(model=model_name, messages=[
+            response = await achat(model=model_name, messages=[
                 {'role': 'user', 'content': prompt}
             ])
             
@@ -154,7 +164,7 @@ Make them interesting but simple enough for a basic calculator."""
             import re
             expressions = re.findall(r'\d+[\+\-\*/]\d+', content)
             
-            print(f"⏱️ Response time: {response_time:.2f}s")
+            print(f"⏱️ Response time: {response_time:.2f}s{' (cached)' if response.get('cached') else ''}")
             print(f"🔢 Found {len(expressions)} math expressions")
             print(f"📊 Expressions: {expressions}")
             
@@ -162,6 +172,7 @@ Make them interesting but simple enough for a basic calculator."""
                 'model': model_name,
                 'task': 'math_generation',
                 'response_time': response_time,
+                'cached': response.get('cached', False),
                 'expressions': expressions,
                 'raw_content': content,
                 'success': len(expressions) > 0
@@ -184,19 +195,9 @@ Make them interesting but simple enough for a basic calculator."""
         try:
             start_time = time.time()
             
-            prompt = """Plan a 3-step desktop automation workflow. Be specific about applications and actions. Format as:
-Step 1: [Action]
-Step 2: [Action] 
-Step 3: [Action]
-
-Example:
-Step 1: Open Calculator app
-Step 2: Calculate 50+25
-Step 3: Open Notepad and document the result
-
-Make it practical and specific."""
+            prompt = TEST_PROMPTS['automation_planning']
             
-            response = ollama.chat(model=model_name, messages=[
+            response = await achat(model=model_name, messages=[
                 {'role': 'user', 'content': prompt}
             ])
             
@@ -206,7 +207,7 @@ Make it practical and specific."""
             # Extract steps
             steps = re.findall(r'Step \d+:.*', content)
             
-            print(f"⏱️ Response time: {response_time:.2f}s")
+            print(f"⏱️ Response time: {response_time:.2f}s{' (cached)' if response.get('cached') else ''}")
             print(f"📋 Found {len(steps)} workflow steps")
             print("🎯 Workflow plan:")
             for step in steps:
@@ -216,6 +217,7 @@ Make it practical and specific."""
                 'model': model_name,
                 'task': 'automation_planning',
                 'response_time': response_time,
+                'cached': response.get('cached', False),
                 'steps': steps,
                 'raw_content': content,
                 'success': len(steps) >= 3
@@ -236,31 +238,28 @@ Make it practical and specific."""
         print("="*60)
         
         try:
-            # Generate content with the best model
-            print("🧠 Generating automation content...")
-            
-            response = ollama.chat(model=best_model, messages=[
-                {'role': 'user', 'content': 'Write a short message (max 100 words) celebrating the successful testing of AI models for desktop automation. Mention specific models tested and be enthusiastic!'}
-            ])
-            
-            content = response['message']['content']
-            
-            # Automate Notepad to display the content
             print("📝 Automating Notepad to display results...")
             
-            self.desktop.open_application('notepad')
-            await asyncio.sleep(2)
+            await open_and_wait(self.desktop, 'notepad')
             
             editor = self.desktop.locator('name:Edit')
             
-            # Create a comprehensive report
-            report = f"""🤖 LATEST AI MODELS TEST RESULTS
+            # Type the header, then stream the message in as it is generated
+            write_text(editor, f"""🤖 LATEST AI MODELS TEST RESULTS
 {'='*50}
 Test Date: {time.strftime('%Y-%m-%d %H:%M:%S')}
 Best Performing Model: {best_model}
 
 AI-GENERATED CELEBRATION MESSAGE:
-{content}
+""")
+            
+            content, stats = await stream_chat_into(editor, best_model, [
+                {'role': 'user', 'content': 'Write a short message (max 100 words) celebrating the successful testing of AI models for desktop automation. Mention specific models tested and be enthusiastic!'}
+            ])
+            print(f"✓ {stream_summary(stats)}")
+            
+            # Create a comprehensive report
+            report = f"""
 
 {'='*50}
 MODELS TESTED:
@@ -283,7 +282,7 @@ TECHNOLOGY STACK:
 This report was generated entirely by AI and typed automatically! 🚀
 """
             
-            editor.type_text(report)
+            write_text(editor, report)
             print("✅ Automation demonstration completed!")
             
             return True
@@ -327,7 +326,9 @@ This report was generated entirely by AI and typed automatically! 🚀
             
             # Calculate score for this model
             successful_tests = sum(1 for r in results if r['success'])
-            avg_response_time = sum(r.get('response_time', 10) for r in results if r['success']) / max(successful_tests, 1)
+            # Cached answers took no generation time, so they would skew the ranking
+            timed = [r.get('response_time', 10) for r in results if r['success'] and not r.get('cached')]
+            avg_response_time = sum(timed) / max(len(timed), 1)
             
             model_scores[model] = {
                 'successful_tests': successful_tests,
@@ -357,11 +358,54 @@ This report was generated entirely by AI and typed automatically! 🚀
         print(f"{'='*60}")
         print("Latest AI models successfully tested with desktop automation!")
         print("Check your Notepad for the full test results! 📝")
+        print(describe(shared_llm_cache()))
+
+    async def run_benchmark(self, concurrency=2, max_resident=None, repeats=3, host=None):
+        """Benchmark every available model on all test prompts concurrently
+
+        Runs up to `concurrency` requests at once across at most
+        `max_resident` models and reports latency, time-to-first-token and
+        tokens/sec percentiles per model. Bypasses the response cache.
+        """
+        print("⚡ CONCURRENT MODEL BENCHMARK")
+        print("="*60)
+        
+        if not self.available_models and not await self.check_available_models():
+            print("⚠️ No models available to benchmark.")
+            return None
+        
+        limits = {}
+        if max_resident is not None:
+            limits['max_resident'] = max_resident
+        if host is not None:
+            limits['host'] = host
+        runner = BenchmarkRunner(concurrency=concurrency, **limits)
+        jobs = runner.jobs_for(self.available_models, TEST_PROMPTS, repeats)
+        
+        print(f"🎯 {len(jobs)} requests across {len(self.available_models)} models "
+              f"(concurrency {runner.concurrency}, {runner.max_resident} resident)")
+        results, summary = await runner.run(jobs)
+        
+        # Measured throughput feeds the model index's speed ranking
+        for model, entry in summary.items():
+            shared_model_index().record_speed(model, entry['tokens_per_sec_p50'])
+        
+        print()
+        print(format_report(summary, runner.wall_time))
+        for result in results:
+            if not result['success']:
+                print(f"❌ {result['model']} - {result['task']}: {result['error'] or 'empty response'}")
+        
+        return {'results': results, 'summary': summary, 'wall_time': runner.wall_time}
 
 async def main():
-    """Main test function"""
+    """Main test function (--benchmark [concurrency] for the concurrent benchmark)"""
     tester = LatestModelTester()
-    await tester.run_comprehensive_test()
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+        await tester.run_benchmark(concurrency=concurrency)
+    else:
+        await tester.run_comprehensive_test()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
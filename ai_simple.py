@@ -7,7 +7,13 @@ Basic example using Ollama to generate content and automate Notepad
 
 import asyncio
 import terminator
-import ollama
+
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+from llm_client import achat
+from llm_stream import describe as stream_summary, stream_chat_into
+from model_manager import DEFAULT_KEEP_ALIVE, warm_up
+from text_entry import write_text
 
 async def ai_generated_notepad_demo():
     """Simple demo: AI generates text, we type it in Notepad"""
@@ -20,27 +26,24 @@ async def ai_generated_notepad_demo():
         
         prompt = """Write a short, fun story (max 150 words) about a friendly robot that loves to help people with computer tasks. Make it cheerful and simple."""
         
-        response = ollama.chat(model='llama3.2', messages=[
-            {'role': 'user', 'content': prompt}
-        ])
-        
-        ai_story = response['message']['content']
-        print("✓ AI has written a story!")
-        
-        # Now automate Notepad to type the story
-        print("\n📝 Opening Notepad and typing the AI story...")
-        
+        print("\n📝 Opening Notepad and streaming the AI story into it...")
         desktop = terminator.Desktop()
-        desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(desktop, 'notepad')
         
         editor = desktop.locator('name:Edit')
         
-        # Create a nice formatted document
-        document = f"""AI-Generated Story
+        # Create a nice formatted document, typing the story as it is generated
+        write_text(editor, f"""AI-Generated Story
 {'='*30}
 
-{ai_story}
+""")
+        
+        ai_story, stats = await stream_chat_into(editor, 'llama3.2', [
+            {'role': 'user', 'content': prompt}
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
+        print(f"✓ AI has written a story! {stream_summary(stats)}")
+        
+        write_text(editor, f"""
 
 {'='*30}
 Generated by: Local AI (Ollama)
@@ -48,9 +51,7 @@ Typed by: Terminator SDK automation
 Date: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 This story was written by AI and typed automatically! 🤖✨
-"""
-        
-        editor.type_text(document)
+""")
         print("✓ Story typed in Notepad!")
         
         print("\n🎉 Demo completed! Check your Notepad window!")
@@ -72,9 +73,9 @@ async def ai_calculator_helper():
         
         prompt = """Give me 2 simple but interesting math problems that would be good for a calculator demo. Just give me the math expressions, like "25*4" or "100-37", one per line. Keep them simple."""
         
-        response = ollama.chat(model='llama3.2', messages=[
+        response = await achat(model='llama3.2', messages=[
             {'role': 'user', 'content': prompt}
-        ])
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
         
         ai_response = response['message']['content']
         print(f"✓ AI suggested: {ai_response}")
@@ -93,46 +94,17 @@ async def ai_calculator_helper():
         print("\n🔢 Solving AI-suggested problems...")
         
         desktop = terminator.Desktop()
-        desktop.open_application('calc')
-        await asyncio.sleep(2)
+        await open_and_wait(desktop, 'calc')
         
         for i, expr in enumerate(expressions[:2], 1):  # Limit to 2 problems
             print(f"  Problem {i}: {expr}")
             
-            # Clear calculator
-            try:
-                clear_btn = desktop.locator('name:Clear')
-                clear_btn.click()
-                await asyncio.sleep(0.3)
-            except:
-                pass
+            # Clear, enter the expression and get the result
+            result = await calculator_for(desktop).calculate_async(expr)
+            if not result['success']:
+                raise RuntimeError(result['error'])
             
-            # Input the expression
-            for char in expr:
-                if char.isdigit():
-                    btn = desktop.locator(f'name:{char}')
-                    btn.click()
-                elif char == '+':
-                    btn = desktop.locator('name:Plus')
-                    btn.click()
-                elif char == '-':
-                    btn = desktop.locator('name:Minus')
-                    btn.click()
-                elif char == '*':
-                    btn = desktop.locator('name:Multiply by')
-                    btn.click()
-                elif char == '/':
-                    btn = desktop.locator('name:Divide by')
-                    btn.click()
-                
-                await asyncio.sleep(0.2)
-            
-            # Get result
-            equals_btn = desktop.locator('name:Equals')
-            equals_btn.click()
-            await asyncio.sleep(1)
-            
-            print(f"  ✓ Solved: {expr}")
+            print(f"  ✓ Solved: {expr} ({result['latency']:.2f}s)")
         
         print("🎉 All AI-suggested problems solved!")
         
@@ -146,6 +118,9 @@ async def main():
     print("Using Ollama + Terminator SDK")
     print("="*50)
     
+    # Load the model in the background so the first prompt skips the cold start
+    warm_up('llama3.2')
+    
     # Demo 1: AI story in Notepad
     await ai_generated_notepad_demo()
     
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+App Readiness Waits - Proceed the moment an application is interactive
+Polls a probe element with expect_visible/expect_enabled and exponential
+backoff instead of sleeping a fixed 2-4 seconds after open_application().
+Probes are scoped to the window that was just opened, so an older window of
+the same application cannot make the wait return early.
+"""
+
+import asyncio
+import time
+
+# Element that proves each application is ready for input
+DEFAULT_PROBES = {
+    'calc': 'automationid:CalculatorResults',
+    'notepad': 'name:Edit',
+    'mspaint': ['automationid:Canvas', 'name:Canvas', 'class:Canvas'],
+    'explorer': 'name:Desktop',
+}
+
+
+def _probe_selectors(app, probe_selector):
+    """Normalize the probe for an app to a list of selectors"""
+    probe = probe_selector or DEFAULT_PROBES.get(app)
+    if probe is None:
+        raise ValueError(f"No probe selector known for '{app}', pass probe_selector")
+    return [probe] if isinstance(probe, str) else list(probe)
+
+
+def _backoff(initial_delay, max_delay, factor=2.0):
+    """Yield exponentially growing poll delays, capped at max_delay"""
+    delay = initial_delay
+    while True:
+        yield delay
+        delay = min(delay * factor, max_delay)
+
+
+class _WindowScope:
+    """Chains probe selectors under a window selector for windows without their own locator()"""
+
+    def __init__(self, desktop, window_name):
+        self.desktop = desktop
+        self.window_name = window_name
+
+    def locator(self, selector):
+        return self.desktop.locator(f'window:{self.window_name}').locator(selector)
+
+
+def probe_scope(desktop, window):
+    """Where to look for the probe: inside the opened window when it is known
+
+    window is what open_application() returned. Elements with their own
+    locator() are searched directly; otherwise the probe is chained under
+    the window's name, and without a window the whole desktop is searched.
+    """
+    if window is None:
+        return desktop
+    if callable(getattr(window, 'locator', None)):
+        return window
+    name = getattr(window, 'name', None)
+    name = name() if callable(name) else name
+    return _WindowScope(desktop, name) if name else desktop
+
+
+def probe_ready(desktop, selectors, attempt_timeout=0.05):
+    """Single readiness check: is any probe element visible and enabled?
+
+    desktop can be anything with locator(), e.g. the scope from probe_scope().
+    """
+    timeout_ms = max(int(attempt_timeout * 1000), 1)
+    for selector in selectors:
+        try:
+            locator = desktop.locator(selector)
+            locator.expect_visible(timeout=timeout_ms)
+            locator.expect_enabled(timeout=timeout_ms)
+            return True
+        except Exception:
+            continue
+    return False
+
+
+async def await_app_ready(app, probe_selector=None, timeout=10.0, desktop=None,
+                          initial_delay=0.05, max_delay=0.8, window=None):
+    """Wait until an app's probe element is interactive; returns True when ready
+
+    Pass the element open_application() returned as window to only accept a
+    probe inside that window.
+    """
+    if desktop is None:
+        import terminator
+        desktop = terminator.Desktop()
+
+    selectors = _probe_selectors(app, probe_selector)
+    scope = probe_scope(desktop, window)
+    started = time.monotonic()
+
+    for delay in _backoff(initial_delay, max_delay):
+        if probe_ready(scope, selectors):
+            print(f"✓ {app} ready after {time.monotonic() - started:.2f}s")
+            return True
+
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            print(f"⚠ {app} not ready after {timeout:.1f}s, continuing anyway")
+            return False
+        await asyncio.sleep(min(delay, remaining))
+
+
+def wait_app_ready(app, probe_selector=None, timeout=10.0, desktop=None,
+                   initial_delay=0.05, max_delay=0.8, window=None):
+    """Blocking variant of await_app_ready for synchronous code such as tool _run methods"""
+    if desktop is None:
+        import terminator
+        desktop = terminator.Desktop()
+
+    selectors = _probe_selectors(app, probe_selector)
+    scope = probe_scope(desktop, window)
+    started = time.monotonic()
+
+    for delay in _backoff(initial_delay, max_delay):
+        if probe_ready(scope, selectors):
+            print(f"✓ {app} ready after {time.monotonic() - started:.2f}s")
+            return True
+
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            print(f"⚠ {app} not ready after {timeout:.1f}s, continuing anyway")
+            return False
+        time.sleep(min(delay, remaining))
+
+
+async def open_and_wait(desktop, app, probe_selector=None, timeout=10.0):
+    """Open an application and wait until it is interactive"""
+    window = desktop.open_application(app)
+    return await await_app_ready(app, probe_selector, timeout, desktop=desktop, window=window)
+
+
+def open_and_wait_sync(desktop, app, probe_selector=None, timeout=10.0):
+    """Blocking variant of open_and_wait"""
+    window = desktop.open_application(app)
+    return wait_app_ready(app, probe_selector, timeout, desktop=desktop, window=window)
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Calculator Expression Engine - One shared way to drive Windows Calculator
+Tokenizes an expression once, resolves every button once per Calculator
+session and replays the token stream as a batched click plan - or, in
+keyboard mode, types the whole expression in one go.
+"""
+
+import ast
+import asyncio
+import operator
+import re
+import time
+
+from delay_calibration import shared_calibrator
+from element_cache import CachedDesktop
+
+# Calculator button selectors for every supported token
+BUTTON_SELECTORS = {
+    '+': 'name:Plus',
+    '-': 'name:Minus',
+    '*': 'name:Multiply by',
+    '/': 'name:Divide by',
+    '=': 'name:Equals',
+    '.': 'name:Decimal separator',
+    '(': 'name:Open parenthesis',
+    ')': 'name:Close parenthesis',
+}
+# Digit buttons are named 'Zero'..'Nine', their automation ids are stable
+for _digit in '0123456789':
+    BUTTON_SELECTORS[_digit] = f'automationid:num{_digit}Button'
+
+# Clicks whose effect shows up on the display, so their latency can be measured
+MEASURED_CLICKS = {BUTTON_SELECTORS[digit]: 'click' for digit in '123456789'}
+MEASURED_CLICKS[BUTTON_SELECTORS['=']] = 'equals'
+
+CLEAR_SELECTOR = 'name:Clear'
+RESULTS_SELECTOR = 'automationid:CalculatorResults'
+WINDOW_SELECTOR = 'window:Calculator'
+
+INPUT_MODES = ('keyboard', 'buttons')
+# Typed entries showing the wrong number this many times in a row turn keyboard mode off
+KEYBOARD_MISMATCH_LIMIT = 3
+
+# Friendly aliases that show up in AI-generated expressions
+TOKEN_ALIASES = {
+    'x': '*',
+    'X': '*',
+    '×': '*',
+    '÷': '/',
+    ',': '.',
+}
+
+
+def tokenize(expression):
+    """Turn an expression into calculator tokens, skipping anything unsupported"""
+    tokens = []
+    for char in expression:
+        char = TOKEN_ALIASES.get(char, char)
+        if char in BUTTON_SELECTORS:
+            tokens.append(char)
+    return tokens
+
+
+def compile_expression(expression, equals=True):
+    """Compile an expression into the ordered list of button selectors to click"""
+    tokens = tokenize(expression)
+    if equals and (not tokens or tokens[-1] != '='):
+        tokens.append('=')
+    return [BUTTON_SELECTORS[token] for token in tokens]
+
+
+def compile_keystrokes(expression, equals=True):
+    """Compile an expression into the key sequence Calculator accepts when typed"""
+    tokens = tokenize(expression)
+    if equals and (not tokens or tokens[-1] != '='):
+        tokens.append('=')
+    return ''.join(tokens)
+
+
+_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_SYMBOLS = {'+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.Div}
+
+
+def evaluate(expression):
+    """Evaluate a plain arithmetic expression locally, or None if it is not one"""
+    def walk(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+            return _OPERATORS[type(node.op)](walk(node.left), walk(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -walk(node.operand)
+        raise ValueError("unsupported expression")
+
+    source = ''.join(token for token in tokenize(expression) if token != '=')
+    try:
+        return walk(ast.parse(source, mode='eval').body)
+    except Exception:
+        return None
+
+
+def evaluate_immediate(expression):
+    """Evaluate an expression left to right like Standard-mode Calculator (2+3*4 is 20), or None
+
+    Standard mode has no parentheses, so expressions with them return None.
+    """
+    source = ''.join(token for token in tokenize(expression) if token != '=')
+    if '(' in source or ')' in source:
+        return None
+
+    value = 0.0
+    pending = None
+    try:
+        for part in re.findall(r'\d*\.?\d+\.?|[-+*/]', source):
+            if part in '+-*/':
+                pending = part
+                continue
+            number = float(part)
+            value = _OPERATORS[_SYMBOLS[pending]](value, number) if pending else number
+            pending = None
+    except (ZeroDivisionError, ValueError):
+        return None
+    return value
+
+
+def display_number(text):
+    """Pull the number out of display text like 'Display is 1,234.5'"""
+    if not text:
+        return None
+    match = re.search(r'-?\d[\d,]*(?:\.\d+)?', text)
+    if not match:
+        return None
+    return float(match.group().replace(',', ''))
+
+
+def expected_displays(expression, equals=True):
+    """The numbers the display may show after entering an expression (empty if unknown)
+
+    With equals that is the result, evaluated with operator precedence as
+    Scientific mode does and left to right as Standard mode does; without
+    it Calculator shows the last number entered.
+    """
+    if equals:
+        values = (evaluate(expression), evaluate_immediate(expression))
+        return [value for value in dict.fromkeys(values) if value is not None]
+    numbers = re.findall(r'\d+(?:\.\d*)?', ''.join(tokenize(expression)))
+    return [float(numbers[-1])] if numbers else []
+
+
+class CalculatorEngine:
+    """Drives one Calculator session with pre-resolved button elements"""
+
+    def __init__(self, desktop, action_delay=0.05, settle_delay=0.2, input_mode='keyboard',
+                 verify_timeout=0.5, poll_interval=0.01, calibrator=None):
+        """Create an engine bound to a desktop (the Calculator must already be open)"""
+        if input_mode not in INPUT_MODES:
+            raise ValueError(f"input_mode must be one of {INPUT_MODES}, got {input_mode!r}")
+        if not isinstance(desktop, CachedDesktop):
+            desktop = CachedDesktop(desktop)
+
+        self.desktop = desktop
+        self.action_delay = action_delay
+        self.settle_delay = settle_delay
+        self.input_mode = input_mode
+        self.verify_timeout = verify_timeout
+        self.poll_interval = poll_interval
+        self.calibrator = calibrator
+        self.keyboard_rejected = False
+        self.keyboard_mismatches = 0
+        self.history = []
+
+    def reset_session(self):
+        """Forget resolved buttons, e.g. after Calculator was closed and reopened"""
+        self.desktop.invalidate()
+        self.keyboard_rejected = False
+        self.keyboard_mismatches = 0
+
+    def use_keyboard(self):
+        """Whether the next expression should try the typed-keys fast path"""
+        return self.input_mode == 'keyboard' and not self.keyboard_rejected
+
+    def element(self, selector):
+        """Get the element for a selector, resolving it once per session"""
+        return self.desktop.locator(selector)
+
+    def prepare(self, expression, equals=True):
+        """Build the click plan and resolve every button it needs up front"""
+        plan = compile_expression(expression, equals=equals)
+
+        for selector in dict.fromkeys(plan):
+            self.element(selector)
+
+        return plan
+
+    def clear(self):
+        """Clear the calculator, ignoring layouts without a Clear button"""
+        try:
+            self._click(CLEAR_SELECTOR)
+            return True
+        except Exception:
+            return False
+
+    def read_display(self):
+        """Read the text currently shown in the result display"""
+        try:
+            result = self.element(RESULTS_SELECTOR).get_text()
+            return getattr(result, 'text', result)
+        except Exception:
+            return None
+
+    def _click(self, selector):
+        """Click a planned button, re-resolving once if the cached element went stale"""
+        try:
+            self.element(selector).click()
+        except Exception:
+            if self.calibrator and selector in MEASURED_CLICKS:
+                self.calibrator.record_outcome('calc', MEASURED_CLICKS[selector], False)
+            self.desktop.invalidate(selector)
+            self.element(selector).click()
+
+    def _delay(self, action, default):
+        """Learned delay for an action when calibrated, otherwise the configured default"""
+        if self.calibrator is None:
+            return default
+        return self.calibrator.delay('calc', action, default)
+
+    def _measurement(self, selector):
+        """Return (action, perform, condition) when this click should be measured"""
+        action = MEASURED_CLICKS.get(selector)
+        if self.calibrator is None or action is None:
+            return None
+        if not self.calibrator.needs_calibration('calc', action):
+            return None
+
+        before = self.read_display()
+        return (action, lambda: self._click(selector), lambda: self.read_display() != before)
+
+    def _record(self, expression, plan, started, read_result, error=None, mode='buttons'):
+        """Build and remember the result for one expression"""
+        result = {
+            'expression': expression,
+            'mode': mode,
+            'clicks': len(plan),
+            'latency': time.perf_counter() - started,
+            'display': self.read_display() if read_result and error is None else None,
+            'success': error is None,
+        }
+        if error is not None:
+            result['error'] = str(error)
+
+        self.history.append(result)
+        return result
+
+    def _display_before_typing(self, clear):
+        """Clear when asked and return what the display shows before any key is sent"""
+        if clear:
+            self.clear()
+        return self.read_display()
+
+    def _type_expression(self, expression, equals):
+        """Send the whole expression as one key sequence"""
+        self.element(WINDOW_SELECTOR).type_text(compile_keystrokes(expression, equals=equals))
+
+    def _keyboard_accepted(self, expression, before, equals):
+        """Check the result display to see whether the typed keys were taken
+
+        When the value the display should show is known (the result in
+        either mode, or the last number entered when equals is off) it has to
+        match one of them; otherwise any change of the display counts.
+        """
+        shown = self.read_display()
+        expected = expected_displays(expression, equals)
+        if not expected:
+            return shown is not None and shown != before
+
+        value = display_number(shown)
+        return value is not None and any(abs(value - number) <= 1e-9 * max(1.0, abs(number))
+                                         for number in expected)
+
+    def _keyboard_failed(self, expression, before):
+        """Fall back to the buttons for this expression
+
+        Keyboard mode is turned off for the session when the keys did not
+        reach the display at all, or after KEYBOARD_MISMATCH_LIMIT typed
+        entries in a row showed the wrong number. Returns True when the
+        attempt left input on the display that has to be cleared before the
+        buttons enter the expression again.
+        """
+        stray = self.read_display() != before
+        self.keyboard_mismatches = self.keyboard_mismatches + 1 if stray else 0
+        if not stray or self.keyboard_mismatches >= KEYBOARD_MISMATCH_LIMIT:
+            self.keyboard_rejected = True
+        print(f"⚠ Keyboard input rejected for {expression}, falling back to button clicks")
+        return stray
+
+    def _entry(self, expression, equals, clear, read_result):
+        """Shared body of calculate() and calculate_async()
+
+        A generator that yields what to wait for - seconds to sleep, or an
+        (action, perform, condition) click to measure - so each entry point
+        only supplies its own way of waiting. Errors raised while waiting are
+        thrown back in; the result dict is the generator's return value.
+        """
+        started = time.perf_counter()
+        plan = []
+
+        stray = False
+        if self.use_keyboard():
+            before = self._display_before_typing(clear)
+            try:
+                self._type_expression(expression, equals)
+                deadline = time.monotonic() + self.verify_timeout
+                while True:
+                    if self._keyboard_accepted(expression, before, equals):
+                        self.keyboard_mismatches = 0
+                        return self._record(expression, ['type_text'], started, read_result,
+                                            mode='keyboard')
+                    if time.monotonic() >= deadline:
+                        break
+                    yield self.poll_interval
+            except Exception:
+                pass
+            stray = self._keyboard_failed(expression, before)
+
+        try:
+            plan = self.prepare(expression, equals=equals)
+            # A partial or wrong typed attempt must not be built on by the clicks
+            if clear or stray:
+                self.clear()
+            measured = set()
+            for selector in plan:
+                measurement = self._measurement(selector)
+                if measurement:
+                    yield measurement
+                    measured.add(measurement[0])
+                    continue
+                self._click(selector)
+                delay = self._delay('click', self.action_delay)
+                if delay:
+                    yield delay
+            settle = self._delay('equals', self.settle_delay)
+            if settle and 'equals' not in measured:
+                yield settle
+            if measured:
+                self.calibrator.save()
+        except Exception as e:
+            return self._record(expression, plan, started, read_result, error=e)
+
+        return self._record(expression, plan, started, read_result)
+
+    def calculate(self, expression, equals=True, clear=True, read_result=False):
+        """Enter an expression synchronously and return a result dict with latency"""
+        steps = self._entry(expression, equals, clear, read_result)
+        try:
+            wait = next(steps)
+            while True:
+                try:
+                    if isinstance(wait, tuple):
+                        action, perform, condition = wait
+                        self.calibrator.measure('calc', action, perform, condition, timeout=self.verify_timeout)
+                    else:
+                        time.sleep(wait)
+                except Exception as e:
+                    wait = steps.throw(e)
+                else:
+                    wait = next(steps)
+        except StopIteration as done:
+            return done.value
+
+    async def calculate_async(self, expression, equals=True, clear=True, read_result=False):
+        """Enter an expression without blocking the event loop between clicks"""
+        steps = self._entry(expression, equals, clear, read_result)
+        try:
+            wait = next(steps)
+            while True:
+                try:
+                    if isinstance(wait, tuple):
+                        action, perform, condition = wait
+                        await self.calibrator.measure_async('calc', action, perform, condition,
+                                                            timeout=self.verify_timeout)
+                    else:
+                        await asyncio.sleep(wait)
+                except Exception as e:
+                    wait = steps.throw(e)
+                else:
+                    wait = next(steps)
+        except StopIteration as done:
+            return done.value
+
+    def latency_summary(self):
+        """Summarize per-expression latency across this session"""
+        latencies = [r['latency'] for r in self.history if r['success']]
+        if not latencies:
+            return {'count': 0, 'total': 0.0, 'average': 0.0, 'max': 0.0}
+
+        return {
+            'count': len(latencies),
+            'total': sum(latencies),
+            'average': sum(latencies) / len(latencies),
+            'max': max(latencies),
+        }
+
+
+# One engine per desktop so every script shares the resolved buttons
+_engines = {}
+
+
+def calculator_for(desktop, **options):
+    """Get the shared CalculatorEngine for a desktop, creating it on first use"""
+    entry = _engines.get(id(desktop))
+    if entry is None or entry[0] is not desktop:
+        options.setdefault('calibrator', shared_calibrator())
+        entry = (desktop, CalculatorEngine(desktop, **options))
+        _engines[id(desktop)] = entry
+    return entry[1]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Canvas Capture Pipeline - Crop, downscale and encode only what the model needs
+Uses the canvas element's get_bounds() to crop the full-screen capture, scales
+the crop down to the resolution each vision model actually works at and
+encodes it once. Smaller images encode faster and run through vision models
+much faster.
+"""
+
+import base64
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from element_cache import resolve_element
+from stroke_executor import CANVAS_SELECTORS
+
+# Per-model capture settings: longest side after downscaling and encoding format
+VISION_PROFILES = {
+    'gemma3': {'max_side': 896, 'format': 'PNG', 'crop': True},
+    'llava': {'max_side': 672, 'format': 'PNG', 'crop': True},
+    'default': {'max_side': 1024, 'format': 'PNG', 'crop': True},
+}
+
+
+def vision_profile(model=None, **overrides):
+    """Capture settings for a model (matched by name prefix), with overrides applied"""
+    profile = VISION_PROFILES['default']
+    if model:
+        for prefix, settings in VISION_PROFILES.items():
+            if model.startswith(prefix):
+                profile = settings
+                break
+    return dict(profile, **overrides)
+
+
+def canvas_bounds(desktop, selectors=CANVAS_SELECTORS):
+    """Screen bounds (x, y, width, height) of the Paint canvas, or None if not found"""
+    for selector in selectors:
+        try:
+            bounds = resolve_element(desktop.locator(selector)).get_bounds()
+            return int(bounds.x), int(bounds.y), int(bounds.width), int(bounds.height)
+        except Exception:
+            continue
+    return None
+
+
+def decode_screenshot(image_data, width=None, height=None):
+    """Image from raw RGBA screenshot bytes (when the size is known) or an encoded file"""
+    if width and height and len(image_data) == width * height * 4:
+        # frombuffer wraps the bytes without copying them
+        return Image.frombuffer('RGBA', (width, height), image_data, 'raw', 'RGBA', 0, 1)
+    return Image.open(BytesIO(image_data))
+
+
+def crop_to_bounds(image, bounds):
+    """Crop to (x, y, width, height), clamped to the image"""
+    if not bounds:
+        return image
+    x, y, width, height = bounds
+    left, top = max(x, 0), max(y, 0)
+    right, bottom = min(x + width, image.width), min(y + height, image.height)
+    if right <= left or bottom <= top:
+        return image
+    return image.crop((left, top, right, bottom))
+
+
+def downscale(image, max_side):
+    """Shrink so the longest side is at most max_side (never enlarges)"""
+    scale = max_side / max(image.size) if max_side else 1.0
+    if scale >= 1.0:
+        return image
+    size = (max(int(image.width * scale), 1), max(int(image.height * scale), 1))
+    return image.resize(size, Image.BILINEAR)
+
+
+def encode_image(image, fmt='PNG'):
+    """Encode once to bytes in the given format"""
+    if fmt.upper() == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def to_base64(data):
+    """Base64 text for an encoded image (accepts memoryviews)"""
+    return base64.b64encode(data).decode('utf-8')
+
+
+def process_capture(screenshot, bounds=None, model=None, **overrides):
+    """Crop a ScreenshotResult to bounds, downscale for the model and encode it
+
+    Returns (encoded bytes, metadata) ready for CaptureStore.put().
+    """
+    started = time.perf_counter()
+    profile = vision_profile(model, **overrides)
+    source = decode_screenshot(screenshot.image_data,
+                               getattr(screenshot, 'width', None),
+                               getattr(screenshot, 'height', None))
+
+    image = crop_to_bounds(source, bounds if profile['crop'] else None)
+    image = downscale(image, profile['max_side'])
+    data = encode_image(image, profile['format'])
+
+    meta = {
+        'format': profile['format'].lower(),
+        'width': image.width,
+        'height': image.height,
+        'bounds': bounds,
+        'source_size': source.size,
+        'model': model,
+        'encode_ms': (time.perf_counter() - started) * 1000,
+    }
+    return data, meta
+
+
+def describe(meta):
+    """One-line summary of a processed capture"""
+    return (f"{meta['source_size'][0]}x{meta['source_size'][1]} screen → "
+            f"{meta['width']}x{meta['height']} {meta['format'].upper()} in {meta['encode_ms']:.0f} ms")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Capture Store - Bounded in-memory ring of screenshots
+Keeps the last N capture buffers in memory, hands them out by handle as
+zero-copy memoryviews and evicts by count and total bytes. Evicted captures
+can optionally be spilled to disk so they stay readable.
+"""
+
+import os
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ITEMS = 8
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CaptureStore:
+    """Ring buffer of screenshot bytes keyed by integer handles"""
+
+    def __init__(self, max_items=DEFAULT_MAX_ITEMS, max_bytes=DEFAULT_MAX_BYTES, spill_dir=None):
+        """Keep at most max_items captures and max_bytes in memory; spill evictions to spill_dir"""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.buffers = OrderedDict()
+        self.metadata = {}
+        self.spilled = {}
+        self.total_bytes = 0
+        self.next_handle = 1
+        self.evictions = 0
+
+    def put(self, image_data, **meta):
+        """Store one capture (bytes-like) and return its handle"""
+        # bytes() of a bytes object is free; lists from the SDK are converted once
+        data = image_data if isinstance(image_data, bytes) else bytes(image_data)
+        handle = self.next_handle
+        self.next_handle += 1
+
+        self.buffers[handle] = data
+        self.metadata[handle] = dict(meta, size=len(data), captured_at=time.time())
+        self.total_bytes += len(data)
+        self._evict()
+        return handle
+
+    def _evict(self):
+        """Drop the oldest captures until both limits hold (the newest always stays)"""
+        while len(self.buffers) > 1 and (len(self.buffers) > self.max_items
+                                         or self.total_bytes > self.max_bytes):
+            handle, data = self.buffers.popitem(last=False)
+            self.total_bytes -= len(data)
+            self.evictions += 1
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                path = os.path.join(self.spill_dir, f"capture_{handle}.bin")
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.spilled[handle] = path
+            else:
+                self.metadata.pop(handle, None)
+
+    def get(self, handle):
+        """Zero-copy view of a capture, or None if it is gone"""
+        data = self.buffers.get(handle)
+        if data is not None:
+            return memoryview(data)
+
+        path = self.spilled.get(handle)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                return memoryview(f.read())
+        return None
+
+    def meta(self, handle):
+        """Metadata stored with a capture (size, capture time and anything passed to put)"""
+        return self.metadata.get(handle, {})
+
+    def latest(self):
+        """Handle of the most recent capture, or None"""
+        return next(reversed(self.buffers), None)
+
+    def stats(self):
+        """Current occupancy and eviction counters"""
+        return {
+            'captures': len(self.buffers),
+            'bytes': self.total_bytes,
+            'spilled': len(self.spilled),
+            'evictions': self.evictions,
+        }
+
+
+# One store shared by the capture and analysis tools in a process
+_shared = None
+
+
+def shared_store():
+    """Get the process-wide CaptureStore"""
+    global _shared
+    if _shared is None:
+        _shared = CaptureStore()
+    return _shared
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Canvas Change Detection - Skip vision analysis when nothing was drawn
+Compares each capture with the one analyzed last using a tile-based pixel
+diff (falling back to a perceptual hash when sizes differ) and reports the
+changed bounding boxes, so the analysis tool can reuse the previous result
+for an unchanged canvas or look only at the region that changed.
+"""
+
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from canvas_capture import crop_to_bounds, encode_image
+
+# Grey-level difference that counts as a changed pixel
+PIXEL_THRESHOLD = 24
+# Side of the square tiles changes are grouped into
+TILE_SIZE = 16
+# Hash bits that may differ before two differently-sized frames count as changed
+HASH_DISTANCE = 2
+
+
+def load_image(data):
+    """Image from encoded bytes, a memoryview or an existing PIL image"""
+    if isinstance(data, Image.Image):
+        return data
+    return Image.open(BytesIO(data))
+
+
+def perceptual_hash(image, size=8):
+    """64-bit difference hash: compares neighbouring pixels of a tiny greyscale copy"""
+    grey = np.asarray(load_image(image).convert('L').resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (grey[:, 1:] > grey[:, :-1]).ravel()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def hamming(a, b):
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+def _tile_boxes(tiles, tile_size):
+    """Bounding boxes (x, y, width, height) of 4-connected groups of changed tiles"""
+    rows, cols = tiles.shape
+    seen = np.zeros_like(tiles)
+    boxes = []
+    for row, col in zip(*np.nonzero(tiles)):
+        if seen[row, col]:
+            continue
+        stack = [(row, col)]
+        seen[row, col] = True
+        top, left, bottom, right = row, col, row, col
+        while stack:
+            r, c = stack.pop()
+            top, left, bottom, right = min(top, r), min(left, c), max(bottom, r), max(right, c)
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and tiles[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    stack.append((nr, nc))
+        boxes.append((int(left * tile_size), int(top * tile_size),
+                      int((right - left + 1) * tile_size), int((bottom - top + 1) * tile_size)))
+    return boxes
+
+
+def changed_boxes(previous, current, threshold=PIXEL_THRESHOLD, tile_size=TILE_SIZE):
+    """Changed regions between two same-sized images, plus the changed pixel fraction"""
+    a = np.asarray(load_image(previous).convert('L'), dtype=np.int16)
+    b = np.asarray(load_image(current).convert('L'), dtype=np.int16)
+    mask = np.abs(a - b) > threshold
+
+    # Pad to whole tiles and mark each tile holding any changed pixel
+    rows, cols = -(-mask.shape[0] // tile_size), -(-mask.shape[1] // tile_size)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+    padded[:mask.shape[0], :mask.shape[1]] = mask
+    tiles = padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+
+    boxes = [(x, y, min(w, mask.shape[1] - x), min(h, mask.shape[0] - y))
+             for x, y, w, h in _tile_boxes(tiles, tile_size)]
+    return boxes, float(mask.mean())
+
+
+def union_box(boxes):
+    """Smallest (x, y, width, height) covering every box"""
+    if not boxes:
+        return None
+    left = min(x for x, _, _, _ in boxes)
+    top = min(y for _, y, _, _ in boxes)
+    right = max(x + w for x, _, w, _ in boxes)
+    bottom = max(y + h for _, y, _, h in boxes)
+    return left, top, right - left, bottom - top
+
+
+class ChangeDetector:
+    """Remembers the last analyzed frame and its analysis"""
+
+    def __init__(self, threshold=PIXEL_THRESHOLD, tile_size=TILE_SIZE, hash_distance=HASH_DISTANCE):
+        self.threshold = threshold
+        self.tile_size = tile_size
+        self.hash_distance = hash_distance
+        self.image = None
+        self.hash = None
+        self.handle = None
+        self.analysis = None
+        self.skipped = 0
+
+    def compare(self, data):
+        """Compare a capture with the last analyzed one
+
+        Returns changed (bool), boxes, region (union of boxes, None for the
+        whole frame), changed_fraction, hash and distance.
+        """
+        image = load_image(data)
+        image.load()
+        image_hash = perceptual_hash(image)
+        result = {'changed': True, 'boxes': [], 'region': None, 'changed_fraction': 1.0,
+                  'hash': image_hash, 'distance': None}
+
+        if self.image is None or self.analysis is None:
+            return result
+
+        result['distance'] = hamming(self.hash, image_hash)
+        if self.image.size != image.size:
+            result['changed'] = result['distance'] > self.hash_distance
+            result['changed_fraction'] = 1.0 if result['changed'] else 0.0
+            return result
+
+        boxes, fraction = changed_boxes(self.image, image, self.threshold, self.tile_size)
+        result.update(changed=bool(boxes), boxes=boxes, region=union_box(boxes), changed_fraction=fraction)
+        return result
+
+    def reuse(self):
+        """Count an analysis that was skipped because nothing changed"""
+        self.skipped += 1
+        return self.analysis
+
+    def remember(self, handle, data, analysis, region=None):
+        """Store the frame that was just analyzed and its analysis
+
+        Pass region when only that part of the frame was analyzed: the
+        answer then only describes the crop, so it is kept together with the
+        analysis of the rest of the frame. Returns the stored analysis.
+        """
+        if region is not None and self.analysis is not None:
+            x, y, width, height = region
+            analysis = f"{self.analysis}\n\nUpdate for the region x={x}, y={y}, {width}x{height}:\n{analysis}"
+        self.image = load_image(data)
+        self.image.load()
+        self.hash = perceptual_hash(self.image)
+        self.handle = handle
+        self.analysis = analysis
+        return analysis
+
+
+def crop_region(data, box, margin=TILE_SIZE):
+    """Encoded PNG of just the changed region (grown by margin) of a capture"""
+    x, y, width, height = box
+    image = load_image(data)
+    return encode_image(crop_to_bounds(image, (x - margin, y - margin, width + 2 * margin, height + 2 * margin)))
+
+
+# One detector shared by the capture analysis tools in a process
+_shared = None
+
+
+def shared_detector():
+    """Get the process-wide ChangeDetector"""
+    global _shared
+    if _shared is None:
+        _shared = ChangeDetector()
+    return _shared
@@ -4,7 +4,8 @@ Check Locator API - See what methods are available on locator objects
 """
 
 import terminator
-import time
+
+from app_ready import open_and_wait_sync
 
 def check_locator_api():
     """Check what methods are available on locator objects"""
@@ -15,8 +16,7 @@ def check_locator_api():
     
     # Open Paint first
     print("Opening Paint...")
-    desktop.open_application('mspaint')
-    time.sleep(3)
+    open_and_wait_sync(desktop, 'mspaint')
     
     # Create a locator
     print("\n📍 Creating locator...")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Adaptive Delay Calibration - Measured post-action waits instead of guesses
+Measures how long each app takes to reflect an action by polling its state,
+keeps a per-app/per-action latency profile on disk and serves the learned
+p95 as the delay. Rising failure rates throw the samples away so the action
+gets re-calibrated.
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+
+DEFAULT_PROFILE_PATH = "latency_profile.json"
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class DelayCalibrator:
+    """Learns per-app/per-action latencies and hands out p95-based delays"""
+
+    def __init__(self, path=DEFAULT_PROFILE_PATH, min_samples=5, max_samples=50,
+                 failure_window=20, max_failure_rate=0.2, min_delay=0.0, max_delay=2.0):
+        """Load an existing profile from path if there is one"""
+        self.path = path
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.failure_window = failure_window
+        self.max_failure_rate = max_failure_rate
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.samples = {}
+        self.outcomes = {}
+        self.load()
+
+    def _key(self, app, action):
+        return f"{app}/{action}"
+
+    def load(self):
+        """Read the latency profile from disk (missing or broken files start empty)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read latency profile {self.path}: {e}")
+            return
+
+        for key, entry in profile.get('actions', {}).items():
+            self.samples[key] = deque(entry.get('samples', []), maxlen=self.max_samples)
+
+    def save(self):
+        """Write the latency profile to disk"""
+        if not self.path:
+            return
+        profile = {'actions': {}}
+        for key, samples in self.samples.items():
+            profile['actions'][key] = {
+                'samples': [round(s, 4) for s in samples],
+                'p95': percentile(list(samples), 0.95),
+            }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+
+    def record_sample(self, app, action, seconds):
+        """Store one measured latency"""
+        key = self._key(app, action)
+        self.samples.setdefault(key, deque(maxlen=self.max_samples)).append(seconds)
+        self.record_outcome(app, action, True)
+
+    def record_outcome(self, app, action, success):
+        """Track action success; too many recent failures trigger re-calibration"""
+        key = self._key(app, action)
+        outcomes = self.outcomes.setdefault(key, deque(maxlen=self.failure_window))
+        outcomes.append(success)
+
+        failures = outcomes.count(False)
+        if len(outcomes) >= 5 and failures / len(outcomes) > self.max_failure_rate:
+            print(f"⚠ {key} failing {failures}/{len(outcomes)} times, re-calibrating")
+            self.samples.pop(key, None)
+            outcomes.clear()
+
+    def needs_calibration(self, app, action):
+        """True until enough samples have been measured for this action"""
+        return len(self.samples.get(self._key(app, action), ())) < self.min_samples
+
+    def delay(self, app, action, default):
+        """Learned p95 delay for an action, or the default until it is calibrated"""
+        if self.needs_calibration(app, action):
+            return default
+        p95 = percentile(list(self.samples[self._key(app, action)]), 0.95)
+        return min(max(p95, self.min_delay), self.max_delay)
+
+    def measure(self, app, action, perform, condition, timeout=1.0, poll_interval=0.005):
+        """Run perform(), poll condition() until true and record how long it took"""
+        started = time.perf_counter()
+        perform()
+        while not condition():
+            if time.perf_counter() - started > timeout:
+                self.record_outcome(app, action, False)
+                return None
+            time.sleep(poll_interval)
+
+        elapsed = time.perf_counter() - started
+        self.record_sample(app, action, elapsed)
+        return elapsed
+
+    async def measure_async(self, app, action, perform, condition, timeout=1.0, poll_interval=0.005):
+        """Async variant of measure() that yields to the event loop while polling"""
+        started = time.perf_counter()
+        perform()
+        while not condition():
+            if time.perf_counter() - started > timeout:
+                self.record_outcome(app, action, False)
+                return None
+            await asyncio.sleep(poll_interval)
+
+        elapsed = time.perf_counter() - started
+        self.record_sample(app, action, elapsed)
+        return elapsed
+
+    def summary(self):
+        """Per-action sample counts and learned p95 values"""
+        return {
+            key: {'samples': len(samples), 'p95': percentile(list(samples), 0.95)}
+            for key, samples in self.samples.items()
+        }
+
+
+# One profile shared by every helper in a process
+_shared = None
+
+
+def shared_calibrator():
+    """Get the process-wide calibrator backed by DEFAULT_PROFILE_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = DelayCalibrator()
+    return _shared
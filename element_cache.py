@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Element Handle Cache - Session-scoped memo for Desktop.locator lookups
+Resolves each (window, selector) once, re-validates cheaply before reuse and
+evicts handles when their window closes or they go stale.
+"""
+
+import asyncio
+import time
+
+
+def resolve_element(locator):
+    """Resolve a locator to a concrete element, falling back to the locator itself"""
+    if not hasattr(locator, 'first'):
+        return locator
+
+    element = locator.first()
+
+    # Handle async result if needed (only possible when no loop is running)
+    if hasattr(element, '__await__'):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            element = asyncio.run(element)
+        else:
+            if hasattr(element, 'close'):
+                element.close()
+            return locator
+
+    return element if element is not None else locator
+
+
+def is_alive(element):
+    """Cheap liveness probe: one is_visible() call instead of a tree walk"""
+    probe = getattr(element, 'is_visible', None)
+    if probe is None:
+        return True
+    try:
+        return bool(probe())
+    except Exception:
+        return False
+
+
+class CachedDesktop:
+    """Caching wrapper around terminator.Desktop with hit/miss counters"""
+
+    def __init__(self, desktop=None, validate_after=5.0):
+        """Wrap a desktop (a fresh terminator.Desktop() when none is given)"""
+        if desktop is None:
+            import terminator
+            desktop = terminator.Desktop()
+
+        self.desktop = desktop
+        self.validate_after = validate_after
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+
+    def __getattr__(self, name):
+        """Everything we do not cache goes straight to the wrapped desktop"""
+        if name == 'desktop':
+            raise AttributeError(name)
+        return getattr(self.desktop, name)
+
+    def _lookup(self, selector, window):
+        """Walk the accessibility tree for a selector, optionally inside a window"""
+        if window:
+            # Keep a handle on the window too so its closing can be detected
+            self.locator(window)
+            return resolve_element(self.desktop.locator(window).locator(selector))
+        return resolve_element(self.desktop.locator(selector))
+
+    def locator(self, selector, window=None):
+        """Get a resolved element for a selector, reusing a cached handle when valid"""
+        key = (window, selector)
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            element, checked_at = entry
+            if time.monotonic() - checked_at < self.validate_after:
+                self.hits += 1
+                return element
+
+            if is_alive(element):
+                self.entries[key] = (element, time.monotonic())
+                self.hits += 1
+                return element
+
+            # Stale handle - if the window itself is gone, drop all of its elements
+            self.stale += 1
+            self._evict(key)
+            if window and not self._window_alive(window):
+                self.close_window(window)
+
+        self.misses += 1
+        element = self._lookup(selector, window)
+        self.entries[key] = (element, time.monotonic())
+        return element
+
+    def _window_alive(self, window):
+        """Check whether a cached window handle still responds"""
+        entry = self.entries.get((None, window))
+        if entry is None:
+            return True
+        return is_alive(entry[0])
+
+    def _evict(self, key):
+        """Remove one entry, counting the eviction"""
+        if self.entries.pop(key, None) is not None:
+            self.evictions += 1
+
+    def invalidate(self, selector=None, window=None):
+        """Drop cached handles matching a selector and/or window (all when both are None)"""
+        for key in list(self.entries):
+            cached_window, cached_selector = key
+            if selector is not None and cached_selector != selector:
+                continue
+            if window is not None and cached_window != window:
+                continue
+            self._evict(key)
+
+    def close_window(self, window):
+        """Evict every handle that belongs to a window that was closed"""
+        self.invalidate(window=window)
+        self._evict((None, window))
+
+    def open_application(self, app_name):
+        """Open an application; new windows can shadow cached handles so start fresh"""
+        self.invalidate()
+        return self.desktop.open_application(app_name)
+
+    def stats(self):
+        """Return hit/miss counters for this session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'cached': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
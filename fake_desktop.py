@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Fake Desktop Backend - A tiny in-memory stand-in for terminator.Desktop
+Lets the shared helpers be exercised without Windows or the Terminator SDK.
+Counts tree walks and clicks so tests can check how much UI traffic a helper causes.
+"""
+
+
+class FakeText:
+    """Mimics the object returned by get_text()"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeBounds:
+    """Mimics the object returned by get_bounds()"""
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+
+class FakeElement:
+    """A node in the fake accessibility tree"""
+
+    def __init__(self, name, automation_id='', control_type='Button', children=None,
+                 text='', bounds=(0, 0, 100, 30), on_click=None, on_type=None):
+        self.name = name
+        self.automation_id = automation_id
+        self.control_type = control_type
+        self.child_elements = list(children or [])
+        self.text = text
+        self.bounds = bounds
+        self.on_click = on_click
+        self.on_type = on_type
+        # Set by FakeDesktop.open_application (and passed down by children()) to scope locators
+        self.desktop = None
+        self.visible = True
+        self.clicks = 0
+        self.typed = []
+        self.strokes = []
+
+    def children(self):
+        """Child elements; a read through an open window counts as a visited node"""
+        if self.desktop is not None:
+            self.desktop.nodes_visited += 1
+            for child in self.child_elements:
+                child.desktop = self.desktop
+        return list(self.child_elements)
+
+    def walk(self):
+        """Yield this element and all of its descendants"""
+        yield self
+        for child in self.child_elements:
+            yield from child.walk()
+
+    def locator(self, selector):
+        """Locator that only searches this element's subtree"""
+        return FakeLocator(self.desktop, [selector], root=self)
+
+    def matches(self, selector):
+        """Check a single 'kind:value' selector against this element"""
+        kind, _, value = selector.partition(':')
+        if kind == 'name' or kind == 'window':
+            return self.name == value
+        if kind == 'automationid':
+            return self.automation_id == value
+        if kind in ('role', 'class'):
+            return self.control_type == value
+        raise ValueError(f"Invalid selector: {selector}")
+
+    def is_visible(self):
+        return self.visible
+
+    def click(self):
+        if not self.visible:
+            raise RuntimeError(f"Element '{self.name}' is no longer available")
+        self.clicks += 1
+        if self.on_click:
+            self.on_click(self)
+
+    def get_text(self):
+        return FakeText(self.text)
+
+    def type_text(self, text, clear=False):
+        if not self.visible:
+            raise RuntimeError(f"Element '{self.name}' is no longer available")
+        self.typed.append(text)
+        if self.on_type:
+            self.on_type(text)
+            return
+        if clear:
+            self.text = ''
+        self.text += text
+
+    def get_bounds(self):
+        return FakeBounds(*self.bounds)
+
+    def mouse_click_and_hold(self, x, y):
+        if not self.visible:
+            raise RuntimeError(f"Element '{self.name}' is no longer available")
+        self.strokes.append({'color': getattr(self, 'color', None), 'points': [(x, y)]})
+
+    def mouse_move(self, x, y):
+        if self.strokes:
+            self.strokes[-1]['points'].append((x, y))
+
+    def mouse_release(self):
+        pass
+
+
+class FakeLocator:
+    """Lazy selector chain; every resolution walks the fake tree again"""
+
+    def __init__(self, desktop, selectors, root=None):
+        self.desktop = desktop
+        self.selectors = selectors
+        self.root = root
+
+    def locator(self, selector):
+        return FakeLocator(self.desktop, self.selectors + [selector], root=self.root)
+
+    def first(self):
+        return self.desktop.find(self.selectors, root=self.root)
+
+    def click(self):
+        self.first().click()
+
+    def type_text(self, text, clear=False):
+        self.first().type_text(text, clear=clear)
+
+    def get_text(self):
+        return self.first().get_text()
+
+    def is_visible(self):
+        return self.first().is_visible()
+
+    def expect_visible(self, timeout=None):
+        return self.first()
+
+    def expect_enabled(self, timeout=None):
+        return self.first()
+
+
+class FakeDesktop:
+    """In-memory desktop holding one fake element tree per open window"""
+
+    def __init__(self, apps=None):
+        self.apps = dict(apps or {})
+        self.windows = []
+        self.searches = 0
+        self.nodes_visited = 0
+
+    def open_application(self, app_name):
+        window = self.apps[app_name]()
+        window.app_name = app_name
+        window.desktop = self
+        self.windows.append(window)
+        return window
+
+    def application(self, app_name):
+        """Newest open window of an application"""
+        for window in reversed(self.windows):
+            if getattr(window, 'app_name', None) == app_name:
+                return window
+        raise RuntimeError(f"Application not running: {app_name}")
+
+    def close_window(self, window_name):
+        for window in list(self.windows):
+            if window.name == window_name:
+                for element in window.walk():
+                    element.visible = False
+                self.windows.remove(window)
+
+    def locator(self, selector):
+        return FakeLocator(self, [selector])
+
+    def find(self, selectors, root=None):
+        """Resolve a selector chain by walking every open window (newest first) or only root"""
+        self.searches += 1
+        scopes = [root] if root is not None else list(reversed(self.windows))
+
+        for selector in selectors:
+            found = None
+            for scope in scopes:
+                for element in scope.walk():
+                    self.nodes_visited += 1
+                    if element.matches(selector):
+                        found = element
+                        break
+                if found:
+                    break
+            if found is None:
+                raise RuntimeError(f"Element not found: {selector}")
+            scopes = [found]
+
+        return found
+
+
+DIGIT_NAMES = ('Zero', 'One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine')
+
+
+def fake_calculator(keyboard=True, immediate=False):
+    """Build a fake Calculator window whose buttons (and optionally typed keys) really compute
+
+    immediate=True evaluates left to right like Standard mode (2+3*4 shows 20).
+    """
+    state = {'entry': ''}
+    display = FakeElement('Display is 0', automation_id='CalculatorResults', control_type='Text',
+                          text='Display is 0')
+
+    def press(token):
+        def on_click(element):
+            if token == 'clear':
+                state['entry'] = ''
+                display.text = 'Display is 0'
+            elif token == '=':
+                try:
+                    value = eval(state['entry'] or '0', {'__builtins__': {}})
+                except Exception:
+                    value = 'Error'
+                if isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                state['entry'] = str(value)
+                display.text = f'Display is {value}'
+            else:
+                if immediate and token in '+-*/' and any(op in state['entry'][1:] for op in '+-*/'):
+                    # Standard mode applies the pending operator before taking the next one
+                    press('=')(element)
+                state['entry'] += token
+                display.text = f"Display is {state['entry']}"
+        return on_click
+
+    # Like the real Calculator, digit buttons are named 'Zero'..'Nine'
+    buttons = [FakeElement(name, automation_id=f'num{digit}Button', on_click=press(digit))
+               for digit, name in zip('0123456789', DIGIT_NAMES)]
+    for name, token in [('Plus', '+'), ('Minus', '-'), ('Multiply by', '*'), ('Divide by', '/'),
+                        ('Decimal separator', '.'), ('Open parenthesis', '('),
+                        ('Close parenthesis', ')'), ('Equals', '='), ('Clear', 'clear')]:
+        buttons.append(FakeElement(name, on_click=press(token)))
+
+    def on_type(text):
+        if not keyboard:
+            return
+        for char in text:
+            press(char)(None)
+
+    keypad = FakeElement('Keypad', control_type='Group', children=buttons)
+    window = FakeElement('Calculator', control_type='Window', children=[display, keypad],
+                         on_type=on_type)
+    window.state = state
+    return window
+
+
+def fake_notepad():
+    """Build a fake Notepad window with an editable text area"""
+    editor = FakeElement('Edit', control_type='Document', bounds=(10, 60, 800, 600))
+    return FakeElement('Notepad', control_type='Window', children=[editor])
+
+
+def fake_paint():
+    """Build a fake Paint window whose canvas records strokes in the selected palette color"""
+    canvas = FakeElement('Canvas', automation_id='Canvas', control_type='Pane', bounds=(5, 150, 1000, 600))
+    canvas.color = 'Black'
+
+    def pick(color):
+        def on_click(element):
+            canvas.color = color
+        return on_click
+
+    palette = FakeElement('Colors', control_type='Group', children=[
+        FakeElement(color, on_click=pick(color))
+        for color in ('Black', 'White', 'Red', 'Orange', 'Yellow', 'Green', 'Blue', 'Purple')
+    ])
+    return FakeElement('Untitled - Paint', control_type='Window', children=[palette, canvas])
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+LLM Benchmark - Concurrent latency, time-to-first-token and throughput
+Streams chat requests straight from the Ollama HTTP API so every request
+reports latency, time to first token and tokens/sec. Requests for several
+models run concurrently under two limits: the total number in flight and the
+number of distinct models in flight (how many the server can keep resident).
+"""
+
+import asyncio
+import json
+import os
+import time
+import urllib.request
+
+from llm_client import AsyncLLMPool
+
+DEFAULT_HOST = os.environ.get('OLLAMA_HOST', 'http://localhost:11434')
+DEFAULT_CONCURRENCY = 2
+# Ollama keeps one model loaded at a time unless OLLAMA_MAX_LOADED_MODELS is raised
+DEFAULT_MAX_RESIDENT = int(os.environ.get('OLLAMA_MAX_LOADED_MODELS', '1'))
+PERCENTILES = (50, 90, 99)
+
+
+def host_url(host):
+    """Normalize OLLAMA_HOST style values ('localhost:11434') to a URL"""
+    if not host.startswith(('http://', 'https://')):
+        host = 'http://' + host
+    return host.rstrip('/')
+
+
+def timed_chat(model, messages, options=None, host=DEFAULT_HOST, timeout=300):
+    """One streamed /api/chat request, timed
+
+    Returns model, latency, ttft (seconds to the first content token), tokens,
+    tokens_per_sec, content, success and error.
+    """
+    body = {'model': model, 'messages': messages, 'stream': True}
+    if options:
+        body['options'] = options
+    request = urllib.request.Request(f"{host_url(host)}/api/chat", data=json.dumps(body).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+
+    result = {'model': model, 'latency': None, 'ttft': None, 'tokens': 0,
+              'tokens_per_sec': None, 'content': '', 'success': False, 'error': None}
+    parts = []
+    final = {}
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise RuntimeError(chunk['error'])
+                text = chunk.get('message', {}).get('content', '')
+                if text:
+                    if result['ttft'] is None:
+                        result['ttft'] = time.perf_counter() - started
+                    parts.append(text)
+                if chunk.get('done'):
+                    final = chunk
+                    break
+    except Exception as e:
+        result['error'] = str(e)
+        result['latency'] = time.perf_counter() - started
+        return result
+
+    result['latency'] = time.perf_counter() - started
+    result['content'] = ''.join(parts)
+    # Prefer the server's own token counts; fall back to streamed chunks
+    result['tokens'] = final.get('eval_count') or len(parts)
+    if final.get('eval_duration'):
+        result['tokens_per_sec'] = result['tokens'] / (final['eval_duration'] / 1e9)
+    elif result['ttft'] is not None and result['latency'] > result['ttft']:
+        result['tokens_per_sec'] = result['tokens'] / (result['latency'] - result['ttft'])
+    result['success'] = bool(result['content'])
+    return result
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile of a list (None when empty)"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def summarize(results, percentiles=PERCENTILES):
+    """Per-model request counts and latency/TTFT/throughput percentiles"""
+    summary = {}
+    for model in dict.fromkeys(r['model'] for r in results):
+        runs = [r for r in results if r['model'] == model]
+        ok = [r for r in runs if r['success']]
+        entry = {'requests': len(runs), 'successes': len(ok), 'errors': len(runs) - len(ok)}
+        for metric in ('latency', 'ttft', 'tokens_per_sec'):
+            for pct in percentiles:
+                entry[f'{metric}_p{pct}'] = percentile([r[metric] for r in ok], pct)
+        summary[model] = entry
+    return summary
+
+
+class ResidencyGate:
+    """Lets requests for at most max_resident distinct models run at once"""
+
+    def __init__(self, max_resident):
+        self.max_resident = max_resident
+        self.active = {}
+        self.condition = asyncio.Condition()
+
+    async def acquire(self, model):
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: model in self.active or len(self.active) < self.max_resident)
+            self.active[model] = self.active.get(model, 0) + 1
+
+    async def release(self, model):
+        async with self.condition:
+            self.active[model] -= 1
+            if not self.active[model]:
+                del self.active[model]
+            self.condition.notify_all()
+
+
+class BenchmarkRunner:
+    """Runs (model, task, messages) jobs concurrently within the server's limits"""
+
+    def __init__(self, host=DEFAULT_HOST, concurrency=DEFAULT_CONCURRENCY,
+                 max_resident=DEFAULT_MAX_RESIDENT, options=None, timeout=300):
+        self.host = host
+        self.concurrency = concurrency
+        self.max_resident = max(1, max_resident)
+        self.options = options
+        self.timeout = timeout
+        self.pool = AsyncLLMPool(max_workers=concurrency)
+        self.peak_in_flight = 0
+        self.in_flight = 0
+
+    def jobs_for(self, models, prompts, repeats=1):
+        """Jobs grouped by model, so a resident model is drained before the next loads"""
+        return [(model, task, [{'role': 'user', 'content': prompt}])
+                for model in models
+                for task, prompt in prompts.items()
+                for _ in range(repeats)]
+
+    async def _run_job(self, job, slots, gate):
+        model, task, messages = job
+        await gate.acquire(model)
+        try:
+            async with slots:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    result = await self.pool.run(timed_chat, model, messages, self.options,
+                                                 self.host, self.timeout)
+                finally:
+                    self.in_flight -= 1
+        finally:
+            await gate.release(model)
+        result['task'] = task
+        return result
+
+    async def run(self, jobs):
+        """Run every job and return (results in job order, per-model summary)"""
+        slots = asyncio.Semaphore(self.concurrency)
+        gate = ResidencyGate(self.max_resident)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._run_job(job, slots, gate) for job in jobs))
+        self.wall_time = time.perf_counter() - started
+        return list(results), summarize(results)
+
+
+def _fmt(value, unit=''):
+    return '-' if value is None else f"{value:.2f}{unit}"
+
+
+def format_report(summary, wall_time=None):
+    """Text table of a benchmark summary"""
+    lines = [f"{'Model':<24} {'ok':>5} {'lat p50':>8} {'lat p90':>8} {'lat p99':>8} "
+             f"{'ttft p50':>9} {'ttft p90':>9} {'tok/s p50':>10}"]
+    for model, entry in summary.items():
+        lines.append(f"{model:<24} {entry['successes']:>2}/{entry['requests']:<2} "
+                     f"{_fmt(entry['latency_p50'], 's'):>8} {_fmt(entry['latency_p90'], 's'):>8} "
+                     f"{_fmt(entry['latency_p99'], 's'):>8} {_fmt(entry['ttft_p50'], 's'):>9} "
+                     f"{_fmt(entry['ttft_p90'], 's'):>9} {_fmt(entry['tokens_per_sec_p50']):>10}")
+    if wall_time is not None:
+        lines.append(f"Wall time: {wall_time:.2f}s")
+    return '\n'.join(lines)
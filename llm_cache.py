@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache - Persistent answers for repeated prompts
+Stores model responses in SQLite keyed by (model, options, request
+arguments, prompt), so scripts that send the same prompts every run get
+their answers back instantly. Only deterministic calls (temperature 0 or a
+fixed seed) are cached; sampled output such as stories or timed benchmark
+answers always comes from the model. Entries expire after a TTL and the
+least recently used ones are evicted once the database grows past its size
+cap. Set LLM_CACHE=off (or pass bypass=True) to always call the model.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = "llm_cache.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# LLM_CACHE=off|0|false|no disables lookups and writes
+BYPASS_ENV = "LLM_CACHE"
+
+# OllamaLLM attributes that change what the model generates
+LLM_OPTION_FIELDS = ('temperature', 'top_p', 'top_k', 'num_predict', 'num_ctx',
+                     'repeat_penalty', 'seed', 'stop', 'format')
+
+
+def bypass_requested():
+    """True when the environment switches the cache off"""
+    return os.environ.get(BYPASS_ENV, '').strip().lower() in ('off', '0', 'false', 'no')
+
+
+def cache_key(model, prompt, options=None, request=None):
+    """Stable hash of a model, its options, other request arguments and the prompt
+
+    prompt is a string or chat messages; request holds the remaining keyword
+    arguments sent with the call (format, tools, keep_alive, ...).
+    """
+    payload = json.dumps({'model': model, 'options': options or {}, 'request': request or {}, 'prompt': prompt},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def deterministic(options):
+    """True when options pin the output (temperature 0 or a fixed seed), so a cached answer is valid"""
+    options = options or {}
+    return options.get('temperature') == 0 or options.get('seed') is not None
+
+
+def request_args(kwargs):
+    """Keyword arguments that are part of the cache key (streaming does not change the answer)"""
+    return {key: value for key, value in kwargs.items() if key != 'stream'}
+
+
+def llm_options(llm):
+    """Generation options set on a LangChain OllamaLLM"""
+    options = {}
+    for field in LLM_OPTION_FIELDS:
+        value = getattr(llm, field, None)
+        if value is not None:
+            options[field] = value
+    return options
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL and size-based LRU eviction"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, bypass=None):
+        """path=None keeps the cache in memory; bypass=None follows the LLM_CACHE variable"""
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bypass = bypass_requested() if bypass is None else bypass
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+        # Calls may come from worker threads
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            model TEXT,
+            response TEXT,
+            size INTEGER,
+            elapsed REAL,
+            created REAL,
+            accessed REAL)""")
+        self.db.commit()
+
+    def get(self, model, prompt, options=None, request=None):
+        """Cached response text, or None on a miss, an expired entry or when bypassed"""
+        if self.bypass:
+            return None
+        key = cache_key(model, prompt, options, request)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT response, elapsed, created FROM responses WHERE key = ?",
+                                  (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, elapsed, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.db.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+            self.saved_seconds += elapsed or 0.0
+            return response
+
+    def put(self, model, prompt, response, options=None, elapsed=0.0, request=None):
+        """Store a response (elapsed is the generation time a later hit saves)"""
+        if self.bypass:
+            return
+        response = str(response)
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (cache_key(model, prompt, options, request), model, response,
+                             len(response.encode('utf-8')), elapsed, now, now))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the total size fits (the newest always stays)"""
+        total, count = self.db.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses").fetchone()
+        while count > 1 and total > self.max_bytes:
+            key, size = self.db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 1").fetchone()
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            count -= 1
+            self.evictions += 1
+
+    def clear(self):
+        """Remove every cached response"""
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+    def stats(self):
+        """Hit/miss counters, occupancy and generation time saved"""
+        with self.lock:
+            count, total = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'entries': count,
+            'bytes': total,
+            'saved_seconds': self.saved_seconds,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bypass': self.bypass,
+        }
+
+
+def _ollama():
+    """The ollama client module, imported on first use"""
+    import ollama
+    return ollama
+
+
+def cached_chat(model, messages, options=None, cache=None, client=None, **kwargs):
+    """ollama.chat() through the cache when options make it deterministic
+
+    Returns a response supporting response['message']['content'] either way;
+    cache hits are plain dicts with 'cached': True.
+    """
+    chat = client.chat if client is not None else _ollama().chat
+    request = request_args(kwargs)
+    if options is not None:
+        kwargs['options'] = options
+    if not deterministic(options):
+        return chat(model=model, messages=messages, **kwargs)
+
+    cache = cache or shared_llm_cache()
+    content = cache.get(model, messages, options, request)
+    if content is not None:
+        return {'model': model, 'message': {'role': 'assistant', 'content': content}, 'cached': True}
+
+    started = time.perf_counter()
+    response = chat(model=model, messages=messages, **kwargs)
+    cache.put(model, messages, response['message']['content'], options, time.perf_counter() - started, request)
+    return response
+
+
+def cached_chat_stream(model, messages, options=None, cache=None, client=None, **kwargs):
+    """Streaming ollama.chat(), yielding content pieces
+
+    Deterministic calls go through the cache: a hit yields the whole cached
+    response at once, a miss streams from the model and caches the joined
+    text once the stream completes.
+    """
+    chat = client.chat if client is not None else _ollama().chat
+    request = request_args(kwargs)
+    kwargs.pop('stream', None)
+    if options is not None:
+        kwargs['options'] = options
+    cache = (cache or shared_llm_cache()) if deterministic(options) else None
+    if cache is not None:
+        content = cache.get(model, messages, options, request)
+        if content is not None:
+            yield content
+            return
+
+    started = time.perf_counter()
+    parts = []
+    for chunk in chat(model=model, messages=messages, stream=True, **kwargs):
+        text = chunk['message']['content']
+        if text:
+            parts.append(text)
+            yield text
+    if cache is not None:
+        cache.put(model, messages, ''.join(parts), options, time.perf_counter() - started, request)
+
+
+def cached_generate(model, prompt, options=None, cache=None, client=None, **kwargs):
+    """ollama.generate() through the cache when deterministic (hits are dicts with 'response' and 'cached')"""
+    generate = client.generate if client is not None else _ollama().generate
+    request = request_args(kwargs)
+    if options is not None:
+        kwargs['options'] = options
+    if not deterministic(options):
+        return generate(model=model, prompt=prompt, **kwargs)
+
+    cache = cache or shared_llm_cache()
+    text = cache.get(model, prompt, options, request)
+    if text is not None:
+        return {'model': model, 'response': text, 'cached': True}
+
+    started = time.perf_counter()
+    response = generate(model=model, prompt=prompt, **kwargs)
+    cache.put(model, prompt, response['response'], options, time.perf_counter() - started, request)
+    return response
+
+
+class CachedLLM:
+    """Wraps a LangChain OllamaLLM so invoke() goes through the cache (for temperature=0 or seeded models)
+
+    Everything else is delegated, so the wrapped model can still be handed
+    to chains and agents via .llm.
+    """
+
+    def __init__(self, llm, cache=None):
+        self.llm = llm
+        self.cache = cache or shared_llm_cache()
+
+    def invoke(self, prompt, **kwargs):
+        """Response text for a string prompt, cached when the model is deterministic"""
+        model = getattr(self.llm, 'model', type(self.llm).__name__)
+        options = llm_options(self.llm)
+        if not deterministic(options):
+            return self.llm.invoke(prompt, **kwargs)
+
+        text = self.cache.get(model, prompt, options, kwargs)
+        if text is not None:
+            return text
+
+        started = time.perf_counter()
+        text = self.llm.invoke(prompt, **kwargs)
+        self.cache.put(model, prompt, text, options, time.perf_counter() - started, kwargs)
+        return text
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+def describe(cache):
+    """One-line summary of cache effectiveness"""
+    stats = cache.stats()
+    if stats['bypass']:
+        return "LLM cache bypassed"
+    return (f"LLM cache: {stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['saved_seconds']:.1f}s of generation saved")
+
+
+# One cache shared by every LLM call in a process
+_shared = None
+
+
+def shared_llm_cache():
+    """Get the process-wide LLMCache backed by DEFAULT_CACHE_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = LLMCache()
+    return _shared
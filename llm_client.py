@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Async LLM Client - Keep the event loop free while models generate
+Runs the blocking ollama / OllamaLLM calls (through the response cache) on a
+small bounded thread pool and awaits them, so desktop automation keeps
+running while a prompt is generating. Start a call with start() to overlap
+it with UI work and await the task when the text is needed.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_cache import cached_chat, cached_generate
+
+# A local Ollama server works through requests one or two at a time
+DEFAULT_MAX_WORKERS = 2
+
+
+class AsyncLLMPool:
+    """Bounded thread pool that turns blocking LLM calls into awaitables"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, cache=None):
+        """cache=None uses the shared LLM response cache"""
+        self.max_workers = max_workers
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.calls = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, func, *args, **kwargs):
+        """Await any blocking call on the pool"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+        finally:
+            self.calls += 1
+            self.busy_seconds += time.perf_counter() - started
+
+    async def chat(self, model, messages, options=None, **kwargs):
+        """Async ollama.chat() through the cache"""
+        return await self.run(cached_chat, model, messages, options, self.cache, **kwargs)
+
+    async def generate(self, model, prompt, options=None, **kwargs):
+        """Async ollama.generate() through the cache"""
+        return await self.run(cached_generate, model, prompt, options, self.cache, **kwargs)
+
+    async def invoke(self, llm, prompt, **kwargs):
+        """Async llm.invoke() for an OllamaLLM or CachedLLM"""
+        return await self.run(llm.invoke, prompt, **kwargs)
+
+    def start(self, coroutine):
+        """Schedule a call now and return its task, to await once the result is needed"""
+        return asyncio.ensure_future(coroutine)
+
+    def stats(self):
+        """Calls made and time spent waiting on them"""
+        return {
+            'calls': self.calls,
+            'busy_seconds': self.busy_seconds,
+            'max_workers': self.max_workers,
+        }
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self.executor.shutdown(wait=False)
+
+
+# One pool shared by every async workflow in a process
+_shared = None
+
+
+def shared_llm_pool():
+    """Get the process-wide AsyncLLMPool"""
+    global _shared
+    if _shared is None:
+        _shared = AsyncLLMPool()
+    return _shared
+
+
+async def achat(model, messages, options=None, **kwargs):
+    """ollama.chat() on the shared pool; returns the same response shape"""
+    return await shared_llm_pool().chat(model, messages, options, **kwargs)
+
+
+async def agenerate(model, prompt, options=None, **kwargs):
+    """ollama.generate() on the shared pool"""
+    return await shared_llm_pool().generate(model, prompt, options, **kwargs)
+
+
+async def ainvoke(llm, prompt, **kwargs):
+    """llm.invoke() on the shared pool"""
+    return await shared_llm_pool().invoke(llm, prompt, **kwargs)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+LLM Streaming Entry - Type model output into an editor while it generates
+Streams tokens from the model on a worker thread, groups them into
+sentence-sized chunks and types each chunk as soon as it is complete. The
+chunk queue is bounded: when typing falls behind, whatever has queued up is
+typed in one call, and once the queue is full the model stream is paused
+until typing catches up.
+"""
+
+import asyncio
+import re
+import time
+
+from llm_cache import cached_chat_stream
+from llm_client import shared_llm_pool
+from text_entry import read_text, verify_text
+
+# A sentence ends at .!? (plus closing quotes/brackets) followed by whitespace, or at a line break
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+|\n')
+# Longest chunk held back waiting for a sentence end
+MAX_CHUNK = 400
+# Typed chunks allowed to queue up before the model stream is paused
+MAX_PENDING = 8
+
+
+class SentenceBuffer:
+    """Accumulates tokens and releases text up to the last complete sentence"""
+
+    def __init__(self, max_chars=MAX_CHUNK):
+        self.max_chars = max_chars
+        self.text = ''
+
+    def feed(self, token):
+        """Add a token; returns the chunks ready to type (possibly none)"""
+        self.text += token
+        chunks = []
+
+        end = 0
+        for match in SENTENCE_END.finditer(self.text):
+            end = match.end()
+        if end:
+            chunks.append(self.text[:end])
+            self.text = self.text[end:]
+
+        # Run-on text without punctuation still goes out at word boundaries
+        while len(self.text) > self.max_chars:
+            cut = self.text.rfind(' ', 0, self.max_chars) + 1 or self.max_chars
+            chunks.append(self.text[:cut])
+            self.text = self.text[cut:]
+        return chunks
+
+    def flush(self):
+        """Whatever is left once the stream ends"""
+        text, self.text = self.text, ''
+        return text
+
+
+def _produce(tokens, buffer, queue, loop, stats):
+    """Worker thread: read the token stream and queue sentence chunks"""
+    def put(item):
+        waited = time.perf_counter()
+        # Blocks while the queue is full, which pauses reading the model stream
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        stats['stalled_seconds'] += time.perf_counter() - waited
+
+    try:
+        for token in tokens:
+            if stats['cancelled']:
+                break
+            if stats['ttft'] is None:
+                stats['ttft'] = time.perf_counter() - stats['started']
+            stats['tokens'] += 1
+            for chunk in buffer.feed(token):
+                put(chunk)
+        rest = buffer.flush()
+        if rest:
+            put(rest)
+        put(None)
+    except Exception as e:
+        put(e)
+
+
+async def stream_into(editor, tokens, max_chunk=MAX_CHUNK, max_pending=MAX_PENDING, verify=True):
+    """Type an iterable of tokens into editor as sentence chunks
+
+    Returns the full text and stats: ttft, first_output, tokens, chars,
+    calls, coalesced, stalled_seconds, seconds and verified.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_pending)
+    stats = {'started': time.perf_counter(), 'ttft': None, 'first_output': None, 'tokens': 0,
+             'chars': 0, 'calls': 0, 'coalesced': 0, 'stalled_seconds': 0.0, 'cancelled': False}
+    before = read_text(editor) if verify else None
+
+    producer = asyncio.ensure_future(
+        shared_llm_pool().run(_produce, tokens, SentenceBuffer(max_chunk), queue, loop, stats))
+    typed = []
+    error = None
+    done = False
+    try:
+        while not done:
+            parts = [await queue.get()]
+            # Typing lagged: take everything already queued in one call
+            while not queue.empty():
+                parts.append(queue.get_nowait())
+            if parts[-1] is None or isinstance(parts[-1], Exception):
+                done = True
+                error = parts.pop()
+            if not parts:
+                break
+
+            text = ''.join(parts)
+            await asyncio.to_thread(editor.type_text, text)
+            typed.append(text)
+            stats['calls'] += 1
+            stats['coalesced'] += len(parts) - 1
+            stats['chars'] += len(text)
+            if stats['first_output'] is None:
+                stats['first_output'] = time.perf_counter() - stats['started']
+    except BaseException:
+        # Typing failed: stop the producer and unblock it if it is waiting on a full queue
+        stats['cancelled'] = True
+        while not producer.done():
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.sleep(0.01)
+        raise
+
+    await producer
+    if isinstance(error, Exception):
+        raise error
+
+    content = ''.join(typed)
+    del stats['cancelled']
+    stats['seconds'] = time.perf_counter() - stats.pop('started')
+    stats['verified'] = verify_text(editor, content, before) if verify else None
+    return content, stats
+
+
+async def stream_chat_into(editor, model, messages, options=None, client=None, keep_alive=None, **kwargs):
+    """Stream an ollama chat (through the response cache) into editor
+
+    keep_alive is sent with the chat so a warmed-up model stays loaded.
+    """
+    chat_kwargs = {} if keep_alive is None else {'keep_alive': keep_alive}
+    tokens = cached_chat_stream(model, messages, options, client=client, **chat_kwargs)
+    return await stream_into(editor, tokens, **kwargs)
+
+
+def describe(stats):
+    """One-line summary of a streamed write"""
+    first = '-' if stats['first_output'] is None else f"{stats['first_output']:.2f}s"
+    return (f"Streamed {stats['chars']} chars in {stats['calls']} chunks, "
+            f"first text visible after {first}, total {stats['seconds']:.2f}s")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Model Index - Cached view of installed Ollama models
+Keeps name, family, tag, size, parameter count, quantization and last-seen
+time for every installed model, refreshed from /api/tags on demand and
+persisted between runs. Requested names are matched on normalized tags
+('deepseek-r1' finds 'deepseek-r1:1.5b', 'gemma3:4b' finds
+'gemma3:4b-it-q4_K_M') through a dictionary lookup instead of scanning, and
+rank() orders models for a task class by speed among those big enough for it.
+"""
+
+import json
+import os
+import re
+import time
+import urllib.request
+
+from llm_benchmark import DEFAULT_HOST, host_url
+
+DEFAULT_INDEX_PATH = "model_index.json"
+# Re-list installed models once the index is older than this
+DEFAULT_MAX_AGE = 10 * 60
+REQUEST_TIMEOUT = 2.0
+
+# Smallest model (billions of parameters) that handles each task class well
+TASK_MIN_PARAMS = {
+    'general': 0.0,
+    'creative': 1.0,
+    'math': 1.5,
+    'planning': 3.0,
+}
+
+_REGISTRY_PREFIXES = ('registry.ollama.ai/library/', 'registry.ollama.ai/', 'library/')
+_QUANT = re.compile(r'(?:^|-)(q\d(?:_[a-z0-9]+)*|fp16|f16|bf16)(?:-|$)')
+_PARAMS = re.compile(r'(?:^|[-_])(\d+(?:\.\d+)?)([bm])(?:[-_]|$)')
+
+
+def api_request(host, path, body=None, timeout=REQUEST_TIMEOUT):
+    """JSON request to the Ollama API (GET without a body, POST with one)"""
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(f"{host_url(host)}{path}", data=data,
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read() or b'{}')
+
+
+def normalize_name(name):
+    """(family, tag) with case, registry prefixes and a missing ':latest' normalized"""
+    name = name.strip().lower()
+    for prefix in _REGISTRY_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    family, _, tag = name.partition(':')
+    return family, tag or 'latest'
+
+
+def parse_params(text):
+    """Billions of parameters from '1.8B', '494.03M' or a tag like '4b-it-q4_K_M'"""
+    if not text:
+        return None
+    match = _PARAMS.search(str(text).lower())
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value / 1000 if match.group(2) == 'm' else value
+
+
+def parse_quantization(tag):
+    """Quantization level from a tag such as '4b-it-q4_K_M' (uppercased), or None"""
+    match = _QUANT.search(tag.lower())
+    return match.group(1).upper() if match else None
+
+
+def model_entry(model, seen=None):
+    """Index entry for one /api/tags model record"""
+    name = model.get('name') or model.get('model')
+    family, tag = normalize_name(name)
+    details = model.get('details') or {}
+    return {
+        'name': name,
+        'family': family,
+        'tag': tag,
+        'size': model.get('size'),
+        'params': parse_params(details.get('parameter_size')) or parse_params(tag),
+        'quantization': details.get('quantization_level') or parse_quantization(tag),
+        'last_seen': seen or time.time(),
+    }
+
+
+class ModelIndex:
+    """Installed models keyed by normalized (family, tag), refreshed on demand"""
+
+    def __init__(self, host=DEFAULT_HOST, path=DEFAULT_INDEX_PATH, max_age=DEFAULT_MAX_AGE,
+                 timeout=REQUEST_TIMEOUT):
+        self.host = host
+        self.path = path
+        self.max_age = max_age
+        self.timeout = timeout
+        self.entries = {}
+        self.by_family = {}
+        # Tokens/sec measured per model (e.g. by the benchmark), kept across refreshes
+        self.speeds = {}
+        self.refreshed_at = 0.0
+        self.load()
+
+    def load(self):
+        """Read the persisted index (missing or broken files start empty)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read model index {self.path}: {e}")
+            return
+        self.speeds = state.get('speeds', {})
+        self._build(state.get('models', []))
+        self.refreshed_at = state.get('refreshed_at', 0.0)
+
+    def save(self):
+        """Persist the index"""
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'refreshed_at': self.refreshed_at, 'models': list(self.entries.values()),
+                       'speeds': self.speeds}, f, indent=2)
+
+    def _build(self, entries):
+        self.entries = {}
+        self.by_family = {}
+        for entry in entries:
+            key = (entry['family'], entry['tag'])
+            self.entries[key] = entry
+            self.by_family.setdefault(entry['family'], []).append(entry)
+
+    def refresh(self, force=False):
+        """Re-list installed models when forced or stale; returns True if the listing succeeded"""
+        if not force and self.entries and time.time() - self.refreshed_at < self.max_age:
+            return True
+        try:
+            tags = api_request(self.host, '/api/tags', timeout=self.timeout)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not list Ollama models: {e}")
+            return False
+        now = time.time()
+        self._build([model_entry(model, now) for model in tags.get('models', [])])
+        self.refreshed_at = now
+        self.save()
+        return True
+
+    def names(self):
+        """Installed model names"""
+        return [entry['name'] for entry in self.entries.values()]
+
+    def resolve(self, requested):
+        """Installed name for a requested model, or None
+
+        Exact (family, tag) first, then a tag prefix at a '-' boundary
+        ('4b' → '4b-it-q4_K_M'); a bare family prefers ':latest', then the
+        smallest installed tag.
+        """
+        family, tag = normalize_name(requested)
+        entry = self.entries.get((family, tag))
+        if entry:
+            return entry['name']
+
+        candidates = self.by_family.get(family, [])
+        if ':' in requested and tag != 'latest':
+            candidates = [e for e in candidates if e['tag'].startswith(tag + '-')]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda e: (e['params'] is None, e['params'] or 0, e['size'] or 0))['name']
+
+    def entry(self, name):
+        """Index entry for an installed or requested name"""
+        resolved = self.resolve(name)
+        return self.entries.get(normalize_name(resolved)) if resolved else None
+
+    def record_speed(self, name, tokens_per_sec):
+        """Remember a measured throughput used to rank models by speed"""
+        resolved = self.resolve(name) or name
+        if tokens_per_sec:
+            self.speeds[resolved] = tokens_per_sec
+            self.save()
+
+    def _speed_key(self, entry):
+        """Sort key: measured speed first (fastest first), then size as a proxy (smallest first)"""
+        measured = self.speeds.get(entry['name'])
+        if measured:
+            return (0, -measured)
+        return (1, entry['size'] if entry['size'] is not None else (entry['params'] or 0) * 1e9)
+
+    def rank(self, task='general', candidates=None):
+        """Installed model names for a task class, fastest adequate first
+
+        candidates limits the ranking to those (resolved) names; models
+        below the task's minimum size come last, largest first. With no
+        usable listing the candidates are returned as given.
+        """
+        if task not in TASK_MIN_PARAMS:
+            raise ValueError(f"Unknown task class '{task}', expected one of {tuple(TASK_MIN_PARAMS)}")
+        if not self.entries:
+            return list(candidates or [])
+
+        if candidates is None:
+            entries = list(self.entries.values())
+        else:
+            names = dict.fromkeys(filter(None, (self.resolve(c) for c in candidates)))
+            entries = [self.entries[normalize_name(name)] for name in names]
+
+        minimum = TASK_MIN_PARAMS[task]
+        adequate = [e for e in entries if e['params'] is None or e['params'] >= minimum]
+        small = [e for e in entries if e['params'] is not None and e['params'] < minimum]
+        adequate.sort(key=self._speed_key)
+        small.sort(key=lambda e: -e['params'])
+        return [e['name'] for e in adequate + small]
+
+    def best(self, task='general', candidates=None):
+        """Fastest adequate installed model for a task, or None"""
+        ranked = self.rank(task, candidates)
+        return ranked[0] if ranked and self.entries else None
+
+
+# One index shared by every script in a process
+_shared = None
+
+
+def shared_model_index():
+    """Get the process-wide ModelIndex backed by DEFAULT_INDEX_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = ModelIndex()
+    return _shared
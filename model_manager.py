@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Model Manager - Warm, keep-alive Ollama models without serial probing
+Lists installed models once, checks candidate models in parallel with short
+timeouts, remembers which ones were available between runs and preloads the
+chosen model with a keep-alive so the first real request does not pay the
+model load time.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_benchmark import DEFAULT_HOST
+from model_index import ModelIndex, api_request, shared_model_index
+
+DEFAULT_STATE_PATH = "model_availability.json"
+# How long a model stays loaded after its last request
+DEFAULT_KEEP_ALIVE = "30m"
+PROBE_TIMEOUT = 2.0
+# Remembered availability is trusted for this long before probing again
+AVAILABILITY_TTL = 24 * 3600
+
+
+class ModelManager:
+    """Chooses, preloads and keeps alive local Ollama models"""
+
+    def __init__(self, host=DEFAULT_HOST, state_path=DEFAULT_STATE_PATH, keep_alive=DEFAULT_KEEP_ALIVE,
+                 probe_timeout=PROBE_TIMEOUT, availability_ttl=AVAILABILITY_TTL, index=None):
+        """index=None lists models through a private, unpersisted ModelIndex"""
+        self.host = host
+        self.index = index if index is not None else ModelIndex(host=host, path=None, timeout=probe_timeout)
+        self.state_path = state_path
+        self.keep_alive = keep_alive
+        self.probe_timeout = probe_timeout
+        self.availability_ttl = availability_ttl
+        self.availability = {}
+        self.warm = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read remembered availability (missing or broken files start empty)"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.availability = json.load(f).get('availability', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read model availability {self.state_path}: {e}")
+
+    def save(self):
+        """Persist availability for the next run"""
+        if not self.state_path:
+            return
+        with self.lock:
+            state = {'availability': dict(self.availability)}
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    def list_models(self, refresh=False):
+        """Installed model names from the model index (listed once, then on demand)"""
+        self.index.refresh(force=refresh)
+        return self.index.names()
+
+    def remembered(self, model):
+        """True/False from a recent probe, or None when unknown or stale"""
+        entry = self.availability.get(model)
+        if not entry or time.time() - entry['checked'] > self.availability_ttl:
+            return None
+        return entry['available']
+
+    def _remember(self, model, available):
+        with self.lock:
+            self.availability[model] = {'available': available, 'checked': time.time()}
+
+    def probe(self, model):
+        """Check one model answers /api/show within the probe timeout"""
+        try:
+            api_request(self.host, '/api/show', {'model': model}, timeout=self.probe_timeout)
+            available = True
+        except (OSError, ValueError):
+            available = False
+        self._remember(model, available)
+        return available
+
+    def check(self, candidates, refresh=False):
+        """Availability of each candidate, probing unknown ones in parallel
+
+        Returns {candidate: installed name or None}; listed candidates are
+        resolved through the index's tag matching.
+        """
+        results = {}
+        to_probe = {}
+        listed = bool(self.list_models(refresh))
+        for model in candidates:
+            name = self.index.resolve(model) if listed else model
+            known = None if refresh else self.remembered(name)
+            if name is None:
+                # Not installed (not remembered, so a later pull is picked up)
+                results[model] = None
+            elif known is not None:
+                results[model] = name if known else None
+            else:
+                to_probe.setdefault(name, []).append(model)
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=len(to_probe)) as pool:
+                for name, available in zip(to_probe, pool.map(self.probe, to_probe)):
+                    for model in to_probe[name]:
+                        results[model] = name if available else None
+        self.save()
+        return results
+
+    def choose(self, candidates, preload=True, refresh=False):
+        """Installed name of the first available candidate (preloaded in the background), or None"""
+        results = self.check(candidates, refresh)
+        for model in candidates:
+            if results.get(model):
+                if preload:
+                    self.warm_up(results[model])
+                return results[model]
+        return None
+
+    def preload(self, model, keep_alive=None):
+        """Load a model into memory with a keep-alive; returns load seconds or None on failure"""
+        started = time.perf_counter()
+        try:
+            # An empty prompt makes Ollama load the model without generating
+            api_request(self.host, '/api/generate',
+                     {'model': model, 'prompt': '', 'stream': False, 'keep_alive': keep_alive or self.keep_alive},
+                     timeout=300)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not preload {model}: {e}")
+            self._remember(model, False)
+            return None
+        seconds = time.perf_counter() - started
+        with self.lock:
+            self.warm[model] = {'loaded_at': time.time(), 'load_seconds': seconds}
+        self._remember(model, True)
+        return seconds
+
+    def warm_up(self, model, keep_alive=None):
+        """Start preloading a model in the background and return the thread"""
+        thread = threading.Thread(target=self.preload, args=(model, keep_alive), daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        """Known availability and warmed models"""
+        return {
+            'installed': len(self.index.entries),
+            'known_available': sorted(m for m, e in self.availability.items() if e['available']),
+            'known_missing': sorted(m for m, e in self.availability.items() if not e['available']),
+            'warm': dict(self.warm),
+        }
+
+
+# One manager shared by every script in a process
+_shared = None
+
+
+def shared_model_manager():
+    """Get the process-wide ModelManager backed by DEFAULT_STATE_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = ModelManager(index=shared_model_index())
+    return _shared
+
+
+def warm_up(model, keep_alive=None):
+    """Preload a model in the background with the shared manager"""
+    return shared_model_manager().warm_up(model, keep_alive)
@@ -11,6 +11,11 @@ import random
 from datetime import datetime
 from pathlib import Path
 
+from app_ready import open_and_wait
+from model_index import shared_model_index
+from model_manager import shared_model_manager
+from text_entry import write_text_async
+
 # Try to import required modules
 try:
     from langchain_ollama import OllamaLLM
@@ -36,15 +41,18 @@ class OllamaRedditDemo:
         print("🚀 INITIALIZING AI COMPUTER TAKEOVER...")
         print("Target: Saying hello to Ollama community!")
         
-        # Try different models
-        self.models_to_try = [
+        # Try different models: the index keeps the installed ones, fastest adequate first
+        # (with no listing available they are tried as written)
+        index = shared_model_index()
+        index.refresh()
+        self.models_to_try = index.rank('creative', [
             "deepseek-r1:1.5b",
             "deepseek-r1",
             "gemma3:latest", 
             "gemma3",
             "llama3.2",
             "phi3"
-        ]
+        ])
         
         self.active_model = None
         self.llm = None
@@ -56,20 +64,15 @@ class OllamaRedditDemo:
         print("🧠 Setting up AI models...")
         
         if LANGCHAIN_AVAILABLE:
-            for model in self.models_to_try:
-                try:
-                    print(f"   Trying {model}...")
-                    test_llm = OllamaLLM(model=model, timeout=10)
-                    # Quick test
-                    test_response = test_llm.invoke("Hello")
-                    if test_response:
-                        self.llm = test_llm
-                        self.active_model = model
-                        print(f"✅ Successfully connected to {model}!")
-                        break
-                except Exception as e:
-                    print(f"   ❌ {model} not available: {str(e)[:50]}...")
-                    continue
+            # One listing plus parallel probes instead of a 10 s invoke per model
+            manager = shared_model_manager()
+            model = manager.choose(self.models_to_try)
+            if model:
+                self.llm = OllamaLLM(model=model, keep_alive=manager.keep_alive)
+                self.active_model = model
+                print(f"✅ Successfully connected to {model}! (warming up in the background)")
+            else:
+                print(f"   ❌ None of {', '.join(self.models_to_try)} are available")
         
         if not self.llm:
             print("🤖 No LangChain models available, will use creative fallback!")
@@ -211,8 +214,7 @@ Keep being awesome!
         print("\n📝 STEP 2: Taking over Notepad...")
         if TERMINATOR_AVAILABLE and desktop:
             try:
-                desktop.open_application('notepad')
-                await asyncio.sleep(3)
+                await open_and_wait(desktop, 'notepad')
                 
                 editor = desktop.locator('name:Edit')
                 await asyncio.sleep(1)
@@ -266,14 +268,8 @@ End of AI takeover... for now! 😉🤖
                 
                 # Type the message with dramatic effect
                 print("⌨️ AI is now typing the message...")
-                for char in full_message:
-                    editor.type_text(char)
-                    if char in '.!?':
-                        await asyncio.sleep(0.1)  # Dramatic pause
-                    elif char == '\n':
-                        await asyncio.sleep(0.05)
-                    else:
-                        await asyncio.sleep(0.01)
+                # One type_text per sentence/line keeps the dramatic pauses without per-char calls
+                await write_text_async(editor, full_message, method='throttled')
                 
                 print("✅ Message successfully typed by AI!")
                 
@@ -291,8 +287,7 @@ End of AI takeover... for now! 😉🤖
         print("\n🧮 STEP 3: Playing with Calculator for fun...")
         if TERMINATOR_AVAILABLE and desktop:
             try:
-                desktop.open_application('calc')
-                await asyncio.sleep(2)
+                await open_and_wait(desktop, 'calc')
                 
                 # Calculate some fun numbers
                 fun_calculations = [
@@ -8,19 +8,20 @@ import asyncio
 import terminator
 import math
 
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+
 async def open_calculator():
     """Open Windows Calculator"""
     desktop = terminator.Desktop()
     print("🧮 Opening Calculator...")
-    desktop.open_application('calc')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'calc')
     return desktop
 
 async def clear_calculator(desktop):
     """Clear the calculator"""
     try:
-        clear_btn = desktop.locator('name:Clear')
-        clear_btn.click()
+        calculator_for(desktop).element('name:Clear').click()
         await asyncio.sleep(0.3)
         return True
     except Exception as e:
@@ -32,46 +33,12 @@ async def perform_calculation(desktop, expression, expected=None):
     print(f"🔢 Calculating: {expression}")
     
     try:
-        # Parse and click the expression
-        for char in expression:
-            if char.isdigit():
-                # Click number
-                btn = desktop.locator(f'name:{char}')
-                btn.click()
-            elif char == '+':
-                btn = desktop.locator('name:Plus')
-                btn.click()
-            elif char == '-':
-                btn = desktop.locator('name:Minus')
-                btn.click()
-            elif char == '*':
-                btn = desktop.locator('name:Multiply by')
-                btn.click()
-            elif char == '/':
-                btn = desktop.locator('name:Divide by')
-                btn.click()
-            elif char == '=':
-                btn = desktop.locator('name:Equals')
-                btn.click()
-            elif char == '.':
-                btn = desktop.locator('name:Decimal separator')
-                btn.click()
-            elif char == '(':
-                btn = desktop.locator('name:Open parenthesis')
-                btn.click()
-            elif char == ')':
-                btn = desktop.locator('name:Close parenthesis')
-                btn.click()
-            
-            await asyncio.sleep(0.2)
-        
-        # Click equals if not already in expression
-        if '=' not in expression:
-            equals_btn = desktop.locator('name:Equals')
-            equals_btn.click()
-            await asyncio.sleep(0.5)
+        # Replay the compiled expression (equals is added automatically)
+        result = await calculator_for(desktop).calculate_async(expression, clear=False)
+        if not result['success']:
+            raise RuntimeError(result['error'])
         
-        print(f"✓ Calculation completed: {expression}")
+        print(f"✓ Calculation completed: {expression} ({result['mode']}, {result['latency']:.2f}s)")
         
         if expected:
             print(f"  Expected: {expected}")
@@ -103,10 +70,7 @@ async def try_scientific_functions(desktop):
         await clear_calculator(desktop)
         
         # Enter 16
-        desktop.locator('name:1').click()
-        await asyncio.sleep(0.2)
-        desktop.locator('name:6').click()
-        await asyncio.sleep(0.2)
+        await calculator_for(desktop).calculate_async("16", equals=False, clear=False)
         
         # Click square root
         try:
@@ -130,10 +94,7 @@ async def memory_operations(desktop):
         
         # Clear and calculate 25
         await clear_calculator(desktop)
-        desktop.locator('name:2').click()
-        await asyncio.sleep(0.2)
-        desktop.locator('name:5').click()
-        await asyncio.sleep(0.2)
+        await calculator_for(desktop).calculate_async("25", equals=False, clear=False)
         
         # Store in memory (M+)
         try:
@@ -147,14 +108,9 @@ async def memory_operations(desktop):
         
         # Clear and calculate 10
         await clear_calculator(desktop)
-        desktop.locator('name:1').click()
-        await asyncio.sleep(0.2)
-        desktop.locator('name:0').click()
-        await asyncio.sleep(0.2)
         
         # Add to memory result (=35)
-        desktop.locator('name:Plus').click()
-        await asyncio.sleep(0.2)
+        await calculator_for(desktop).calculate_async("10+", equals=False, clear=False)
         
         try:
             m_recall = desktop.locator('name:Memory recall')
@@ -192,7 +148,9 @@ async def stress_test_calculations(desktop):
         await perform_calculation(desktop, calc)
         await asyncio.sleep(0.5)
     
-    print("✓ Stress test completed!")
+    summary = calculator_for(desktop).latency_summary()
+    print(f"✓ Stress test completed! {summary['count']} expressions, "
+          f"avg {summary['average']:.2f}s, max {summary['max']:.2f}s")
 
 async def advanced_calculator_demo():
     """Main advanced calculator demonstration"""
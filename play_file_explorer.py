@@ -7,12 +7,14 @@ Automates Windows File Explorer for various tasks
 import asyncio
 import terminator
 
+from app_ready import open_and_wait
+from text_entry import write_text
+
 async def open_explorer():
     """Open Windows File Explorer"""
     desktop = terminator.Desktop()
     print("📁 Opening File Explorer...")
-    desktop.open_application('explorer')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'explorer')
     return desktop
 
 async def navigate_to_desktop(desktop):
@@ -72,8 +74,7 @@ async def create_text_file(desktop, filename):
         
         # Alternative: Open notepad and save to current location
         notepad_desktop = terminator.Desktop()
-        notepad_desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(notepad_desktop, 'notepad')
         
         # Type some content
         editor = notepad_desktop.locator('name:Edit')
@@ -85,7 +86,7 @@ Purpose: Testing file creation capabilities
 
 Pretty cool, right? 🤖
 """
-        editor.type_text(content)
+        write_text(editor, content)
         
         # Save file (Ctrl+S)
         notepad_desktop.key_combination(['ctrl', 's'])
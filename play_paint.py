@@ -7,12 +7,13 @@ Automates Windows Paint to create drawings
 import asyncio
 import terminator
 
+from app_ready import open_and_wait
+
 async def open_paint():
     """Open MS Paint"""
     desktop = terminator.Desktop()
     print("🎨 Opening Paint...")
-    desktop.open_application('mspaint')
-    await asyncio.sleep(3)
+    await open_and_wait(desktop, 'mspaint')
     return desktop
 
 async def select_brush_tool(desktop):
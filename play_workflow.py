@@ -8,6 +8,10 @@ import asyncio
 import terminator
 import time
 
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+from text_entry import write_text
+
 async def workflow_calculator_to_notepad():
     """Calculate something and document it in notepad"""
     print("🔄 Workflow: Calculator → Notepad")
@@ -15,8 +19,7 @@ async def workflow_calculator_to_notepad():
     # Step 1: Use calculator
     print("📊 Step 1: Performing calculations...")
     desktop = terminator.Desktop()
-    desktop.open_application('calc')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'calc')
     
     # Calculate area of a rectangle: 25 * 15
     calculations = [
@@ -28,40 +31,17 @@ async def workflow_calculator_to_notepad():
     results = []
     
     for calc, description in calculations:
-        # Clear calculator
-        clear_btn = desktop.locator('name:Clear')
-        clear_btn.click()
-        await asyncio.sleep(0.3)
-        
         print(f"  Calculating: {calc} ({description})")
         
-        # Perform calculation
-        for char in calc:
-            if char.isdigit():
-                btn = desktop.locator(f'name:{char}')
-                btn.click()
-            elif char == '+':
-                btn = desktop.locator('name:Plus')
-                btn.click()
-            elif char == '*':
-                btn = desktop.locator('name:Multiply by')
-                btn.click()
-            elif char == '/':
-                btn = desktop.locator('name:Divide by')
-                btn.click()
-            await asyncio.sleep(0.2)
-        
-        # Get result
-        equals_btn = desktop.locator('name:Equals')
-        equals_btn.click()
-        await asyncio.sleep(0.5)
+        # Clear, perform the calculation and get the result
+        result = await calculator_for(desktop).calculate_async(calc)
         
-        results.append((calc, description, "calculated"))
+        status = f"calculated in {result['latency']:.2f}s" if result['success'] else "failed"
+        results.append((calc, description, status))
     
     # Step 2: Document in Notepad
     print("📝 Step 2: Documenting results in Notepad...")
-    desktop.open_application('notepad')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'notepad')
     
     editor = desktop.locator('name:Edit')
     
@@ -89,7 +69,7 @@ WORKFLOW SUMMARY:
 This report was generated entirely through automation! 🤖
 """
     
-    editor.type_text(report)
+    write_text(editor, report)
     print("✓ Report created in Notepad")
     
     return True
@@ -101,8 +81,7 @@ async def workflow_paint_and_document():
     # Step 1: Create art in Paint
     print("🖌️ Step 1: Creating artwork in Paint...")
     desktop = terminator.Desktop()
-    desktop.open_application('mspaint')
-    await asyncio.sleep(3)
+    await open_and_wait(desktop, 'mspaint')
     
     # Try to select brush and draw
     try:
@@ -129,8 +108,7 @@ async def workflow_paint_and_document():
     
     # Step 2: Document the art creation process
     print("📝 Step 2: Documenting art creation process...")
-    desktop.open_application('notepad')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'notepad')
     
     editor = desktop.locator('name:Edit')
     
@@ -175,7 +153,7 @@ Next steps could include:
 - Social media posting automation
 """
     
-    editor.type_text(art_report)
+    write_text(editor, art_report)
     print("✓ Art creation documented")
     
     return True
@@ -187,8 +165,7 @@ async def workflow_file_organization():
     # Step 1: Open File Explorer
     print("🗂️ Step 1: File organization...")
     desktop = terminator.Desktop()
-    desktop.open_application('explorer')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'explorer')
     
     # Navigate to Desktop
     try:
@@ -201,8 +178,7 @@ async def workflow_file_organization():
     
     # Step 2: Create summary in Notepad
     print("📊 Step 2: Creating organization summary...")
-    desktop.open_application('notepad')
-    await asyncio.sleep(2)
+    await open_and_wait(desktop, 'notepad')
     
     editor = desktop.locator('name:Edit')
     
@@ -245,7 +221,7 @@ This workflow demonstrates seamless integration
 between file management and documentation systems! 📁
 """
     
-    editor.type_text(summary)
+    write_text(editor, summary)
     print("✓ Organization summary completed")
     
     return True
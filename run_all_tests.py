@@ -36,7 +36,31 @@ def main():
         "test_basic.py",
         "test_calculator.py", 
         "test_notepad.py",
-        "test_advanced.py"
+        "test_advanced.py",
+        "test_element_cache.py",
+        "test_calculator_engine.py",
+        "test_app_ready.py",
+        "test_delay_calibration.py",
+        "test_text_entry.py",
+        "test_shapes.py",
+        "test_stroke_optimizer.py",
+        "test_stroke_executor.py",
+        "test_stroke_scheduler.py",
+        "test_capture_store.py",
+        "test_canvas_capture.py",
+        "test_change_detection.py",
+        "test_vision_cache.py",
+        "test_llm_cache.py",
+        "test_llm_client.py",
+        "test_llm_benchmark.py",
+        "test_llm_stream.py",
+        "test_model_manager.py",
+        "test_model_index.py",
+        "test_tool_runtime.py",
+        "test_ui_tree.py",
+        "test_ui_snapshot.py",
+        "test_ui_diff.py",
+        "test_selector_resolver.py"
     ]
     
     results = []
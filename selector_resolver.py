@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Learned Selector Ranking - Try the selector that worked last time first
+Tools that know several selectors for one element (the brush button, the
+canvas, a palette color) used to try them in a fixed order and pay a failed
+lookup for every miss. The resolver records which selector found each
+(app, logical element), keeps those counts on disk and orders the
+candidates by success rate, so after a warm-up run each lookup takes one
+attempt. Every so often the fixed order is tried again to pick up a better
+selector after an app update.
+"""
+
+import json
+import os
+import time
+
+from element_cache import resolve_element
+
+DEFAULT_STATS_PATH = "selector_stats.json"
+# Try the candidates in their given order again once the ranking is this old
+REVALIDATE_AFTER = 24 * 3600
+
+
+class SelectorResolver:
+    """Per-(app, element) selector success counts with best-first ordering"""
+
+    def __init__(self, path=DEFAULT_STATS_PATH, revalidate_after=REVALIDATE_AFTER):
+        """Load existing stats from path if there are any"""
+        self.path = path
+        self.revalidate_after = revalidate_after
+        self.elements = {}
+        self.lookups = 0
+        self.attempts = 0
+        self.load()
+
+    def _key(self, app, element):
+        return f"{app}/{element}"
+
+    def load(self):
+        """Read selector stats from disk (missing or broken files start empty)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.elements = json.load(f).get('elements', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read selector stats {self.path}: {e}")
+
+    def save(self):
+        """Write selector stats to disk"""
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'elements': self.elements}, f, indent=2)
+
+    def _entry(self, app, element):
+        return self.elements.setdefault(self._key(app, element), {'selectors': {}, 'validated': 0.0})
+
+    def due_for_validation(self, app, element):
+        """True when nothing is learned yet or the ranking is older than revalidate_after"""
+        entry = self.elements.get(self._key(app, element))
+        return not entry or time.time() - entry['validated'] > self.revalidate_after
+
+    def order(self, app, element, selectors):
+        """Candidates best-first, ties in the given order
+
+        Selectors whose last attempt worked come first, then untried ones,
+        then those that failed last time; each group by success rate.
+        """
+        learned = self.elements.get(self._key(app, element), {}).get('selectors', {})
+
+        def rank(selector):
+            counts = learned.get(selector)
+            if not counts:
+                return (1, 0.0)
+            rate = (counts['hits'] + 1) / (counts['hits'] + counts['misses'] + 2)
+            return (0 if counts.get('last_ok') else 2, -rate)
+
+        return sorted(selectors, key=rank)
+
+    def record(self, app, element, selector, success):
+        """Count one attempt of a selector for a logical element"""
+        counts = self._entry(app, element)['selectors'].setdefault(selector, {'hits': 0, 'misses': 0})
+        counts['hits' if success else 'misses'] += 1
+        counts['last_ok'] = success
+
+    def resolve(self, desktop, app, element, selectors, action=None):
+        """Find an element with the best-ranked working selector; returns (target, selector)
+
+        action(target), e.g. a click, counts as part of the attempt. Raises
+        RuntimeError when no selector works.
+        """
+        self.lookups += 1
+        validating = self.due_for_validation(app, element)
+        candidates = list(selectors) if validating else self.order(app, element, selectors)
+
+        missed = False
+        for selector in candidates:
+            self.attempts += 1
+            try:
+                # Locators are lazy; resolving here makes a missing element fail this attempt
+                target = resolve_element(desktop.locator(selector))
+                if action is not None:
+                    action(target)
+            except Exception:
+                self.record(app, element, selector, False)
+                missed = True
+                continue
+
+            self.record(app, element, selector, True)
+            if validating:
+                self._entry(app, element)['validated'] = time.time()
+            # Pure hits only change counts; write when the ranking may have moved
+            if missed or validating:
+                self.save()
+            return target, selector
+
+        self.save()
+        raise RuntimeError(f"No selector found '{element}' in {app}: tried {', '.join(candidates)}")
+
+    def stats(self):
+        """Lookups, attempts and attempts per lookup this session"""
+        return {
+            'lookups': self.lookups,
+            'attempts': self.attempts,
+            'attempts_per_lookup': self.attempts / self.lookups if self.lookups else 0.0,
+            'elements': len(self.elements),
+        }
+
+
+# One resolver shared by every tool in a process
+_shared = None
+
+
+def shared_resolver():
+    """Get the process-wide resolver backed by DEFAULT_STATS_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = SelectorResolver()
+    return _shared
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Shape Library - Vectorized point arrays for Paint drawing
+Every shape is generated with NumPy in one shot as an (N, 2) array centered on
+the origin with unit size. Scale/rotate/translate are 3x3 homogeneous matrices,
+so placing a shape, or stamping hundreds of copies of it, never loops in Python.
+"""
+
+import numpy as np
+
+
+def parametric(fx, fy, start=0.0, stop=2 * np.pi, count=64, endpoint=True):
+    """Sample an arbitrary parametric curve (fx(t), fy(t)) into an (count, 2) array"""
+    t = np.linspace(start, stop, count, endpoint=endpoint)
+    x = np.broadcast_to(fx(t), t.shape)
+    y = np.broadcast_to(fy(t), t.shape)
+    return np.column_stack([x, y]).astype(float)
+
+
+def polyline(*points):
+    """Explicit vertices as an (N, 2) array"""
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def circle(count=37):
+    """Closed unit circle (radius 1)"""
+    return parametric(np.cos, np.sin, count=count)
+
+
+def square():
+    """Closed square with side 1"""
+    return polyline((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5), (-0.5, -0.5))
+
+
+def triangle():
+    """Closed equilateral triangle with side 1, point up"""
+    h = np.sqrt(3) / 2
+    return polyline((0, -h / 2), (-0.5, h / 2), (0.5, h / 2), (0, -h / 2))
+
+
+def star(tips=5, inner=0.5):
+    """Closed star with outer radius 1, first tip pointing up"""
+    angles = np.linspace(0, 2 * np.pi, 2 * tips + 1) - np.pi / 2
+    radii = np.where(np.arange(2 * tips + 1) % 2 == 0, 1.0, inner)
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+
+def heart(count=37):
+    """Closed heart curve, about 1.6 wide (the classic 16 sin^3 t form divided by 20)"""
+    return parametric(
+        lambda t: 16 * np.sin(t) ** 3 / 20,
+        lambda t: -(13 * np.cos(t) - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t)) / 20,
+        count=count,
+    )
+
+
+def spiral(turns=2, count=48):
+    """Archimedean spiral from the center out to radius 1"""
+    t = np.linspace(0, 1, count, endpoint=False)
+    angles = 2 * np.pi * turns * t
+    return np.column_stack([t * np.cos(angles), t * np.sin(angles)])
+
+
+def zigzag(peaks=5, step=1 / 3, height=1.0):
+    """Zigzag starting at the origin and running right, peaks alternating at +/- height/2"""
+    i = np.arange(peaks + 1)
+    return np.column_stack([i * step, np.where(i % 2 == 0, height / 2, -height / 2)])
+
+
+def wave(cycles=2.5, amplitude=0.2, count=32):
+    """Sine wave of width 1 centered on the origin"""
+    x = np.linspace(-0.5, 0.5, count)
+    return np.column_stack([x, amplitude * np.sin(2 * np.pi * cycles * (x + 0.5))])
+
+
+def line():
+    """Horizontal line from (-1, 0) to (1, 0)"""
+    return polyline((-1, 0), (1, 0))
+
+
+def grid(cols=7, rows=5):
+    """Dot positions on a cols x rows grid of width/height 1"""
+    xs, ys = np.meshgrid(np.linspace(-0.5, 0.5, cols), np.linspace(-0.5, 0.5, rows))
+    return np.column_stack([xs.ravel(), ys.ravel()])
+
+
+def scribble(steps=15, spread=0.5, rng=None):
+    """Random walk starting at the origin"""
+    rng = rng or np.random.default_rng()
+    return np.cumsum(rng.uniform(-spread, spread, size=(steps, 2)), axis=0)
+
+
+def scale_matrix(sx, sy=None):
+    """Homogeneous scale matrix"""
+    return np.diag([sx, sx if sy is None else sy, 1.0])
+
+
+def rotation_matrix(degrees):
+    """Homogeneous rotation matrix (screen coordinates, so positive is clockwise)"""
+    a = np.radians(degrees)
+    return np.array([[np.cos(a), -np.sin(a), 0.0],
+                     [np.sin(a), np.cos(a), 0.0],
+                     [0.0, 0.0, 1.0]])
+
+
+def translation_matrix(dx, dy):
+    """Homogeneous translation matrix"""
+    return np.array([[1.0, 0.0, dx], [0.0, 1.0, dy], [0.0, 0.0, 1.0]])
+
+
+def compose(*matrices):
+    """Combine matrices so the first one given is applied first"""
+    result = np.eye(3)
+    for matrix in matrices:
+        result = matrix @ result
+    return result
+
+
+def transform(points, *matrices):
+    """Apply matrices (first applied first) to an (N, 2) point array"""
+    matrix = compose(*matrices)
+    return points @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+def transform_many(points, matrices):
+    """Apply a (K, 3, 3) stack of matrices to one shape, giving a (K, N, 2) array"""
+    matrices = np.asarray(matrices, dtype=float)
+    return np.einsum('kij,nj->kni', matrices[:, :2, :2], points) + matrices[:, None, :2, 2]
+
+
+def place(points, x, y, size=1.0, rotation=0.0):
+    """Scale a unit shape by size (a number or (sx, sy)), rotate it and move it to (x, y)"""
+    sx, sy = (size, size) if np.isscalar(size) else size
+    return transform(points, scale_matrix(sx, sy), rotation_matrix(rotation), translation_matrix(x, y))
+
+
+def radial_copies(points, count, radius, x=0.0, y=0.0, rotate=True):
+    """Stamp count copies of a shape evenly around a circle, as a (count, N, 2) array"""
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    cos, sin = np.cos(angles), np.sin(angles)
+    if not rotate:
+        cos_r, sin_r = np.ones(count), np.zeros(count)
+    else:
+        cos_r, sin_r = cos, sin
+
+    matrices = np.zeros((count, 3, 3))
+    matrices[:, 0, 0] = cos_r
+    matrices[:, 0, 1] = -sin_r
+    matrices[:, 1, 0] = sin_r
+    matrices[:, 1, 1] = cos_r
+    matrices[:, 0, 2] = x + radius * cos
+    matrices[:, 1, 2] = y + radius * sin
+    matrices[:, 2, 2] = 1.0
+    return transform_many(points, matrices)
+
+
+# Unit shapes by pattern name, as used by the Paint drawing tools
+PATTERNS = {
+    'circle': circle,
+    'square': square,
+    'triangle': triangle,
+    'star': star,
+    'heart': heart,
+    'spiral': spiral,
+    'zigzag': zigzag,
+    'wave': wave,
+    'line': line,
+    'scribble': scribble,
+}
+
+
+def pattern_points(pattern, x, y, size, rotation=0.0):
+    """Points for a named pattern centered at (x, y); unknown names draw a circle"""
+    return place(PATTERNS.get(pattern, circle)(), x, y, size, rotation)
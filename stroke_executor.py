@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Stroke Executor - Draw a whole Paint composition in one batched session
+Resolves the canvas once, lets the stroke scheduler order strokes so palette
+clicks are minimized without breaking z-order, optimizes every stroke and
+streams its mouse moves at the fastest rate Paint has kept up with so far:
+the delay between moves shrinks a little after every clean stroke and
+doubles when Paint rejects a move.
+"""
+
+import time
+
+from element_cache import CachedDesktop
+from shapes import pattern_points
+from stroke_optimizer import DEFAULT_TOLERANCE, optimize_stroke
+from stroke_scheduler import schedule_report
+
+CANVAS_SELECTORS = [
+    'automationid:Canvas',
+    'name:Canvas',
+    'class:Canvas',
+    'automationid:DrawingCanvas',
+]
+
+# Delay between streamed moves before anything has been learned
+STREAM_DELAY = 0.01
+MAX_STREAM_DELAY = 0.1
+# Taken off the delay after each stroke without a rejected move
+STREAM_DELAY_STEP = 0.001
+PRESS_DELAY = 0.1
+
+
+def color_selectors(color):
+    """Palette button selectors to try for a color name, most reliable first
+
+    A control number from the UI inspection ('#12') is used as it is.
+    """
+    if color.startswith('#'):
+        return [color]
+    name = color.capitalize()
+    return [
+        f'automationid:{name}Color',
+        f'name:{name}',
+        f'automationid:Color{name}',
+    ]
+
+
+def parse_shape(spec):
+    """Parse 'pattern:circle, x:300, y:200, size:50, color:red, layer:1' into a shape dict"""
+    params = {}
+    for part in spec.split(','):
+        if ':' in part:
+            key, value = part.split(':', 1)
+            params[key.strip()] = value.strip()
+
+    return {
+        'pattern': params.get('pattern', 'circle'),
+        'x': int(params.get('x', 400)),
+        'y': int(params.get('y', 300)),
+        'size': int(params.get('size', 50)),
+        'color': params.get('color'),
+        'layer': int(params.get('layer', 0)),
+    }
+
+
+def parse_composition(query):
+    """Parse ';'-separated shape specs into a list of shape dicts"""
+    return [parse_shape(spec) for spec in query.split(';') if spec.strip()]
+
+
+def shape_stroke(shape):
+    """Turn a parsed shape into a stroke dict with its points"""
+    return {
+        'points': pattern_points(shape['pattern'], shape['x'], shape['y'], shape['size']),
+        'color': shape.get('color'),
+        'layer': shape.get('layer', 0),
+        'label': shape['pattern'],
+    }
+
+
+class StrokeExecutor:
+    """Batched Paint drawing session with one canvas lookup and adaptive move streaming"""
+
+    def __init__(self, desktop, calibrator=None, tolerance=DEFAULT_TOLERANCE,
+                 stream_delay=STREAM_DELAY, press_delay=PRESS_DELAY, resolver=None):
+        """Wrap desktop in an element cache; calibrator supplies the learned move delay,
+        resolver (a SelectorResolver) the learned selector order for the canvas and colors"""
+        self.desktop = desktop if isinstance(desktop, CachedDesktop) else CachedDesktop(desktop)
+        self.calibrator = calibrator
+        self.resolver = resolver
+        self.tolerance = tolerance
+        self.press_delay = press_delay
+        self.stream_delay = calibrator.delay('mspaint', 'mouse_move', stream_delay) if calibrator else stream_delay
+        self.canvas = None
+        self.color = None
+        self.color_switches = 0
+        self.rejected_moves = 0
+        self.palette = {}
+
+    def resolve_canvas(self):
+        """Find the canvas once per session"""
+        if self.canvas is not None:
+            return self.canvas
+
+        if self.resolver is not None:
+            self.canvas, selector = self.resolver.resolve(self.desktop, 'mspaint', 'canvas', CANVAS_SELECTORS)
+            print(f"✅ Canvas found using: {selector}")
+            return self.canvas
+
+        for selector in CANVAS_SELECTORS:
+            try:
+                self.canvas = self.desktop.locator(selector)
+                print(f"✅ Canvas found using: {selector}")
+                return self.canvas
+            except Exception:
+                continue
+        raise RuntimeError("Could not find Paint canvas. Make sure Paint is open!")
+
+    def select_color(self, color):
+        """Click a palette color unless it is already the active one"""
+        if not color or color == self.color:
+            return True
+
+        # Control numbers are only valid until the next inspection, so they are not ranked
+        if self.resolver is not None and color not in self.palette and not color.startswith('#'):
+            try:
+                _, selector = self.resolver.resolve(self.desktop, 'mspaint', f'color:{color.lower()}',
+                                                    color_selectors(color), action=lambda button: button.click())
+            except RuntimeError:
+                print(f"⚠️ Could not select {color} color, keeping {self.color or 'default'}")
+                return False
+            self.palette[color] = selector
+            self.color = color
+            self.color_switches += 1
+            return True
+
+        # Once a selector has worked for a color, skip the failing fallbacks
+        known = self.palette.get(color)
+        for selector in [known] if known else color_selectors(color):
+            try:
+                self.desktop.locator(selector).click()
+                self.palette[color] = selector
+                self.color = color
+                self.color_switches += 1
+                return True
+            except Exception:
+                continue
+        print(f"⚠️ Could not select {color} color, keeping {self.color or 'default'}")
+        return False
+
+    def _move(self, x, y):
+        """One streamed move; slow the stream down if Paint rejects it"""
+        try:
+            self.canvas.mouse_move(int(x), int(y))
+        except Exception:
+            self.rejected_moves += 1
+            self.stream_delay = min(max(self.stream_delay * 2, 0.005), MAX_STREAM_DELAY)
+            if self.calibrator:
+                self.calibrator.record_outcome('mspaint', 'mouse_move', False)
+            time.sleep(self.stream_delay)
+            self.canvas.mouse_move(int(x), int(y))
+
+    def draw_stroke(self, points):
+        """Press, stream the optimized moves and release; returns (moves, stats)"""
+        points, stats = optimize_stroke(points, self.tolerance)
+        if len(points) == 0:
+            return 0, stats
+
+        rejected = self.rejected_moves
+        self.canvas.mouse_click_and_hold(int(points[0][0]), int(points[0][1]))
+        try:
+            time.sleep(self.press_delay)
+            for x, y in points[1:]:
+                self._move(x, y)
+                if self.stream_delay:
+                    time.sleep(self.stream_delay)
+        finally:
+            # Never leave the button held down, even when a move fails
+            self.canvas.mouse_release()
+
+        # Paint kept up with the whole stroke, so try a slightly faster stream next
+        if self.rejected_moves == rejected:
+            self.stream_delay = max(self.stream_delay - STREAM_DELAY_STEP, 0.0)
+        return len(points) - 1, stats
+
+    def execute(self, strokes):
+        """Draw every stroke in scheduled order; returns session stats"""
+        started = time.perf_counter()
+        switches_at_start = self.color_switches
+        self.resolve_canvas()
+
+        ordered, plan = schedule_report(strokes)
+        moves = points_in = 0
+        drawn = []
+        for stroke in ordered:
+            self.select_color(stroke.get('color'))
+            stroke_moves, stats = self.draw_stroke(stroke['points'])
+            moves += stroke_moves
+            points_in += stats['points_in']
+            drawn.append(stroke.get('label', 'stroke'))
+
+        seconds = time.perf_counter() - started
+        return {
+            'strokes': len(drawn),
+            'drawn': drawn,
+            'points_in': points_in,
+            'moves': moves,
+            'color_switches': self.color_switches - switches_at_start,
+            'switches_unscheduled': plan['switches_before'],
+            'stream_delay': self.stream_delay,
+            'seconds': seconds,
+            'moves_per_sec': moves / seconds if seconds > 0 else 0.0,
+        }
+
+
+def describe(stats):
+    """One-line summary of an execute() result"""
+    return (f"🖌️ Drew {stats['strokes']} strokes with {stats['moves']} moves "
+            f"({stats['points_in']} points before optimizing), {stats['color_switches']} color switches "
+            f"(unscheduled: {stats['switches_unscheduled']}), "
+            f"{stats['seconds']:.2f}s ({stats['moves_per_sec']:.0f} moves/s)")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Stroke Optimizer - Fewer mouse moves for the same drawing
+Resamples each stroke with spacing that follows its curvature, then runs
+Ramer-Douglas-Peucker so straight runs collapse into a single move. Both
+stages work to a pixel tolerance and report points in/out and the drawing
+time saved at the per-move delay.
+"""
+
+import numpy as np
+
+# Maximum distance (in pixels) the optimized stroke may stray from the original
+DEFAULT_TOLERANCE = 1.0
+# Turns sharper than this are corners and always keep their vertex
+CORNER_ANGLE = 30.0
+# Sleep the drawing tools use after each mouse_move
+MOVE_DELAY = 0.05
+
+
+def simplify(points, tolerance=DEFAULT_TOLERANCE):
+    """Ramer-Douglas-Peucker simplification of an (N, 2) polyline"""
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return points.copy()
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        chord = points[last] - points[first]
+        offsets = points[first + 1:last] - points[first]
+        length = np.hypot(*chord)
+        if length == 0:
+            # Closed stroke: measure from the shared endpoint
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / length
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.extend([(first, split), (split, last)])
+
+    return points[keep]
+
+
+def resample(points, tolerance=DEFAULT_TOLERANCE, corner_angle=CORNER_ANGLE):
+    """Resample a polyline with spacing sqrt(8 * r * tolerance) for local curvature radius r
+
+    That spacing keeps the chord within tolerance of an arc of radius r, so
+    gentle curves get few points, tight curves get many and straight runs
+    need none. Corner vertices are kept as they are.
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3:
+        return points.copy()
+
+    # Drop repeated points so every segment has a direction
+    steps = np.diff(points, axis=0)
+    moving = np.hypot(steps[:, 0], steps[:, 1]) > 1e-9
+    points = np.vstack([points[:1], points[1:][moving]])
+    if len(points) < 3:
+        return points
+
+    steps = np.diff(points, axis=0)
+    lengths = np.hypot(steps[:, 0], steps[:, 1])
+    headings = np.arctan2(steps[:, 1], steps[:, 0])
+    turns = np.abs((np.diff(headings) + np.pi) % (2 * np.pi) - np.pi)
+    corners = turns > np.radians(corner_angle)
+
+    # Curvature at interior vertices; corners are kept explicitly instead
+    curvature = np.where(corners, 0.0, turns / ((lengths[:-1] + lengths[1:]) / 2))
+    vertex_curvature = np.concatenate([[0.0], curvature, [0.0]])
+    segment_curvature = np.maximum(vertex_curvature[:-1], vertex_curvature[1:])
+
+    # Number of samples each segment needs, accumulated along the arc length
+    spacing = np.sqrt(8 * tolerance / np.maximum(segment_curvature, 1e-12))
+    arc = np.concatenate([[0.0], np.cumsum(lengths)])
+    budget = np.concatenate([[0.0], np.cumsum(lengths / spacing)])
+
+    samples = np.interp(np.linspace(0, budget[-1], int(np.ceil(budget[-1])) + 1), budget, arc)
+    samples = np.unique(np.concatenate([samples, arc[1:-1][corners], [0.0, arc[-1]]]))
+    return np.column_stack([np.interp(samples, arc, points[:, 0]), np.interp(samples, arc, points[:, 1])])
+
+
+def to_pixels(points):
+    """Round to integer pixels and drop moves that would land on the same pixel"""
+    pixels = np.rint(np.asarray(points, dtype=float)).astype(int)
+    if len(pixels) < 2:
+        return pixels
+    changed = np.any(pixels[1:] != pixels[:-1], axis=1)
+    return np.vstack([pixels[:1], pixels[1:][changed]])
+
+
+def optimize_stroke(points, tolerance=DEFAULT_TOLERANCE, move_delay=MOVE_DELAY):
+    """Resample, simplify and round a stroke; returns (pixel points, stats)"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    # Split the error budget between the two stages
+    optimized = to_pixels(simplify(resample(points, tolerance / 2), tolerance / 2))
+
+    stats = {
+        'points_in': len(points),
+        'points_out': len(optimized),
+        'time_saved': max(len(points) - len(optimized), 0) * move_delay,
+    }
+    return optimized, stats
+
+
+def describe(stats):
+    """One-line summary of an optimize_stroke() result"""
+    return (f"✂️ Stroke optimized: {stats['points_in']} → {stats['points_out']} points, "
+            f"~{stats['time_saved']:.2f}s saved")
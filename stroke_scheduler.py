@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Stroke Scheduler - Reorder strokes to minimize palette color switches
+Strokes whose bounding boxes overlap keep their z-order (lower layer first,
+then original order) when their colors differ; everything else is free to
+move so that strokes of the same color are drawn back to back. Uncolored
+strokes are given the color they would inherit in the original order.
+"""
+
+import numpy as np
+
+# Extra pixels around a stroke's bounding box to account for brush width
+BRUSH_MARGIN = 3
+
+
+def bounding_box(points, margin=BRUSH_MARGIN):
+    """(min_x, min_y, max_x, max_y) of a stroke, grown by margin"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    low = points.min(axis=0) - margin
+    high = points.max(axis=0) + margin
+    return low[0], low[1], high[0], high[1]
+
+
+def boxes_overlap(a, b):
+    """True when two bounding boxes intersect"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def count_switches(strokes):
+    """Palette clicks needed to draw strokes in the given order (uncolored strokes need none)"""
+    switches = 0
+    current = None
+    for stroke in strokes:
+        color = stroke.get('color')
+        if color and color != current:
+            switches += 1
+            current = color
+    return switches
+
+
+def inherited_colors(strokes):
+    """Color each stroke is drawn in when drawn in the given order
+
+    Uncolored strokes take the last color picked before them; None means
+    whatever palette color was active before the first pick.
+    """
+    colors = []
+    current = None
+    for stroke in strokes:
+        current = stroke.get('color') or current
+        colors.append(current)
+    return colors
+
+
+def dependencies(strokes, margin=BRUSH_MARGIN):
+    """Map each stroke index to the indexes that must be drawn before it"""
+    boxes = [bounding_box(stroke['points'], margin) for stroke in strokes]
+    colors = inherited_colors(strokes)
+    order = [(stroke.get('layer', 0), index) for index, stroke in enumerate(strokes)]
+    before = {index: set() for index in range(len(strokes))}
+
+    for i in range(len(strokes)):
+        for j in range(i + 1, len(strokes)):
+            color_i, color_j = colors[i], colors[j]
+            # Same-color overlaps look identical in either order
+            if color_i and color_i == color_j:
+                continue
+            if not boxes_overlap(boxes[i], boxes[j]):
+                continue
+            first, second = (i, j) if order[i] < order[j] else (j, i)
+            before[second].add(first)
+    return before
+
+
+def schedule(strokes, margin=BRUSH_MARGIN):
+    """Return strokes reordered to minimize color switches while keeping z-order
+
+    Greedy: keep drawing the current color while any of its strokes are
+    unblocked; otherwise switch to the color with the most unblocked strokes.
+    Uncolored strokes never force a switch but are scheduled with the color
+    they inherit in input order and returned carrying that color, so they
+    are drawn in it wherever they end up.
+    """
+    before = dependencies(strokes, margin)
+    colors = inherited_colors(strokes)
+    remaining = set(range(len(strokes)))
+    done = set()
+    ordered = []
+    current = None
+
+    while remaining:
+        ready = sorted(index for index in remaining if before[index] <= done)
+        same = [index for index in ready if colors[index] == current]
+
+        if same:
+            pick = same[0]
+        else:
+            counts = {}
+            for index in ready:
+                counts[colors[index]] = counts.get(colors[index], 0) + 1
+            # Ties go to the color that appears first in the original order
+            current = max(counts, key=counts.get)
+            pick = next(index for index in ready if colors[index] == current)
+
+        stroke = strokes[pick]
+        if not stroke.get('color') and colors[pick]:
+            stroke = dict(stroke, color=colors[pick])
+        ordered.append(stroke)
+        remaining.discard(pick)
+        done.add(pick)
+
+    return ordered
+
+
+def schedule_report(strokes, margin=BRUSH_MARGIN):
+    """Schedule strokes and report how many color switches that saves"""
+    ordered = schedule(strokes, margin)
+    return ordered, {
+        'strokes': len(strokes),
+        'switches_before': count_switches(strokes),
+        'switches_after': count_switches(ordered),
+    }
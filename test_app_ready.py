@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+App readiness test script
+Tests await_app_ready polling against the fake desktop backend (no Windows needed)
+"""
+
+import asyncio
+import sys
+import time
+
+from app_ready import await_app_ready, open_and_wait, open_and_wait_sync
+from fake_desktop import FakeDesktop, fake_notepad
+
+
+class SlowFakeDesktop(FakeDesktop):
+    """Fake desktop whose windows only show up after a few readiness probes"""
+
+    def __init__(self, apps, probes_until_ready):
+        super().__init__(apps)
+        self.probes_until_ready = probes_until_ready
+        self.pending = []
+
+    def open_application(self, app_name):
+        window = self.apps[app_name]()
+        window.app_name = app_name
+        window.desktop = self
+        self.pending.append(window)
+        return window
+
+    def find(self, selectors, root=None):
+        self.probes_until_ready -= 1
+        if self.probes_until_ready <= 0 and self.pending:
+            self.windows.extend(self.pending)
+            self.pending = []
+        if root is not None and root in self.pending:
+            raise RuntimeError("Window not ready yet")
+        return super().find(selectors, root=root)
+
+
+def test_ready_as_soon_as_probe_appears():
+    """The wait returns right after the probe element becomes interactive"""
+    desktop = SlowFakeDesktop({'notepad': fake_notepad}, probes_until_ready=4)
+    desktop.open_application('notepad')
+
+    started = time.monotonic()
+    ready = asyncio.run(await_app_ready('notepad', timeout=5, desktop=desktop))
+    elapsed = time.monotonic() - started
+
+    assert ready
+    assert elapsed < 1.0, f"waited {elapsed:.2f}s"
+    print(f"✓ Ready after {elapsed:.2f}s instead of a fixed 2s sleep")
+
+
+def test_timeout_returns_false():
+    """A probe that never appears gives up after the timeout"""
+    desktop = FakeDesktop({})
+
+    started = time.monotonic()
+    ready = asyncio.run(await_app_ready('notepad', timeout=0.3, desktop=desktop))
+    elapsed = time.monotonic() - started
+
+    assert not ready
+    assert elapsed < 0.6, f"overshot timeout: {elapsed:.2f}s"
+    print(f"✓ Gave up after {elapsed:.2f}s")
+
+
+def test_sync_open_and_wait():
+    """The blocking variant opens the app and waits for it"""
+    desktop = SlowFakeDesktop({'notepad': fake_notepad}, probes_until_ready=2)
+    assert open_and_wait_sync(desktop, 'notepad', timeout=5)
+    print("✓ open_and_wait_sync() works for synchronous tools")
+
+
+def test_old_window_does_not_count():
+    """A Notepad left open earlier does not satisfy the probe for the new one"""
+    desktop = SlowFakeDesktop({'notepad': fake_notepad}, probes_until_ready=6)
+    desktop.windows.append(fake_notepad())
+
+    ready = asyncio.run(open_and_wait(desktop, 'notepad', timeout=5))
+
+    assert ready and desktop.probes_until_ready <= 0, "returned before the new window was ready"
+    print(f"✓ Waited for the new window despite an older one ({6 - desktop.probes_until_ready} probes)")
+
+
+if __name__ == "__main__":
+    print("=== App Readiness Test ===\n")
+
+    tests = [
+        ("Ready as soon as probe appears", test_ready_as_soon_as_probe_appears),
+        ("Timeout", test_timeout_returns_false),
+        ("Sync open and wait", test_sync_open_and_wait),
+        ("Old window does not count", test_old_window_does_not_count),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Calculator engine test script
+Tests expression compilation, button replay and the keyboard fast path
+against the fake desktop backend (no Windows needed)
+"""
+
+import asyncio
+import sys
+
+from calculator_engine import (KEYBOARD_MISMATCH_LIMIT, CalculatorEngine, compile_expression, compile_keystrokes,
+                               evaluate, evaluate_immediate)
+from fake_desktop import FakeDesktop, fake_calculator
+
+
+def open_fake_calculator(keyboard=True, immediate=False, **options):
+    """Open a fake Calculator and bind an engine to it"""
+    fake = FakeDesktop({'calc': lambda: fake_calculator(keyboard=keyboard, immediate=immediate)})
+    fake.open_application('calc')
+    engine = CalculatorEngine(fake, action_delay=0, settle_delay=0, verify_timeout=0.05, **options)
+    return fake, engine
+
+
+def test_compile_expression():
+    """Expressions compile to button plans and key sequences"""
+    plan = compile_expression("12 x 3")
+    assert plan == ['automationid:num1Button', 'automationid:num2Button', 'name:Multiply by',
+                    'automationid:num3Button', 'name:Equals']
+    assert compile_keystrokes("100-(25+15)") == "100-(25+15)="
+    assert compile_keystrokes("7=", equals=True) == "7="
+    assert evaluate("3.5*2") == 7.0 and evaluate("abc") is None
+    assert evaluate("2+3*4") == 14 and evaluate_immediate("2+3*4") == 20
+    print("✓ Plans, keystrokes and local evaluation compiled correctly")
+
+
+def test_buttons_resolved_once():
+    """Button mode resolves each distinct button only once per session"""
+    fake, engine = open_fake_calculator(input_mode='buttons')
+
+    for expression in ["123+456", "789-321", "12*34"]:
+        result = engine.calculate(expression, read_result=True)
+        assert result['success'] and result['mode'] == 'buttons'
+
+    assert result['display'] == 'Display is 408'
+    distinct = {s for e in ["123+456", "789-321", "12*34"] for s in compile_expression(e)}
+    assert fake.searches <= len(distinct) + 2, f"{fake.searches} tree walks"
+    print(f"✓ 3 expressions in button mode cost {fake.searches} tree walks")
+
+
+def test_keyboard_fast_path():
+    """Keyboard mode types the whole expression in a single action"""
+    fake, engine = open_fake_calculator()
+    result = engine.calculate("100-(25+15)", read_result=True)
+
+    assert result['mode'] == 'keyboard' and result['clicks'] == 1
+    assert result['display'] == 'Display is 60'
+    print(f"✓ Keyboard path: {result['display']} in {result['latency'] * 1000:.1f}ms")
+
+
+def test_keyboard_fallback_to_buttons():
+    """Rejected keyboard input falls back to clicks and stays off for the session"""
+    fake, engine = open_fake_calculator(keyboard=False)
+    first = asyncio.run(engine.calculate_async("15*7", read_result=True))
+    second = engine.calculate("2+2", read_result=True)
+
+    assert first['mode'] == 'buttons' and first['display'] == 'Display is 105'
+    assert second['mode'] == 'buttons' and engine.keyboard_rejected
+    print("✓ Fell back to buttons after keyboard input was rejected")
+
+
+def test_partial_keyboard_input_cleared():
+    """A typed attempt that dropped keys is cleared before the buttons run; repeated ones turn typing off"""
+    fake, engine = open_fake_calculator()
+    window = fake.windows[-1]
+    typed = window.on_type
+    # Only the first key arrives, which still changes the display
+    window.on_type = lambda text: typed(text[:1])
+
+    result = engine.calculate("12+3", clear=False, read_result=True)
+
+    assert result['mode'] == 'buttons' and engine.use_keyboard()
+    assert result['display'] == 'Display is 15'
+    for _ in range(KEYBOARD_MISMATCH_LIMIT - 1):
+        engine.calculate("12+3")
+    assert engine.keyboard_rejected
+    print("✓ Partial keyboard input rejected and cleared before the button fallback")
+
+
+def test_standard_mode_order():
+    """Standard mode's left-to-right result is a valid typed entry, not a rejection"""
+    fake, engine = open_fake_calculator(immediate=True)
+
+    result = engine.calculate("2+3*4", read_result=True)
+
+    assert result['mode'] == 'keyboard' and result['display'] == 'Display is 20'
+    assert engine.use_keyboard()
+    print("✓ 2+3*4 typed into Standard mode accepted as 20")
+
+
+if __name__ == "__main__":
+    print("=== Calculator Engine Test ===\n")
+
+    tests = [
+        ("Compile expression", test_compile_expression),
+        ("Buttons resolved once", test_buttons_resolved_once),
+        ("Keyboard fast path", test_keyboard_fast_path),
+        ("Keyboard fallback", test_keyboard_fallback_to_buttons),
+        ("Partial keyboard input", test_partial_keyboard_input_cleared),
+        ("Standard mode order", test_standard_mode_order),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Canvas capture pipeline test script
+Crops and downscales synthetic screenshots (no Windows needed)
+"""
+
+import sys
+from io import BytesIO
+
+from PIL import Image
+
+from canvas_capture import canvas_bounds, process_capture, vision_profile
+from fake_desktop import FakeDesktop, fake_paint
+
+
+class FakeScreenshot:
+    """Mimics terminator's ScreenshotResult"""
+
+    def __init__(self, image_data, width=None, height=None):
+        self.image_data = image_data
+        self.width = width
+        self.height = height
+
+
+def raw_screen(width=1920, height=1080):
+    """Raw RGBA screen with a red square inside the canvas area"""
+    image = Image.new('RGBA', (width, height), (240, 240, 240, 255))
+    image.paste((255, 0, 0, 255), (400, 400, 500, 500))
+    return FakeScreenshot(image.tobytes(), width, height)
+
+
+def test_crop_to_canvas_bounds():
+    """The capture is cropped to the canvas found through get_bounds()"""
+    desktop = FakeDesktop({'mspaint': fake_paint})
+    desktop.open_application('mspaint')
+    bounds = canvas_bounds(desktop)
+    data, meta = process_capture(raw_screen(), bounds, model='gemma3:4b-it-q4_K_M')
+    image = Image.open(BytesIO(data))
+
+    assert bounds == (5, 150, 1000, 600)
+    assert image.size == (896, 537) and meta['source_size'] == (1920, 1080)
+    # Screen pixel (450, 450) is inside the red square; map it into the scaled crop
+    assert image.getpixel((int((450 - 5) * 0.896), int((450 - 150) * 0.896)))[:3] == (255, 0, 0)
+    print(f"✓ 1920x1080 screen → {image.size[0]}x{image.size[1]} canvas, {len(data)} bytes")
+
+
+def test_per_model_profiles():
+    """Each model gets its own resolution; overrides win"""
+    assert vision_profile('llava:7b')['max_side'] == 672
+    assert vision_profile('unknown-model')['max_side'] == 1024
+    data, meta = process_capture(raw_screen(), None, model='llava:7b', max_side=320, format='JPEG')
+
+    assert meta['format'] == 'jpeg' and max(meta['width'], meta['height']) == 320
+    assert Image.open(BytesIO(data)).format == 'JPEG'
+    print(f"✓ Override produced a {meta['width']}x{meta['height']} JPEG")
+
+
+def test_encoded_screenshots_supported():
+    """PNG-encoded screenshot data is decoded too"""
+    buffer = BytesIO()
+    Image.new('RGB', (800, 600), 'white').save(buffer, format='PNG')
+    data, meta = process_capture(FakeScreenshot(buffer.getvalue()), (100, 100, 200, 100))
+
+    assert (meta['width'], meta['height']) == (200, 100)
+    print("✓ Encoded screenshot cropped to 200x100")
+
+
+if __name__ == "__main__":
+    print("=== Canvas Capture Test ===\n")
+
+    tests = [
+        ("Canvas crop", test_crop_to_canvas_bounds),
+        ("Model profiles", test_per_model_profiles),
+        ("Encoded screenshots", test_encoded_screenshots_supported),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -8,6 +8,8 @@ import terminator
 import time
 from datetime import datetime
 
+from app_ready import open_and_wait
+
 async def test_capture_functionality():
     """Test if we can capture screenshots from Paint"""
     print("📸 TESTING TERMINATOR CAPTURE FUNCTIONALITY")
@@ -17,8 +19,7 @@ async def test_capture_functionality():
         # Open Paint
         print("1. Opening MS Paint...")
         desktop = terminator.Desktop()
-        desktop.open_application('mspaint')
-        await asyncio.sleep(3)
+        await open_and_wait(desktop, 'mspaint')
         
         # Draw something simple first
         print("2. Drawing a simple shape...")
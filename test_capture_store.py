@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Capture store test script
+Tests the in-memory screenshot ring buffer (no Windows needed)
+"""
+
+import os
+import sys
+import tempfile
+
+from capture_store import CaptureStore
+
+
+def test_handles_are_zero_copy():
+    """get() returns a view over the stored buffer, not a copy"""
+    store = CaptureStore()
+    data = bytes(range(256)) * 100
+    handle = store.put(data, width=80, height=80)
+    view = store.get(handle)
+
+    assert isinstance(view, memoryview) and view.obj is data
+    assert store.latest() == handle and store.meta(handle)['width'] == 80
+    print(f"✓ Capture #{handle} served as a {len(view)}-byte memoryview")
+
+
+def test_eviction_by_count_and_bytes():
+    """Oldest captures go first once either limit is exceeded"""
+    store = CaptureStore(max_items=3, max_bytes=2500)
+    handles = [store.put(b'x' * 1000) for _ in range(4)]
+
+    assert store.get(handles[0]) is None and store.get(handles[1]) is None
+    assert store.stats()['captures'] == 2 and store.stats()['bytes'] == 2000
+
+    # A single oversized capture is still kept as the latest
+    big = store.put(b'y' * 5000)
+    assert store.latest() == big and store.stats()['captures'] == 1
+    print(f"✓ Evicted {store.stats()['evictions']} captures to stay within limits")
+
+
+def test_spill_to_disk():
+    """Evicted captures stay readable when a spill directory is configured"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CaptureStore(max_items=1, spill_dir=tmp)
+        first = store.put(b'first capture')
+        store.put(b'second capture')
+
+        assert bytes(store.get(first)) == b'first capture'
+        assert len(os.listdir(tmp)) == 1
+    print("✓ Spilled capture read back from disk")
+
+
+if __name__ == "__main__":
+    print("=== Capture Store Test ===\n")
+
+    tests = [
+        ("Zero-copy handles", test_handles_are_zero_copy),
+        ("Eviction", test_eviction_by_count_and_bytes),
+        ("Spill to disk", test_spill_to_disk),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
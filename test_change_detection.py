@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Change detection test script
+Diffs synthetic canvas captures (no Windows needed)
+"""
+
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from change_detection import ChangeDetector, crop_region, hamming, load_image, perceptual_hash
+
+
+def canvas(*circles):
+    """Encoded white canvas with black circles at (x, y, r)"""
+    image = Image.new('RGB', (896, 537), 'white')
+    draw = ImageDraw.Draw(image)
+    for x, y, r in circles:
+        draw.ellipse((x - r, y - r, x + r, y + r), outline='black', width=3)
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return memoryview(buffer.getvalue())
+
+
+def test_unchanged_canvas_reuses_analysis():
+    """An identical capture reuses the stored analysis"""
+    detector = ChangeDetector()
+    first = canvas((200, 200, 40))
+    assert detector.compare(first)['changed']
+    detector.remember(1, first, "A circle on the left")
+
+    change = detector.compare(canvas((200, 200, 40)))
+    assert not change['changed'] and change['distance'] == 0
+    assert detector.reuse() == "A circle on the left" and detector.skipped == 1
+    print("✓ Unchanged canvas skipped the vision call")
+
+
+def test_changed_region_reported():
+    """A new shape shows up as one bounding box around it"""
+    detector = ChangeDetector()
+    detector.remember(1, canvas((200, 200, 40)), "A circle")
+    change = detector.compare(canvas((200, 200, 40), (600, 300, 30)))
+
+    assert change['changed'] and len(change['boxes']) == 1
+    x, y, width, height = change['region']
+    assert x <= 570 and y <= 270 and x + width >= 630 and y + height >= 330
+    assert width * height < 0.05 * 896 * 537
+
+    crop = load_image(crop_region(canvas((600, 300, 30)), change['region']))
+    assert crop.size[0] < 200 and crop.size[1] < 200
+    print(f"✓ Changed region {change['region']} ({change['changed_fraction']:.2%} of pixels)")
+
+
+def test_region_analysis_kept_with_frame():
+    """A region-only answer is stored together with the analysis of the rest of the frame"""
+    detector = ChangeDetector()
+    detector.remember(1, canvas((200, 200, 40)), "A circle")
+    updated = canvas((200, 200, 40), (600, 300, 30))
+    region = detector.compare(updated)['region']
+    detector.remember(2, updated, "A second circle", region=region)
+
+    assert not detector.compare(updated)['changed']
+    analysis = detector.reuse()
+    assert analysis.startswith("A circle") and analysis.endswith("A second circle")
+    print("✓ Region answer merged with the full-frame analysis")
+
+
+def test_perceptual_hash_tolerates_rescaling():
+    """The same canvas at another resolution hashes (nearly) the same"""
+    image = load_image(canvas((300, 250, 120), (600, 250, 120)))
+    small = image.resize((448, 268))
+
+    assert hamming(perceptual_hash(image), perceptual_hash(small)) <= 2
+    print("✓ Hash stable across downscaling")
+
+
+if __name__ == "__main__":
+    print("=== Change Detection Test ===\n")
+
+    tests = [
+        ("Unchanged canvas", test_unchanged_canvas_reuses_analysis),
+        ("Region analysis merged", test_region_analysis_kept_with_frame),
+        ("Changed region", test_changed_region_reported),
+        ("Perceptual hash", test_perceptual_hash_tolerates_rescaling),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -6,10 +6,15 @@ Live demonstration of the latest DeepSeek-R1 model capabilities
 
 import asyncio
 import terminator
-import ollama
 import time
 import re
 
+from app_ready import open_and_wait
+from calculator_engine import calculator_for
+from llm_client import achat
+from model_manager import DEFAULT_KEEP_ALIVE, warm_up
+from text_entry import write_text
+
 async def test_deepseek_r1():
     """Test DeepSeek-R1:1.5b with comprehensive desktop automation"""
     
@@ -20,6 +25,8 @@ async def test_deepseek_r1():
     
     desktop = terminator.Desktop()
     model_name = "deepseek-r1:1.5b"
+    # Load the model with a keep-alive so it stays resident between the tests
+    warm_up(model_name)
     
     # Test 1: Creative Writing with AI reasoning
     print("\n🎨 TEST 1: Creative Writing + AI Reasoning")
@@ -30,9 +37,9 @@ async def test_deepseek_r1():
     prompt = """Write a short, creative story (max 150 words) about an AI assistant that discovers it can automate desktop applications like Calculator and Notepad. Make it fun and imaginative, and include what the AI learns from this experience."""
     
     try:
-        response = ollama.chat(model=model_name, messages=[
+        response = await achat(model=model_name, messages=[
             {'role': 'user', 'content': prompt}
-        ])
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
         
         response_time = time.time() - start_time
         content = response['message']['content']
@@ -46,8 +53,7 @@ async def test_deepseek_r1():
         
         # Automate Notepad to display the story
         print("\n📝 Automating Notepad to display the AI story...")
-        desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(desktop, 'notepad')
         
         editor = desktop.locator('name:Edit')
         
@@ -64,7 +70,7 @@ Generated by DeepSeek-R1:1.5b model
 Test conducted: {time.strftime('%Y-%m-%d %H:%M:%S')}
 """
         
-        editor.type_text(document)
+        write_text(editor, document)
         print("✅ Story successfully typed in Notepad!")
         
     except Exception as e:
@@ -86,9 +92,9 @@ Test conducted: {time.strftime('%Y-%m-%d %H:%M:%S')}
 
 Make them varied and interesting but suitable for a basic calculator."""
         
-        math_response = ollama.chat(model=model_name, messages=[
+        math_response = await achat(model=model_name, messages=[
             {'role': 'user', 'content': math_prompt}
-        ])
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
         
         math_time = time.time() - start_time
         math_content = math_response['message']['content']
@@ -101,46 +107,15 @@ Make them varied and interesting but suitable for a basic calculator."""
         
         if expressions:
             print("\n🔢 Automating Calculator to solve AI-generated problems...")
-            desktop.open_application('calc')
-            await asyncio.sleep(2)
+            await open_and_wait(desktop, 'calc')
             
             for i, expr in enumerate(expressions[:2], 1):  # Test first 2 expressions
                 print(f"\n  Problem {i}: {expr}")
                 
-                # Clear calculator
-                try:
-                    clear_btn = desktop.locator('name:Clear')
-                    clear_btn.click()
-                    await asyncio.sleep(0.3)
-                except:
-                    pass
-                
-                # Input the expression
-                for char in expr:
-                    if char.isdigit():
-                        btn = desktop.locator(f'name:{char}')
-                        btn.click()
-                    elif char == '+':
-                        btn = desktop.locator('name:Plus')
-                        btn.click()
-                    elif char == '-':
-                        btn = desktop.locator('name:Minus')
-                        btn.click()
-                    elif char == '*':
-                        btn = desktop.locator('name:Multiply by')
-                        btn.click()
-                    elif char == '/':
-                        btn = desktop.locator('name:Divide by')
-                        btn.click()
-                    
-                    await asyncio.sleep(0.2)
-                
-                # Get result
-                equals_btn = desktop.locator('name:Equals')
-                equals_btn.click()
-                await asyncio.sleep(0.8)
+                # Clear, enter the expression and get the result
+                result = await calculator_for(desktop).calculate_async(expr)
                 
-                print(f"  ✅ Solved: {expr}")
+                print(f"  ✅ Solved: {expr} ({result['latency']:.2f}s)")
             
             print("✅ Calculator automation completed!")
             
@@ -164,9 +139,9 @@ Step 3: [specific action]
 
 Be creative but practical - what would be a useful workflow?"""
         
-        workflow_response = ollama.chat(model=model_name, messages=[
+        workflow_response = await achat(model=model_name, messages=[
             {'role': 'user', 'content': workflow_prompt}
-        ])
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
         
         workflow_time = time.time() - start_time
         workflow_content = workflow_response['message']['content']
@@ -196,9 +171,9 @@ Be creative but practical - what would be a useful workflow?"""
     try:
         summary_prompt = f"""Based on the tests we just conducted, write a brief summary (max 100 words) of how well the DeepSeek-R1:1.5b model performed in generating content for desktop automation. Be honest about the strengths and any limitations observed."""
         
-        summary_response = ollama.chat(model=model_name, messages=[
+        summary_response = await achat(model=model_name, messages=[
             {'role': 'user', 'content': summary_prompt}
-        ])
+        ], keep_alive=DEFAULT_KEEP_ALIVE)
         
         summary_content = summary_response['message']['content']
         
@@ -209,8 +184,7 @@ Be creative but practical - what would be a useful workflow?"""
         
         # Create final report in new Notepad window
         print("\n📝 Creating comprehensive test report...")
-        desktop.open_application('notepad')
-        await asyncio.sleep(2)
+        await open_and_wait(desktop, 'notepad')
         
         editor = desktop.locator('name:Edit')
         
@@ -253,7 +227,7 @@ suitable for automated workflows.
 This report was generated entirely through AI + automation! 🚀
 """
         
-        editor.type_text(final_report)
+        write_text(editor, final_report)
         print("✅ Comprehensive report created!")
         
     except Exception as e:
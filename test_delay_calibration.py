@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Delay calibration test script
+Tests latency profiles, p95 delays and re-calibration (no Windows needed)
+"""
+
+import os
+import sys
+import tempfile
+
+from calculator_engine import CalculatorEngine
+from delay_calibration import DelayCalibrator
+from fake_desktop import FakeDesktop, fake_calculator
+
+
+def temp_profile():
+    """Path for a throwaway latency profile"""
+    return os.path.join(tempfile.mkdtemp(), "latency_profile.json")
+
+
+def test_p95_replaces_default_and_persists():
+    """Once calibrated the learned p95 is used, and it survives a reload"""
+    path = temp_profile()
+    calibrator = DelayCalibrator(path, min_samples=5)
+
+    assert calibrator.delay('calc', 'click', 0.2) == 0.2
+    for sample in [0.010, 0.012, 0.011, 0.013, 0.050]:
+        calibrator.record_sample('calc', 'click', sample)
+    calibrator.save()
+
+    reloaded = DelayCalibrator(path, min_samples=5)
+    assert reloaded.delay('calc', 'click', 0.2) == 0.050
+    print(f"✓ Learned p95 {reloaded.delay('calc', 'click', 0.2):.3f}s replaces the 0.2s guess")
+
+
+def test_failures_trigger_recalibration():
+    """A burst of failures throws away the learned samples"""
+    calibrator = DelayCalibrator(temp_profile(), min_samples=3)
+    for _ in range(3):
+        calibrator.record_sample('mspaint', 'mouse_move', 0.01)
+    assert not calibrator.needs_calibration('mspaint', 'mouse_move')
+
+    for _ in range(3):
+        calibrator.record_outcome('mspaint', 'mouse_move', False)
+
+    assert calibrator.needs_calibration('mspaint', 'mouse_move')
+    print("✓ Rising failure rate forces re-calibration")
+
+
+def test_engine_calibrates_button_clicks():
+    """The calculator engine measures clicks and then uses the measured delays"""
+    path = temp_profile()
+    fake = FakeDesktop({'calc': fake_calculator})
+    fake.open_application('calc')
+    calibrator = DelayCalibrator(path, min_samples=3)
+    engine = CalculatorEngine(fake, input_mode='buttons', calibrator=calibrator)
+
+    first = engine.calculate("123+456", read_result=True)
+    second = engine.calculate("789-321", read_result=True)
+
+    assert first['display'] == 'Display is 579' and second['display'] == 'Display is 468'
+    assert not calibrator.needs_calibration('calc', 'click')
+    assert calibrator.delay('calc', 'click', 0.05) < 0.05
+    assert os.path.exists(path)
+    print(f"✓ Click delay calibrated to {calibrator.delay('calc', 'click', 0.05) * 1000:.2f}ms "
+          f"(guess was 50ms)")
+
+
+if __name__ == "__main__":
+    print("=== Delay Calibration Test ===\n")
+
+    tests = [
+        ("p95 delays", test_p95_replaces_default_and_persists),
+        ("Re-calibration", test_failures_trigger_recalibration),
+        ("Engine calibration", test_engine_calibrates_button_clicks),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Element cache test script
+Tests CachedDesktop against the fake desktop backend (no Windows needed)
+"""
+
+import sys
+
+from element_cache import CachedDesktop
+from fake_desktop import FakeDesktop, fake_calculator, fake_notepad
+
+
+def make_desktop():
+    """Fake desktop with Calculator and Notepad available"""
+    return FakeDesktop({'calc': fake_calculator, 'notepad': fake_notepad})
+
+
+def test_repeated_lookups_hit_cache():
+    """Repeated lookups of the same selector only walk the tree once"""
+    fake = make_desktop()
+    fake.open_application('calc')
+    desktop = CachedDesktop(fake)
+
+    for _ in range(5):
+        desktop.locator('name:Equals').click()
+
+    stats = desktop.stats()
+    assert fake.searches == 1, f"expected 1 tree walk, got {fake.searches}"
+    assert stats['hits'] == 4 and stats['misses'] == 1
+    print(f"✓ 5 lookups, {fake.searches} tree walk, hit rate {stats['hit_rate']:.0%}")
+
+
+def test_window_scoped_keys():
+    """The same selector in different windows is cached separately"""
+    fake = make_desktop()
+    fake.open_application('calc')
+    fake.open_application('notepad')
+    desktop = CachedDesktop(fake)
+
+    calc_clear = desktop.locator('name:Clear', window='window:Calculator')
+    editor = desktop.locator('name:Edit', window='window:Notepad')
+
+    assert calc_clear is not editor
+    assert desktop.locator('name:Edit', window='window:Notepad') is editor
+    print("✓ (window, selector) keys are independent")
+
+
+def test_stale_handles_are_revalidated():
+    """Handles that stop responding are evicted and looked up again"""
+    fake = make_desktop()
+    fake.open_application('calc')
+    desktop = CachedDesktop(fake, validate_after=0)
+
+    first = desktop.locator('name:Plus')
+    fake.close_window('Calculator')
+    fake.open_application('calc')
+    second = desktop.locator('name:Plus')
+
+    assert second is not first
+    assert desktop.stats()['stale'] == 1
+    print("✓ Stale handle re-resolved")
+
+
+def test_window_close_evicts_children():
+    """Closing a window drops every cached handle that belongs to it"""
+    fake = make_desktop()
+    fake.open_application('calc')
+    fake.open_application('notepad')
+    desktop = CachedDesktop(fake, validate_after=0)
+
+    desktop.locator('name:Seven', window='window:Calculator')
+    desktop.locator('name:Equals', window='window:Calculator')
+    desktop.locator('name:Edit', window='window:Notepad')
+
+    fake.close_window('Calculator')
+    fake.open_application('calc')
+    desktop.locator('name:Seven', window='window:Calculator')
+
+    windows = {window for window, _ in desktop.entries}
+    assert ('window:Calculator', 'name:Equals') not in desktop.entries
+    assert 'window:Notepad' in windows
+    print(f"✓ Closed window evicted ({desktop.stats()['evictions']} evictions)")
+
+
+def test_open_application_resets_cache():
+    """Opening an application invalidates handles that a new window could shadow"""
+    fake = make_desktop()
+    desktop = CachedDesktop(fake)
+    desktop.open_application('notepad')
+    old_editor = desktop.locator('name:Edit')
+
+    desktop.open_application('notepad')
+    new_editor = desktop.locator('name:Edit')
+
+    assert new_editor is not old_editor
+    print("✓ open_application() starts with a fresh cache")
+
+
+if __name__ == "__main__":
+    print("=== Element Cache Test ===\n")
+
+    tests = [
+        ("Repeated lookups", test_repeated_lookups_hit_cache),
+        ("Window-scoped keys", test_window_scoped_keys),
+        ("Stale handles", test_stale_handles_are_revalidated),
+        ("Window close eviction", test_window_close_evicts_children),
+        ("open_application reset", test_open_application_resets_cache),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+LLM benchmark test script
+Runs the concurrent benchmark against a local stub of the Ollama API
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_benchmark import BenchmarkRunner, format_report, percentile, timed_chat
+
+TOKEN_DELAY = 0.02
+FIRST_TOKEN_DELAY = 0.05
+PROMPTS = {'creative_writing': "Write a story", 'math_generation': "Give 3 problems"}
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Streams /api/chat like Ollama: content chunks, then a done line with eval stats"""
+
+    lock = threading.Lock()
+    active = {}
+    peak_total = 0
+    peak_models = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        model = body['model']
+        cls = type(self)
+        with cls.lock:
+            cls.active[model] = cls.active.get(model, 0) + 1
+            cls.peak_total = max(cls.peak_total, sum(cls.active.values()))
+            cls.peak_models = max(cls.peak_models, len(cls.active))
+
+        try:
+            self.send_response(404 if model == 'missing' else 200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            if model == 'missing':
+                self.wfile.write(b'{"error": "model not found"}\n')
+                return
+
+            time.sleep(FIRST_TOKEN_DELAY)
+            words = body['messages'][-1]['content'].split()
+            for word in words:
+                chunk = {'model': model, 'message': {'role': 'assistant', 'content': word + ' '}, 'done': False}
+                self.wfile.write(json.dumps(chunk).encode() + b'\n')
+                self.wfile.flush()
+                time.sleep(TOKEN_DELAY)
+            done = {'model': model, 'message': {'role': 'assistant', 'content': ''}, 'done': True,
+                    'eval_count': len(words), 'eval_duration': int(len(words) * TOKEN_DELAY * 1e9)}
+            self.wfile.write(json.dumps(done).encode() + b'\n')
+        finally:
+            with cls.lock:
+                cls.active[model] -= 1
+                if not cls.active[model]:
+                    del cls.active[model]
+
+
+def start_stub():
+    """Stub server on a free port; returns (server, host)"""
+    StubOllama.peak_total = StubOllama.peak_models = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def test_timed_chat_metrics():
+    """Latency, TTFT and tokens/sec come from the stream"""
+    server, host = start_stub()
+    try:
+        result = timed_chat('llama3.2', [{'role': 'user', 'content': "one two three four"}], host=host)
+        missing = timed_chat('missing', [{'role': 'user', 'content': "hi"}], host=host)
+    finally:
+        server.shutdown()
+
+    assert result['success'] and result['content'].split() == ["one", "two", "three", "four"]
+    assert FIRST_TOKEN_DELAY <= result['ttft'] < result['latency']
+    assert result['tokens'] == 4 and abs(result['tokens_per_sec'] - 1 / TOKEN_DELAY) < 1
+    assert not missing['success'] and missing['error']
+    print(f"✓ ttft {result['ttft'] * 1000:.0f} ms, latency {result['latency'] * 1000:.0f} ms, "
+          f"{result['tokens_per_sec']:.0f} tok/s")
+
+
+def test_concurrency_and_residency_limits():
+    """Requests overlap up to the limit but never span more resident models than allowed"""
+    server, host = start_stub()
+    try:
+        runner = BenchmarkRunner(host=host, concurrency=3, max_resident=1)
+        jobs = runner.jobs_for(['llama3.2', 'phi3'], PROMPTS, repeats=3)
+        results, summary = asyncio.run(runner.run(jobs))
+    finally:
+        server.shutdown()
+
+    assert len(results) == 12 and all(r['success'] for r in results)
+    assert StubOllama.peak_total == 3 and StubOllama.peak_models == 1
+    assert summary['phi3']['requests'] == 6
+    assert summary['llama3.2']['ttft_p50'] <= summary['llama3.2']['latency_p50']
+    print(format_report(summary, runner.wall_time))
+    print(f"✓ peak {StubOllama.peak_total} requests in flight on {StubOllama.peak_models} model")
+
+
+def test_two_resident_models_run_side_by_side():
+    """With room for two models, both are benchmarked at once"""
+    server, host = start_stub()
+    try:
+        runner = BenchmarkRunner(host=host, concurrency=4, max_resident=2)
+        asyncio.run(runner.run(runner.jobs_for(['llama3.2', 'phi3'], PROMPTS)))
+    finally:
+        server.shutdown()
+    assert StubOllama.peak_models == 2
+    print(f"✓ {StubOllama.peak_models} models in flight, wall time {runner.wall_time:.2f}s")
+
+
+def test_percentiles():
+    """Interpolated percentiles ignore missing values"""
+    assert percentile([1, 2, 3, 4, 5], 50) == 3
+    assert percentile([1, 2, 3, 4, None], 90) == 3.7
+    assert percentile([], 50) is None
+    print("✓ Percentiles")
+
+
+if __name__ == "__main__":
+    print("=== LLM Benchmark Test ===\n")
+
+    tests = [
+        ("Streamed chat metrics", test_timed_chat_metrics),
+        ("Concurrency and residency limits", test_concurrency_and_residency_limits),
+        ("Two resident models", test_two_resident_models_run_side_by_side),
+        ("Percentiles", test_percentiles),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
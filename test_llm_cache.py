@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+LLM cache test script
+Tests the persistent response cache with a stub client (no Ollama needed)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from llm_cache import CachedLLM, LLMCache, cached_chat, cached_generate
+
+MODEL = "llama3.2"
+MESSAGES = [{'role': 'user', 'content': "Generate 3 calculator problems"}]
+GREEDY = {'temperature': 0}
+
+
+class StubClient:
+    """Counts calls and answers like the ollama module"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, model, messages, **kwargs):
+        self.calls += 1
+        return {'model': model, 'message': {'role': 'assistant', 'content': f"25*4 (call {self.calls})"}}
+
+    def generate(self, model, prompt, **kwargs):
+        self.calls += 1
+        return {'model': model, 'response': f"{prompt} -> {self.calls}"}
+
+
+class StubLLM:
+    """Stands in for langchain_ollama.OllamaLLM"""
+
+    def __init__(self, model, temperature=None):
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def test_chat_hits_across_runs():
+    """A second process with the same deterministic prompt never reaches the model"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'llm_cache.sqlite')
+        client = StubClient()
+        first = cached_chat(MODEL, MESSAGES, GREEDY, cache=LLMCache(path), client=client)
+
+        cache = LLMCache(path)
+        second = cached_chat(MODEL, MESSAGES, GREEDY, cache=cache, client=client)
+        assert second['message']['content'] == first['message']['content']
+        assert second['cached'] and client.calls == 1
+
+        # Model, options and request arguments are part of the key
+        cached_chat("phi3", MESSAGES, GREEDY, cache=cache, client=client)
+        cached_chat(MODEL, MESSAGES, {'temperature': 0, 'seed': 7}, cache=cache, client=client)
+        cached_chat(MODEL, MESSAGES, GREEDY, cache=cache, client=client, format='json')
+        assert client.calls == 4
+        # Streaming does not change the answer
+        assert cached_chat(MODEL, MESSAGES, GREEDY, cache=cache, client=client, stream=False)['cached']
+        misses = cache.stats()['misses']
+        cache.db.close()
+    print(f"✓ Persisted hit, {misses} misses for other models/options/arguments")
+
+
+def test_sampled_calls_not_cached():
+    """Without temperature 0 or a seed every call reaches the model"""
+    cache = LLMCache(None)
+    client = StubClient()
+    answers = {cached_chat(MODEL, MESSAGES, cache=cache, client=client)['message']['content'] for _ in range(2)}
+    cached_chat(MODEL, MESSAGES, {'temperature': 0.8}, cache=cache, client=client)
+
+    assert len(answers) == 2 and client.calls == 3
+    assert cache.stats()['entries'] == 0
+    print("✓ Sampled chats always call the model")
+
+
+def test_generate_and_langchain_wrapper():
+    """ollama.generate and OllamaLLM.invoke share the same cache"""
+    cache = LLMCache(None)
+    client = StubClient()
+    assert cached_generate(MODEL, "Hello", GREEDY, cache=cache, client=client) == \
+        {'model': MODEL, 'response': "Hello -> 1"}
+    assert cached_generate(MODEL, "Hello", GREEDY, cache=cache, client=client)['cached']
+
+    llm = CachedLLM(StubLLM(MODEL, temperature=0), cache)
+    assert llm.invoke("Plan a workflow") == llm.invoke("Plan a workflow") == "answer 1"
+    assert llm.model == MODEL
+
+    warmer = CachedLLM(StubLLM(MODEL, temperature=0.9), cache)
+    assert warmer.invoke("Plan a workflow") == "answer 1" and warmer.invoke("Plan a workflow") == "answer 2"
+    print(f"✓ {cache.stats()['hits']} hits across generate and invoke")
+
+
+def test_ttl_eviction_and_bypass():
+    """Expired entries miss, the size cap evicts LRU entries, bypass skips the cache"""
+    cache = LLMCache(None, ttl=0.05)
+    cache.put(MODEL, "prompt", "answer")
+    assert cache.get(MODEL, "prompt") == "answer"
+    time.sleep(0.1)
+    assert cache.get(MODEL, "prompt") is None and cache.stats()['expired'] == 1
+
+    cache = LLMCache(None, max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(MODEL, name, name * 100)
+        time.sleep(0.01)
+    assert cache.get(MODEL, "a") is None
+    assert cache.get(MODEL, "c") == "c" * 100
+    assert cache.stats()['evictions'] == 1
+
+    client = StubClient()
+    bypassed = LLMCache(None, bypass=True)
+    cached_chat(MODEL, MESSAGES, GREEDY, cache=bypassed, client=client)
+    cached_chat(MODEL, MESSAGES, GREEDY, cache=bypassed, client=client)
+    assert client.calls == 2 and bypassed.stats()['entries'] == 0
+    print("✓ TTL, size eviction and bypass behave")
+
+
+if __name__ == "__main__":
+    print("=== LLM Cache Test ===\n")
+
+    tests = [
+        ("Persistent chat hits", test_chat_hits_across_runs),
+        ("Sampled calls", test_sampled_calls_not_cached),
+        ("Generate and LangChain wrapper", test_generate_and_langchain_wrapper),
+        ("TTL, eviction and bypass", test_ttl_eviction_and_bypass),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Async LLM client test script
+Tests that generation runs off the event loop (stub client, no Ollama needed)
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+from llm_cache import LLMCache
+from llm_client import AsyncLLMPool
+
+MODEL = "llama3.2"
+GENERATION_TIME = 0.2
+
+
+class SlowClient:
+    """Blocks like a real generation and records peak concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def chat(self, model, messages, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(GENERATION_TIME)
+        with self.lock:
+            self.active -= 1
+        return {'message': {'role': 'assistant', 'content': messages[-1]['content'].upper()}}
+
+
+def messages(text):
+    return [{'role': 'user', 'content': text}]
+
+
+def test_loop_keeps_running():
+    """UI work proceeds while a prompt is generating"""
+    async def scenario():
+        pool = AsyncLLMPool(cache=LLMCache(None))
+        task = pool.start(pool.chat(MODEL, messages("story"), client=SlowClient()))
+        ticks = 0
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks, (await task)['message']['content']
+
+    ticks, content = asyncio.run(scenario())
+    assert content == "STORY"
+    assert ticks >= 10
+    print(f"✓ Event loop ran {ticks} UI ticks during one generation")
+
+
+def test_pool_is_bounded():
+    """No more than max_workers generations run at once"""
+    async def scenario():
+        client = SlowClient()
+        pool = AsyncLLMPool(max_workers=2, cache=LLMCache(None))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.chat(MODEL, messages(f"p{i}"), client=client)
+                                         for i in range(4)))
+        return client.peak, time.perf_counter() - started, results, pool.stats()
+
+    peak, elapsed, results, stats = asyncio.run(scenario())
+    assert peak == 2
+    assert [r['message']['content'] for r in results] == ["P0", "P1", "P2", "P3"]
+    assert elapsed < 4 * GENERATION_TIME and stats['calls'] == 4
+    print(f"✓ 4 calls on 2 workers in {elapsed:.2f}s (peak concurrency {peak})")
+
+
+def test_invoke_and_cache():
+    """OllamaLLM-style invoke runs on the pool; repeated greedy chats hit the cache"""
+    class StubLLM:
+        def invoke(self, prompt):
+            time.sleep(0.05)
+            return prompt[::-1]
+
+    async def scenario():
+        client = SlowClient()
+        pool = AsyncLLMPool(cache=LLMCache(None))
+        reversed_text = await pool.invoke(StubLLM(), "plan")
+        await pool.chat(MODEL, messages("same"), {'temperature': 0}, client=client)
+        cached = await pool.chat(MODEL, messages("same"), {'temperature': 0}, client=client)
+        return reversed_text, cached
+
+    reversed_text, cached = asyncio.run(scenario())
+    assert reversed_text == "nalp"
+    assert cached['cached'] and cached['message']['content'] == "SAME"
+    print("✓ invoke() awaited and repeated prompt served from cache")
+
+
+if __name__ == "__main__":
+    print("=== Async LLM Client Test ===\n")
+
+    tests = [
+        ("Event loop stays free", test_loop_keeps_running),
+        ("Bounded pool", test_pool_is_bounded),
+        ("Invoke and cache", test_invoke_and_cache),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LLM streaming entry test script
+Streams stub model tokens into the fake Notepad (no Windows or Ollama needed)
+"""
+
+import asyncio
+import sys
+import time
+
+from fake_desktop import FakeDesktop, fake_notepad
+from llm_cache import LLMCache, cached_chat_stream
+from llm_stream import SentenceBuffer, stream_chat_into, stream_into
+
+STORY = ("Beep the robot loved spreadsheets. Every morning it sorted the files! "
+         "Did anyone notice? Nobody did.\nBut the desktop was always tidy.")
+
+
+def make_editor():
+    """Fake Notepad editor element"""
+    desktop = FakeDesktop({'notepad': fake_notepad})
+    desktop.open_application('notepad')
+    return desktop.locator('name:Edit').first()
+
+
+def word_tokens(text):
+    """Split like a model would, keeping the separating spaces"""
+    pieces = text.split(' ')
+    return [piece + ' ' for piece in pieces[:-1]] + [pieces[-1]]
+
+
+def test_sentence_buffer():
+    """Chunks end at sentence or line boundaries; long run-ons split at words"""
+    buffer = SentenceBuffer()
+    chunks = []
+    for token in word_tokens(STORY):
+        chunks.extend(buffer.feed(token))
+    chunks.append(buffer.flush())
+
+    assert ''.join(chunks) == STORY
+    assert chunks[0] == "Beep the robot loved spreadsheets. "
+    assert all(chunk.rstrip(' ')[-1] in '.!?\n' for chunk in chunks[:-1])
+
+    long = SentenceBuffer(max_chars=20)
+    pieces = long.feed("word " * 10)
+    assert pieces and all(len(piece) <= 20 and piece.endswith(' ') for piece in pieces)
+    print(f"✓ {len(chunks)} sentence chunks")
+
+
+def test_first_sentence_visible_before_generation_ends():
+    """Text appears in the editor as soon as the first sentence completes"""
+    editor = make_editor()
+    delay = 0.02
+
+    def paced():
+        for token in word_tokens(STORY):
+            time.sleep(delay)
+            yield token
+
+    content, stats = asyncio.run(stream_into(editor, paced()))
+
+    assert content == STORY and editor.get_text().text == STORY
+    assert stats['verified'] is True
+    assert stats['calls'] >= 4
+    assert stats['first_output'] < stats['seconds'] / 2
+    print(f"✓ First text after {stats['first_output']:.2f}s of {stats['seconds']:.2f}s, {stats['calls']} calls")
+
+
+def test_backpressure_coalesces_and_pauses():
+    """Slow typing merges queued chunks and pauses the model stream"""
+    editor = make_editor()
+    original = editor.type_text
+
+    def slow_type(text, clear=False):
+        time.sleep(0.05)
+        original(text, clear)
+
+    editor.type_text = slow_type
+    sentences = "".join(f"Sentence {i}. " for i in range(30))
+    content, stats = asyncio.run(stream_into(editor, iter(word_tokens(sentences)), max_pending=2))
+
+    assert editor.get_text().text == sentences
+    assert stats['coalesced'] > 0 and stats['calls'] < 30
+    assert stats['stalled_seconds'] > 0
+    print(f"✓ 30 sentences in {stats['calls']} calls ({stats['coalesced']} merged, "
+          f"stream paused {stats['stalled_seconds']:.2f}s)")
+
+
+def test_cached_stream_and_errors():
+    """A cached deterministic response streams in one piece; model errors propagate"""
+    class StubClient:
+        def chat(self, model, messages, stream=False, **kwargs):
+            return ({'message': {'content': token}} for token in word_tokens(STORY))
+
+    cache = LLMCache(None)
+    messages = [{'role': 'user', 'content': "story"}]
+    assert ''.join(cached_chat_stream("llama3.2", messages, {'temperature': 0}, cache=cache, client=StubClient())) == STORY
+    assert list(cached_chat_stream("llama3.2", messages, {'temperature': 0}, cache=cache, client=StubClient())) == [STORY]
+
+    def failing():
+        yield "Partial sentence. "
+        raise ConnectionError("model went away")
+
+    editor = make_editor()
+    try:
+        asyncio.run(stream_into(editor, failing()))
+        raise AssertionError("error was swallowed")
+    except ConnectionError:
+        pass
+    assert editor.get_text().text == "Partial sentence. "
+    print("✓ Cached stream replayed and stream errors raised")
+
+
+def test_keep_alive_reaches_the_model():
+    """stream_chat_into sends keep_alive with the chat so a warmed-up model stays loaded"""
+    class StubClient:
+        def __init__(self):
+            self.kwargs = None
+
+        def chat(self, model, messages, stream=False, **kwargs):
+            self.kwargs = kwargs
+            return ({'message': {'content': token}} for token in word_tokens(STORY))
+
+    client = StubClient()
+    editor = make_editor()
+    content, _ = asyncio.run(stream_chat_into(editor, "llama3.2", [{'role': 'user', 'content': "story"}],
+                                              client=client, keep_alive="30m"))
+    assert content == STORY and client.kwargs == {'keep_alive': "30m"}
+    print("✓ keep_alive forwarded to the streamed chat")
+
+
+if __name__ == "__main__":
+    print("=== LLM Streaming Entry Test ===\n")
+
+    tests = [
+        ("Sentence buffer", test_sentence_buffer),
+        ("Early first output", test_first_sentence_visible_before_generation_ends),
+        ("Backpressure", test_backpressure_coalesces_and_pauses),
+        ("Cached stream and errors", test_cached_stream_and_errors),
+        ("Keep-alive", test_keep_alive_reaches_the_model),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
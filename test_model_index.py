@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Model index test script
+Tests tag matching and task ranking against a stub Ollama server
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from model_index import ModelIndex, normalize_name, parse_params, parse_quantization
+
+GB = 1024 ** 3
+
+INSTALLED = [
+    {'name': 'deepseek-r1:1.5b', 'size': int(1.1 * GB),
+     'details': {'parameter_size': '1.8B', 'quantization_level': 'Q4_K_M'}},
+    {'name': 'gemma3:4b-it-q4_K_M', 'size': int(3.3 * GB), 'details': {}},
+    {'name': 'llama3.2:latest', 'size': int(2.0 * GB),
+     'details': {'parameter_size': '3.2B', 'quantization_level': 'Q4_K_M'}},
+    {'name': 'qwen2.5:0.5b', 'size': int(0.4 * GB),
+     'details': {'parameter_size': '494.03M', 'quantization_level': 'Q4_K_M'}},
+    {'name': 'Registry.Ollama.ai/library/phi3:latest', 'size': int(2.2 * GB),
+     'details': {'parameter_size': '3.8B', 'quantization_level': 'Q4_0'}},
+]
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Serves /api/tags and counts listings"""
+
+    listings = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).listings += 1
+        data = json.dumps({'models': INSTALLED}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_stub():
+    """Stub server on a free port; returns (server, host)"""
+    StubOllama.listings = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def build_index(path=None):
+    """Index refreshed from the stub server"""
+    server, host = start_stub()
+    try:
+        index = ModelIndex(host=host, path=path)
+        assert index.refresh()
+        assert index.refresh()
+    finally:
+        server.shutdown()
+    assert StubOllama.listings == 1
+    return index
+
+
+def test_parsing():
+    """Names, parameter counts and quantization are normalized"""
+    assert normalize_name('Gemma3') == ('gemma3', 'latest')
+    assert normalize_name('registry.ollama.ai/library/phi3:latest') == ('phi3', 'latest')
+    assert parse_params('1.8B') == 1.8 and abs(parse_params('494.03M') - 0.494) < 0.001
+    assert parse_params('4b-it-q4_K_M') == 4.0 and parse_params('latest') is None
+    assert parse_quantization('4b-it-q4_K_M') == 'Q4_K_M' and parse_quantization('1.5b') is None
+    print("✓ Names, sizes and quantization parsed")
+
+
+def test_resolve():
+    """Requested names map to installed ones without scanning"""
+    index = build_index()
+    assert index.resolve('deepseek-r1:1.5b') == 'deepseek-r1:1.5b'
+    assert index.resolve('deepseek-r1') == 'deepseek-r1:1.5b'
+    assert index.resolve('gemma3:4b') == 'gemma3:4b-it-q4_K_M'
+    assert index.resolve('gemma3:latest') == 'gemma3:4b-it-q4_K_M'
+    assert index.resolve('LLAMA3.2') == 'llama3.2:latest'
+    assert index.resolve('phi3') == 'Registry.Ollama.ai/library/phi3:latest'
+    assert index.resolve('deepseek-r1:7b') is None and index.resolve('mistral') is None
+
+    entry = index.entry('gemma3')
+    assert entry['params'] == 4.0 and entry['quantization'] == 'Q4_K_M' and entry['last_seen']
+    print("✓ Exact, bare-family, tag-prefix and registry names resolved")
+
+
+def test_rank_by_task():
+    """Fastest adequate model first; measured speed beats size"""
+    index = build_index()
+    assert index.rank('general')[0] == 'qwen2.5:0.5b'
+    assert index.best('creative') == 'deepseek-r1:1.5b'
+    assert index.rank('planning') == ['llama3.2:latest', 'Registry.Ollama.ai/library/phi3:latest',
+                                      'gemma3:4b-it-q4_K_M', 'deepseek-r1:1.5b', 'qwen2.5:0.5b']
+
+    index.record_speed('gemma3', 80.0)
+    assert index.best('planning') == 'gemma3:4b-it-q4_K_M'
+
+    preferred = ["deepseek-r1:1.5b", "deepseek-r1", "gemma3:latest", "gemma3", "llama3.2", "mistral"]
+    assert index.rank('creative', preferred) == ['gemma3:4b-it-q4_K_M', 'deepseek-r1:1.5b', 'llama3.2:latest']
+    assert ModelIndex(host='127.0.0.1:9', path=None).rank('creative', ['phi3']) == ['phi3']
+    print("✓ Task ranking and candidate filtering")
+
+
+def test_persistence():
+    """The index and measured speeds survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model_index.json')
+        build_index(path).record_speed('llama3.2', 42.0)
+
+        index = ModelIndex(host='127.0.0.1:9', path=path)
+        assert index.resolve('gemma3:4b') == 'gemma3:4b-it-q4_K_M'
+        assert index.refresh()
+        assert index.speeds == {'llama3.2:latest': 42.0}
+    print("✓ Index reloaded without listing again")
+
+
+if __name__ == "__main__":
+    print("=== Model Index Test ===\n")
+
+    tests = [
+        ("Parsing", test_parsing),
+        ("Resolve", test_resolve),
+        ("Rank by task", test_rank_by_task),
+        ("Persistence", test_persistence),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
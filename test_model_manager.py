@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Model manager test script
+Checks, remembers and preloads models against a stub Ollama server
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from model_manager import ModelManager
+
+PROBE_DELAY = 0.2
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Answers /api/tags, /api/show and /api/generate for a fixed set of models"""
+
+    installed = ['gemma3:latest', 'llama3.2:latest', 'phi3:latest']
+    # Models that are listed but broken (show fails)
+    broken = {'phi3:latest'}
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        type(self).requests.append(('GET', self.path, None))
+        self._reply(200, {'models': [{'name': name} for name in self.installed]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).requests.append(('POST', self.path, body))
+        model = body['model']
+        if self.path == '/api/show':
+            time.sleep(PROBE_DELAY)
+            if model in self.broken:
+                return self._reply(500, {'error': 'model is corrupt'})
+            return self._reply(200, {'modelfile': '', 'details': {}})
+        self._reply(200, {'model': model, 'response': '', 'done': True})
+
+
+def start_stub():
+    """Stub server on a free port; returns (server, host)"""
+    StubOllama.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def calls(path):
+    return [r for r in StubOllama.requests if r[1] == path]
+
+
+def test_parallel_check_and_choice():
+    """One listing, parallel probes only for listed models, first available chosen by installed name"""
+    server, host = start_stub()
+    try:
+        manager = ModelManager(host=host, state_path=None)
+        started = time.perf_counter()
+        results = manager.check(['deepseek-r1:1.5b', 'phi3', 'gemma3', 'llama3.2'])
+        elapsed = time.perf_counter() - started
+        choice = manager.choose(['deepseek-r1:1.5b', 'phi3', 'gemma3', 'llama3.2'], preload=False)
+    finally:
+        server.shutdown()
+
+    assert results == {'deepseek-r1:1.5b': None, 'phi3': None,
+                       'gemma3': 'gemma3:latest', 'llama3.2': 'llama3.2:latest'}
+    assert choice == 'gemma3:latest'
+    assert len(calls('/api/tags')) == 1
+    assert len(calls('/api/show')) == 3
+    assert elapsed < 2 * PROBE_DELAY
+    print(f"✓ Checked 4 candidates in {elapsed:.2f}s, chose {choice}")
+
+
+def test_availability_remembered_between_runs():
+    """A second run trusts remembered models that are still listed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model_availability.json')
+        server, host = start_stub()
+        try:
+            ModelManager(host=host, state_path=path).check(['gemma3', 'llama3.2'])
+            probes_first = len(calls('/api/show'))
+
+            manager = ModelManager(host=host, state_path=path)
+            assert manager.remembered('gemma3:latest') is True
+            assert manager.choose(['gemma3', 'llama3.2'], preload=False) == 'gemma3:latest'
+            probes_second = len(calls('/api/show')) - probes_first
+        finally:
+            server.shutdown()
+
+    assert probes_first == 2 and probes_second == 0
+    print("✓ Second run chose a model without probing")
+
+
+def test_preload_with_keep_alive():
+    """warm_up() loads the chosen model with an empty prompt and keep_alive"""
+    server, host = start_stub()
+    try:
+        manager = ModelManager(host=host, state_path=None, keep_alive='1h')
+        model = manager.choose(['llama3.2'])
+        # choose() started the preload in the background
+        deadline = time.time() + 2
+        while not manager.warm and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        server.shutdown()
+
+    generate = calls('/api/generate')
+    assert model == 'llama3.2:latest' and model in manager.warm
+    assert generate[0][2] == {'model': model, 'prompt': '', 'stream': False, 'keep_alive': '1h'}
+    print(f"✓ Preloaded in {manager.warm[model]['load_seconds'] * 1000:.0f} ms with keep_alive=1h")
+
+
+def test_server_down():
+    """Without a server nothing is available and nothing hangs"""
+    manager = ModelManager(host='127.0.0.1:9', state_path=None, probe_timeout=0.5)
+    assert manager.choose(['llama3.2'], preload=False) is None
+    print("✓ Unreachable server handled")
+
+
+if __name__ == "__main__":
+    print("=== Model Manager Test ===\n")
+
+    tests = [
+        ("Parallel check and choice", test_parallel_check_and_choice),
+        ("Remembered availability", test_availability_remembered_between_runs),
+        ("Preload with keep-alive", test_preload_with_keep_alive),
+        ("Server down", test_server_down),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Selector resolver test script
+Tests learned selector ranking against the fake desktop backend (no Windows needed)
+"""
+
+import os
+import sys
+import tempfile
+
+from element_cache import CachedDesktop
+from fake_desktop import FakeDesktop, FakeElement, fake_paint
+from selector_resolver import SelectorResolver
+from stroke_executor import StrokeExecutor
+
+BRUSH_SELECTORS = ['automationid:BrushTool', 'name:Brush', 'automationid:Brush', 'class:Button name:Brush']
+
+
+def paint_with_brush():
+    """Fake Paint whose brush button only answers to 'name:Brush'"""
+    window = fake_paint()
+    window.child_elements.insert(0, FakeElement('Brush', control_type='Button'))
+    return window
+
+
+def make_desktop():
+    fake = FakeDesktop({'mspaint': paint_with_brush})
+    fake.open_application('mspaint')
+    return fake
+
+
+def click(button):
+    button.click()
+
+
+def test_warm_up_then_one_attempt():
+    """After the first lookup the winning selector is tried first"""
+    resolver = SelectorResolver(path=None)
+    desktop = make_desktop()
+
+    _, first = resolver.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+    warm_up = resolver.attempts
+    for _ in range(10):
+        _, selector = resolver.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+        assert selector == 'name:Brush'
+
+    assert first == 'name:Brush' and warm_up == 2
+    assert resolver.attempts == warm_up + 10
+    print(f"✓ Warm-up took {warm_up} attempts, then 1 per lookup "
+          f"({resolver.stats()['attempts_per_lookup']:.2f} overall)")
+
+
+def test_persisted_between_runs():
+    """A new session starts from the recorded ranking"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'selector_stats.json')
+        SelectorResolver(path=path).resolve(make_desktop(), 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+
+        resolver = SelectorResolver(path=path)
+        _, selector = resolver.resolve(make_desktop(), 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+    assert selector == 'name:Brush' and resolver.attempts == 1
+    print("✓ Ranking reloaded, first lookup of the new run took 1 attempt")
+
+
+def test_adapts_and_revalidates():
+    """A selector that stops working is demoted; stale rankings retry the given order"""
+    resolver = SelectorResolver(path=None)
+    desktop = make_desktop()
+    for _ in range(5):
+        resolver.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+
+    # An app update renames the button but gives it an automation id
+    brush = desktop.find(['name:Brush'])
+    brush.name, brush.automation_id = 'Brushes', 'Brush'
+    before = resolver.attempts
+    _, selector = resolver.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+    assert selector == 'automationid:Brush' and resolver.attempts - before == 2
+    before = resolver.attempts
+    resolver.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+    assert resolver.attempts - before == 1
+
+    stale = SelectorResolver(path=None, revalidate_after=0)
+    stale.elements = resolver.elements
+    assert stale.due_for_validation('mspaint', 'brush')
+    # Re-validation walks the given order again, so a preferred selector would win back
+    _, selector = stale.resolve(desktop, 'mspaint', 'brush', BRUSH_SELECTORS, action=click)
+    assert selector == 'automationid:Brush' and stale.attempts == 3
+    print("✓ Broken winner demoted after one miss; stale rankings re-validated")
+
+
+def test_no_selector_works():
+    """Every candidate failing raises and counts the misses"""
+    resolver = SelectorResolver(path=None)
+    try:
+        resolver.resolve(make_desktop(), 'mspaint', 'eraser', ['name:Eraser', 'automationid:Eraser'])
+    except RuntimeError as e:
+        assert 'eraser' in str(e)
+    else:
+        raise AssertionError("missing element resolved")
+    assert resolver.elements['mspaint/eraser']['selectors']['name:Eraser'] == {'hits': 0, 'misses': 1,
+                                                                               'last_ok': False}
+    print("✓ Missing element reported")
+
+
+def test_stroke_executor_lookups():
+    """Canvas and palette lookups go through the resolver"""
+    resolver = SelectorResolver(path=None)
+    for _ in range(2):
+        executor = StrokeExecutor(CachedDesktop(make_desktop()), resolver=resolver, stream_delay=0, press_delay=0)
+        executor.execute([{'points': [(10, 10), (20, 20)], 'color': 'Red', 'label': 'line'}])
+
+    entries = resolver.elements
+    assert entries['mspaint/canvas']['selectors']['automationid:Canvas']['hits'] == 2
+    assert entries['mspaint/color:red']['selectors']['name:Red']['hits'] == 2
+    # First session misses 'automationid:RedColor' once, the second takes one attempt per lookup
+    assert resolver.attempts == 3 + 2
+    print(f"✓ Executor lookups ranked ({resolver.attempts} attempts over 2 sessions)")
+
+
+if __name__ == "__main__":
+    print("=== Selector Resolver Test ===\n")
+
+    tests = [
+        ("Warm-up then one attempt", test_warm_up_then_one_attempt),
+        ("Persisted between runs", test_persisted_between_runs),
+        ("Adapts and revalidates", test_adapts_and_revalidates),
+        ("No selector works", test_no_selector_works),
+        ("Stroke executor lookups", test_stroke_executor_lookups),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Shape library test script
+Checks the vectorized shape generators and transforms (no Windows needed)
+"""
+
+import math
+import sys
+
+import numpy as np
+
+from shapes import (circle, heart, pattern_points, place, radial_copies, rotation_matrix,
+                    scale_matrix, spiral, star, transform, translation_matrix)
+
+
+def test_shapes_match_original_geometry():
+    """Generated points match the per-point math.cos/sin loops they replace"""
+    x, y, size = 300, 200, 50
+
+    old_star = []
+    for i in range(11):
+        angle = math.radians(i * 36)
+        radius = size if i % 2 == 0 else size / 2
+        old_star.append((x + radius * math.cos(angle - math.pi / 2),
+                         y + radius * math.sin(angle - math.pi / 2)))
+
+    old_spiral = []
+    for i in range(0, 720, 15):
+        angle = math.radians(i)
+        old_spiral.append((x + (i / 720) * size * math.cos(angle), y + (i / 720) * size * math.sin(angle)))
+
+    # The draw tools' zigzag starts at (x, y) and steps right by a third of the size
+    old_zigzag = [(x + i * (size / 3), y + (size / 2) * (1 if i % 2 == 0 else -1)) for i in range(6)]
+
+    assert np.allclose(pattern_points('star', x, y, size), old_star)
+    assert np.allclose(pattern_points('zigzag', x, y, size), old_zigzag)
+    assert np.allclose(place(spiral(), x, y, size), old_spiral)
+    assert np.allclose(place(heart(), x, y, size)[0], (x, y - size * 5 / 20))
+    print("✓ Star, spiral, heart and zigzag match the original loops")
+
+
+def test_transforms_compose_in_order():
+    """Scale, then rotate, then translate as homogeneous matrix ops"""
+    points = np.array([[1.0, 0.0]])
+    moved = transform(points, scale_matrix(2), rotation_matrix(90), translation_matrix(10, 5))
+
+    assert np.allclose(moved, [[10, 7]])
+    assert np.allclose(circle()[0], circle()[-1])
+    print("✓ Transforms apply in the order given")
+
+
+def test_composite_drawing_is_vectorized():
+    """Thousands of points for a composite come out as one array"""
+    ring = radial_copies(star(), 200, radius=150, x=400, y=300)
+    dense = place(circle(count=5000), 400, 300, 100)
+
+    assert ring.shape == (200, 11, 2)
+    assert np.allclose(np.hypot(*(ring[:, :-1].mean(axis=1) - (400, 300)).T), 150)
+    assert dense.shape == (5000, 2)
+    print(f"✓ {ring.shape[0] * ring.shape[1] + len(dense)} points generated without Python loops")
+
+
+if __name__ == "__main__":
+    print("=== Shape Library Test ===\n")
+
+    tests = [
+        ("Original geometry", test_shapes_match_original_geometry),
+        ("Transform order", test_transforms_compose_in_order),
+        ("Composite drawing", test_composite_drawing_is_vectorized),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
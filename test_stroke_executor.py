@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Stroke executor test script
+Draws compositions on the fake Paint canvas (no Windows needed)
+"""
+
+import os
+import sys
+import tempfile
+
+from delay_calibration import DelayCalibrator
+from fake_desktop import FakeDesktop, fake_paint
+from shapes import pattern_points
+from stroke_executor import StrokeExecutor, parse_composition, shape_stroke
+
+COMPOSITION = ("pattern:star, x:300, y:250, size:40, color:blue; "
+               "pattern:circle, x:500, y:300, size:30, color:red; "
+               "pattern:square, x:200, y:400, size:60, color:blue; "
+               "pattern:heart, x:600, y:200, size:50, color:red; "
+               "pattern:spiral, x:400, y:400, size:80")
+
+
+def make_desktop():
+    """Fake desktop with Paint open"""
+    desktop = FakeDesktop({'mspaint': fake_paint})
+    desktop.open_application('mspaint')
+    return desktop
+
+
+def test_composition_in_one_session():
+    """A five-shape composition switches color once per color; uncolored strokes keep the last one"""
+    fake = make_desktop()
+    executor = StrokeExecutor(fake, stream_delay=0, press_delay=0)
+    stats = executor.execute([shape_stroke(shape) for shape in parse_composition(COMPOSITION)])
+    canvas = fake.locator('name:Canvas').first()
+
+    assert stats['strokes'] == 5 and len(canvas.strokes) == 5
+    assert stats['color_switches'] == 2
+    # The uncolored spiral follows the red heart, so it is drawn with the red strokes
+    assert [stroke['color'] for stroke in canvas.strokes] == ['Red', 'Red', 'Red', 'Blue', 'Blue']
+    assert stats['drawn'].index('spiral') < stats['drawn'].index('star')
+    assert stats['moves'] < stats['points_in']
+    print(f"✓ {stats['strokes']} strokes, {stats['moves']} moves, {fake.searches} tree walks")
+
+
+def test_moved_uncolored_stroke_keeps_its_color():
+    """An uncolored stroke scheduled ahead of the stroke that set its color is still drawn in it"""
+    def stroke(label, color, x, layer):
+        return {'label': label, 'color': color, 'layer': layer, 'points': pattern_points('circle', x, 200, 30)}
+
+    fake = make_desktop()
+    executor = StrokeExecutor(fake, stream_delay=0, press_delay=0)
+    # Y (blue, on top) must follow W, so the free-standing Z is moved ahead of both
+    stats = executor.execute([stroke('Y', 'blue', 300, 1), stroke('Z', None, 700, 0), stroke('W', 'green', 310, 0)])
+    canvas = fake.locator('name:Canvas').first()
+
+    assert stats['drawn'] == ['Z', 'W', 'Y']
+    assert [stroke['color'] for stroke in canvas.strokes] == ['Blue', 'Green', 'Blue']
+    print(f"✓ Z drawn first and still Blue: {[stroke['color'] for stroke in canvas.strokes]}")
+
+
+def test_canvas_resolved_once():
+    """Repeated executions reuse the canvas handle"""
+    fake = make_desktop()
+    executor = StrokeExecutor(fake, stream_delay=0, press_delay=0)
+    strokes = [shape_stroke(shape) for shape in parse_composition(COMPOSITION)]
+    executor.execute(strokes)
+    searches = fake.searches
+    executor.execute(strokes)
+
+    assert fake.searches == searches
+    print(f"✓ Second composition needed no tree walks ({searches} for the first)")
+
+
+def test_measured_rate_not_overwritten():
+    """The session starts at the measured move delay and does not record its own setting as a sample"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'latency_profile.json')
+        calibrator = DelayCalibrator(path, min_samples=1)
+        calibrator.record_sample('mspaint', 'mouse_move', 0.004)
+        executor = StrokeExecutor(make_desktop(), calibrator=calibrator, press_delay=0)
+        assert executor.stream_delay == 0.004
+
+        executor.execute([shape_stroke(shape) for shape in parse_composition("pattern:line, x:100, y:100, size:20")])
+        assert executor.stream_delay < 0.004
+        assert list(calibrator.samples['mspaint/mouse_move']) == [0.004]
+        assert not os.path.exists(path)
+    print("✓ Move delay taken from measurements only")
+
+
+def test_stream_rate_adapts():
+    """Clean strokes speed the stream up, rejected moves slow it down again"""
+    fake = make_desktop()
+    canvas = fake.locator('name:Canvas').first()
+    executor = StrokeExecutor(fake, stream_delay=0.01, press_delay=0)
+    move = canvas.mouse_move
+
+    def mouse_move(x, y):
+        # Paint drops moves streamed faster than every 4 ms
+        if executor.stream_delay < 0.004:
+            raise RuntimeError("move dropped")
+        move(x, y)
+
+    canvas.mouse_move = mouse_move
+    lines = [{'points': [(10, 10 + i), (50, 10 + i)]} for i in range(12)]
+    executor.execute(lines)
+
+    assert executor.rejected_moves >= 1
+    assert 0.004 <= executor.stream_delay < 0.01
+    print(f"✓ Stream delay settled at {executor.stream_delay * 1000:.0f} ms "
+          f"after {executor.rejected_moves} rejected move(s)")
+
+
+def test_button_released_on_error():
+    """A move that keeps failing still releases the mouse button"""
+    fake = make_desktop()
+    canvas = fake.locator('name:Canvas').first()
+    released = []
+
+    def mouse_move(x, y):
+        raise RuntimeError("canvas gone")
+
+    canvas.mouse_move = mouse_move
+    canvas.mouse_release = lambda: released.append(True)
+    executor = StrokeExecutor(fake, stream_delay=0, press_delay=0)
+    executor.resolve_canvas()
+    try:
+        executor.draw_stroke([(10, 10), (50, 50)])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("failing move did not raise")
+
+    assert released == [True]
+    print("✓ Mouse button released after a failed move")
+
+
+if __name__ == "__main__":
+    print("=== Stroke Executor Test ===\n")
+
+    tests = [
+        ("Batched composition", test_composition_in_one_session),
+        ("Moved uncolored stroke", test_moved_uncolored_stroke_keeps_its_color),
+        ("Canvas reuse", test_canvas_resolved_once),
+        ("Measured rate", test_measured_rate_not_overwritten),
+        ("Adaptive stream rate", test_stream_rate_adapts),
+        ("Release on error", test_button_released_on_error),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
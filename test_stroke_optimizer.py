@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Stroke optimizer test script
+Checks RDP simplification and curvature-adaptive resampling (no Windows needed)
+"""
+
+import sys
+
+import numpy as np
+
+from shapes import circle, pattern_points, place, square
+from stroke_optimizer import optimize_stroke, simplify
+
+
+def test_straight_edges_cost_one_move():
+    """A square sampled densely along its edges comes back as its 5 corners"""
+    corners = place(square(), 300, 200, 100)
+    dense = np.vstack([np.linspace(a, b, 30, endpoint=False) for a, b in zip(corners[:-1], corners[1:])]
+                      + [corners[-1:]])
+    optimized, stats = optimize_stroke(dense)
+
+    assert optimized.tolist() == corners.astype(int).tolist()
+    assert stats['points_in'] == 121 and stats['points_out'] == 5
+    print(f"✓ Square: {stats['points_in']} → {stats['points_out']} points, ~{stats['time_saved']:.2f}s saved")
+
+
+def test_curves_stay_within_tolerance():
+    """A dense circle keeps only the points needed to stay within a pixel"""
+    dense = place(circle(count=2000), 400, 300, 100)
+    optimized, stats = optimize_stroke(dense, tolerance=1.0)
+
+    # Worst deviation is at the middle of each chord
+    midpoints = (optimized[1:] + optimized[:-1]) / 2
+    error = np.abs(np.hypot(midpoints[:, 0] - 400, midpoints[:, 1] - 300) - 100).max()
+    assert stats['points_out'] < 50 and error <= 1.0
+    print(f"✓ Circle: {stats['points_in']} → {stats['points_out']} points, max error {error:.2f}px")
+
+
+def test_tolerance_trades_points_for_accuracy():
+    """A looser tolerance never needs more points"""
+    spiral = pattern_points('spiral', 400, 300, 120)
+    counts = [optimize_stroke(spiral, tolerance=t)[1]['points_out'] for t in (0.5, 1.0, 4.0)]
+
+    assert counts[0] >= counts[1] >= counts[2]
+    assert len(simplify(np.array([[0, 0], [5, 0.2], [10, 0]]), tolerance=0.5)) == 2
+    print(f"✓ Spiral points at 0.5/1/4 px tolerance: {counts}")
+
+
+if __name__ == "__main__":
+    print("=== Stroke Optimizer Test ===\n")
+
+    tests = [
+        ("Straight edges", test_straight_edges_cost_one_move),
+        ("Curve tolerance", test_curves_stay_within_tolerance),
+        ("Tolerance trade-off", test_tolerance_trades_points_for_accuracy),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Stroke scheduler test script
+Checks color-switch minimization and z-order constraints (no Windows needed)
+"""
+
+import sys
+
+from shapes import pattern_points
+from stroke_scheduler import count_switches, inherited_colors, schedule, schedule_report
+
+
+def stroke(label, color, x, y, size=20, layer=0):
+    """Small circle stroke for scheduling tests"""
+    return {'label': label, 'color': color, 'layer': layer, 'points': pattern_points('circle', x, y, size)}
+
+
+def test_separate_strokes_grouped_by_color():
+    """Non-overlapping strokes are drawn one color at a time"""
+    colors = ['red', 'blue', 'red', 'green', 'blue', 'red', 'green', 'blue']
+    strokes = [stroke(f"s{i}", color, 60 + i * 80, 100) for i, color in enumerate(colors)]
+    ordered, report = schedule_report(strokes)
+
+    assert report['switches_before'] == 8 and report['switches_after'] == 3
+    assert [s['color'] for s in ordered] == ['red'] * 3 + ['blue'] * 3 + ['green'] * 2
+    print(f"✓ Palette clicks: {report['switches_before']} → {report['switches_after']}")
+
+
+def test_overlaps_keep_z_order():
+    """A blue stroke on top of a red one stays after it"""
+    strokes = [
+        stroke('red-bottom', 'red', 100, 100),
+        stroke('blue-top', 'blue', 110, 100),
+        stroke('red-elsewhere', 'red', 400, 400),
+        stroke('blue-elsewhere', 'blue', 700, 100),
+    ]
+    labels = [s['label'] for s in schedule(strokes)]
+
+    assert labels.index('red-bottom') < labels.index('blue-top')
+    assert count_switches(schedule(strokes)) == 2
+    print(f"✓ Order kept for overlapping strokes: {labels}")
+
+
+def test_layers_override_input_order():
+    """An explicit lower layer is drawn first even if listed later"""
+    strokes = [
+        stroke('sun', 'yellow', 100, 100, layer=1),
+        stroke('sky', 'blue', 100, 100, size=80, layer=0),
+    ]
+    labels = [s['label'] for s in schedule(strokes)]
+
+    assert labels == ['sky', 'sun']
+    print("✓ Background layer drawn before foreground")
+
+
+def test_uncolored_strokes_keep_inherited_color():
+    """A free-standing uncolored stroke is still drawn in the color before it"""
+    strokes = [
+        stroke('outline', None, 100, 100),
+        stroke('red-a', 'red', 200, 100),
+        stroke('red-fill', None, 300, 100),
+        stroke('blue-a', 'blue', 400, 100),
+        stroke('red-b', 'red', 500, 100),
+    ]
+    ordered = schedule(strokes)
+    drawn = dict(zip((s['label'] for s in ordered), inherited_colors(ordered)))
+
+    assert drawn == dict(zip((s['label'] for s in strokes), inherited_colors(strokes)))
+    assert [s['label'] for s in ordered][0] == 'outline' and count_switches(ordered) == 2
+    print(f"✓ Uncolored strokes drawn in their inherited color: {[s['label'] for s in ordered]}")
+
+
+if __name__ == "__main__":
+    print("=== Stroke Scheduler Test ===\n")
+
+    tests = [
+        ("Color grouping", test_separate_strokes_grouped_by_color),
+        ("Z-order", test_overlaps_keep_z_order),
+        ("Layers", test_layers_override_input_order),
+        ("Uncolored strokes", test_uncolored_strokes_keep_inherited_color),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Bulk text entry test script
+Tests TextWriter against the fake Notepad (no Windows needed)
+"""
+
+import asyncio
+import sys
+
+from fake_desktop import FakeDesktop, FakeText, fake_notepad
+from text_entry import TextWriter, split_chunks, split_throttled
+
+REPORT = "\n".join(f"Line {i}: AI automation report entry with some detail." for i in range(60))
+
+
+def make_editor():
+    """Fake Notepad editor element"""
+    desktop = FakeDesktop({'notepad': fake_notepad})
+    desktop.open_application('notepad')
+    return desktop.locator('name:Edit').first()
+
+
+def test_large_report_is_chunked():
+    """A 3 KB report goes in with a couple of type_text calls and verifies"""
+    editor = make_editor()
+    writer = TextWriter(clipboard=lambda text: False)
+    result = writer.write(editor, REPORT)
+
+    assert len(REPORT) > 3000
+    assert result['method'] == 'chunked' and result['verified'] is True
+    assert len(editor.typed) == len(split_chunks(REPORT)) <= 2
+    assert all(chunk.endswith('\n') for chunk in editor.typed[:-1])
+    print(f"✓ {result['chars']} chars in {result['calls']} calls ({result['chars_per_sec']:.0f} chars/s)")
+
+
+def test_paste_uses_clipboard():
+    """Long text is pasted in one call and the user's clipboard is put back afterwards"""
+    editor = make_editor()
+    clipboard = {'text': 'user clipboard'}
+    pending = []
+
+    def set_clipboard(text):
+        clipboard['text'] = text
+        return True
+
+    def press_key(key):
+        assert key == '{Ctrl}v'
+        pending.append(2)
+
+    def get_text():
+        # The paste lands a couple of reads later, with whatever is on the clipboard then
+        if pending:
+            pending[0] -= 1
+            if pending[0] == 0:
+                pending.clear()
+                editor.text += clipboard['text'].replace('\n', '\r\n')
+        return FakeText(editor.text)
+
+    editor.press_key = press_key
+    editor.get_text = get_text
+    writer = TextWriter(clipboard=set_clipboard, read_clipboard=lambda: clipboard['text'], poll_interval=0)
+    result = writer.write(editor, REPORT)
+
+    assert result['method'] == 'paste' and result['calls'] == 1
+    assert result['verified'] is True and editor.typed == []
+    assert clipboard['text'] == 'user clipboard'
+    print("✓ Pasted report verified despite CRLF line endings, clipboard restored")
+
+
+def test_throttled_typing_keeps_rhythm():
+    """Throttled typing sends sentences and lines, not single characters"""
+    editor = make_editor()
+    editor.text = "Existing notes\n"
+    message = "Hello Ollama! This was typed by AI.\nThanks for reading."
+    result = asyncio.run(TextWriter().write_async(editor, message, method='throttled'))
+
+    assert result['calls'] == len(split_throttled(message)) == 3
+    assert result['verified'] is True
+    print(f"✓ {len(message)} chars typed in {result['calls']} throttled calls")
+
+
+def test_verification_detects_lost_text():
+    """Text that never reaches the editor fails the hash check"""
+    editor = make_editor()
+    editor.on_type = lambda text: None
+    result = TextWriter(clipboard=lambda text: False).write(editor, "This text is swallowed")
+
+    assert result['verified'] is False
+    print("✓ Missing text detected")
+
+
+if __name__ == "__main__":
+    print("=== Bulk Text Entry Test ===\n")
+
+    tests = [
+        ("Chunked report", test_large_report_is_chunked),
+        ("Clipboard paste", test_paste_uses_clipboard),
+        ("Throttled typing", test_throttled_typing_keeps_rhythm),
+        ("Verification", test_verification_detects_lost_text),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tool runtime test script
+Tests the shared desktop/LLM handles and benchmarks per-tool-call overhead
+against the fake desktop backend (no Windows or Ollama needed)
+"""
+
+import sys
+import time
+
+from canvas_capture import canvas_bounds
+from fake_desktop import FakeDesktop, fake_paint
+from selector_resolver import SelectorResolver
+from stroke_executor import StrokeExecutor, parse_composition, shape_stroke
+from tool_runtime import ToolRuntime, benchmark, describe
+
+# Simulated cost of connecting to the accessibility API / building an LLM client
+SETUP_DELAY = 0.002
+
+
+class FakeLLM:
+    """Stands in for an OllamaLLM client"""
+
+    def __init__(self, model):
+        self.model = model
+
+
+class FakeTool:
+    """Stands in for a LangChain tool taking a runtime field"""
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+
+
+def paint_desktop():
+    """Fake desktop with Paint already open"""
+    time.sleep(SETUP_DELAY)
+    desktop = FakeDesktop({'mspaint': fake_paint})
+    desktop.open_application('mspaint')
+    return desktop
+
+
+def slow_llm(model):
+    time.sleep(SETUP_DELAY)
+    return FakeLLM(model)
+
+
+def test_handles_created_once():
+    """25 simulated tool calls share one desktop, one LLM client and one inspector"""
+    fake = paint_desktop()
+    runtime = ToolRuntime(fake, llm_factory=FakeLLM)
+
+    for _ in range(25):
+        runtime.desktop.locator('automationid:Canvas')
+        runtime.desktop.locator('name:Red').click()
+        llm = runtime.llm('gemma3:4b-it-q4_K_M')
+        inspector = runtime.tool(FakeTool)
+
+    assert runtime.desktop.desktop is fake
+    assert runtime.llm('gemma3:4b-it-q4_K_M') is llm and runtime.tool(FakeTool) is inspector
+    assert inspector.runtime is runtime
+    stats = runtime.stats()
+    assert stats['llms'] == 1 and stats['tools'] == 1
+    assert fake.searches == 2 and stats['elements']['hits'] == 48
+    print(f"✓ 25 calls: {stats['llms']} LLM, {stats['tools']} tool, {fake.searches} tree walks")
+
+
+def test_separate_models():
+    """Each model gets its own client"""
+    runtime = ToolRuntime(paint_desktop(), llm_factory=FakeLLM)
+    assert runtime.llm('a') is not runtime.llm('b')
+    assert runtime.stats()['llms'] == 2
+    print("✓ One client per model")
+
+
+def test_lookups_use_the_snapshot():
+    """Tool lookups through runtime.app() come from the snapshot index; only misses walk the tree"""
+    fake = paint_desktop()
+    runtime = ToolRuntime(fake, llm_factory=FakeLLM)
+    paint = runtime.app('mspaint')
+    resolver = SelectorResolver(None)
+
+    for _ in range(10):
+        _, selector = resolver.resolve(paint, 'mspaint', 'color:red', ['automationid:RedColor', 'name:Red'],
+                                       action=lambda button: button.click())
+    executor = StrokeExecutor(paint, resolver=resolver, stream_delay=0, press_delay=0)
+    executor.execute([shape_stroke(shape) for shape in
+                      parse_composition("pattern:circle, x:300, y:250, size:30, color:blue")])
+    assert canvas_bounds(paint) == (5, 150, 1000, 600)
+
+    # Only the first, validating attempt at the missing automation ids walked the tree
+    assert selector == 'name:Red' and fake.searches == 2
+    assert runtime.stats()['lookups']['walked'] == 2
+    assert fake.locator('name:Canvas').first().strokes[-1]['color'] == 'Blue'
+
+    # A reopened window makes the old handles stale: the lookup walks once and re-indexes
+    fake.close_window('Untitled - Paint')
+    window = fake.open_application('mspaint')
+    red = next(e for e in window.walk() if e.name == 'Red')
+    assert paint.locator('name:Red') is red and paint.locator('name:Red') is red
+    print(f"✓ {runtime.stats()['lookups']['indexed']} indexed lookups, {fake.searches} tree walks")
+
+
+def test_control_numbers():
+    """'#N' from the last inspection listing works as a selector for lookups and stroke colors"""
+    fake = paint_desktop()
+    runtime = ToolRuntime(fake, llm_factory=FakeLLM)
+    paint = runtime.app('mspaint')
+    listing = runtime.inspector.inspect('mspaint')
+    assert "3 0 'Red'" in listing
+
+    assert paint.locator('#3').name == 'Red'
+    executor = StrokeExecutor(paint, resolver=SelectorResolver(None), stream_delay=0, press_delay=0)
+    executor.execute([shape_stroke(shape) for shape in
+                      parse_composition("pattern:line, x:300, y:250, size:30, color:#3")])
+    assert fake.locator('name:Canvas').first().strokes[-1]['color'] == 'Red'
+
+    try:
+        paint.locator('#99')
+        raise AssertionError("unknown control number resolved")
+    except RuntimeError as e:
+        assert '#99' in str(e)
+    print("✓ Control numbers resolve to their listed controls")
+
+
+def test_benchmark_overhead():
+    """Shared handles cut the per-call overhead"""
+    result = benchmark(25, desktop_factory=paint_desktop, llm_factory=slow_llm)
+    before, after = result['before'], result['after']
+    print(f"  {describe(result)}")
+
+    assert before['desktops'] == 25 and before['llms'] == 25 and before['lookups'] == 50
+    assert after['desktops'] == 1 and after['llms'] == 1 and after['lookups'] == 2
+    assert after['seconds_per_call'] < before['seconds_per_call'] / 5
+    print("✓ Per-call overhead reduced")
+
+
+if __name__ == "__main__":
+    print("=== Tool Runtime Test ===\n")
+
+    tests = [
+        ("Handles created once", test_handles_created_once),
+        ("Separate models", test_separate_models),
+        ("Snapshot lookups", test_lookups_use_the_snapshot),
+        ("Control numbers", test_control_numbers),
+        ("Benchmark overhead", test_benchmark_overhead),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+UI tree diff test script
+Tests incremental inspections against the fake desktop backend (no Windows needed)
+"""
+
+import sys
+
+from fake_desktop import FakeDesktop, FakeElement, fake_calculator, fake_paint
+from tool_runtime import ToolRuntime
+from ui_diff import diff, encode_diff, identities
+from ui_snapshot import UISnapshot
+
+
+def test_identities():
+    """Identities survive a window title change and tell look-alike siblings apart"""
+    window = FakeElement('Untitled - Paint', control_type='Window', children=[
+        FakeElement('', control_type='Button'), FakeElement('', control_type='Button')])
+    before = UISnapshot.capture(window)
+    window.name = 'sketch.png - Paint'
+    after = UISnapshot.capture(window)
+
+    ids = identities(after)
+    assert ids == identities(before) and len(set(ids)) == 3
+    assert diff(before, after) == {'added': [], 'removed': [], 'changed': [(0, 0, ['name'])]}
+    text, count = encode_diff(before, after)
+    assert count == 0 and text.startswith('No UI changes')
+    print("✓ Stable identities")
+
+
+def test_changed_display():
+    """A control keeping its automation id but changing its name is reported as changed"""
+    window = fake_calculator()
+    before = UISnapshot.capture(window)
+    display = next(e for e in window.walk() if e.automation_id == 'CalculatorResults')
+    # The real Calculator display announces its value through its name
+    display.name = 'Display is 7'
+    after = UISnapshot.capture(window)
+
+    text, count = encode_diff(before, after)
+    assert count == 1
+    assert "~ 1 'Display is 7' @CalculatorResults (name was 'Display is 0')" in text
+    print(f"✓ Changed control reported:\n  {text.splitlines()[1]}")
+
+
+def test_added_and_removed():
+    """New palette entries and removed controls show up, containers do not"""
+    window = fake_paint()
+    before = UISnapshot.capture(window)
+    palette = window.child_elements[0]
+    palette.child_elements = [e for e in palette.child_elements if e.name != 'White']
+    palette.child_elements.append(FakeElement('Custom 1', automation_id='CustomColor1'))
+    after = UISnapshot.capture(window)
+
+    delta = diff(before, after)
+    assert len(delta['added']) == 1 and len(delta['removed']) == 1 and not delta['changed']
+    text, count = encode_diff(before, after, goal='custom')
+    lines = text.splitlines()
+    assert count == 2
+    assert lines[1] == "+ 8 Button 'Custom 1' @CustomColor1" and lines[2] == "- Button 'White'"
+    print("✓ Added and removed controls reported")
+
+
+def test_incremental_inspector():
+    """Repeated inspections return only the delta"""
+    fake = FakeDesktop({'mspaint': fake_paint})
+    window = fake.open_application('mspaint')
+    runtime = ToolRuntime(fake)
+    inspector = runtime.inspector
+
+    first = inspector.inspect('mspaint')
+    again = inspector.inspect('mspaint')
+    window.child_elements[0].child_elements.append(FakeElement('Custom 1'))
+    runtime.touched('mspaint')
+    delta = inspector.inspect('mspaint')
+    full = inspector.inspect('mspaint', full=True)
+
+    assert first.startswith('9/9 controls') and again.startswith('No UI changes')
+    assert delta.splitlines()[1:] == ["+ 9 Button 'Custom 1'"]
+    assert full.startswith('10/10 controls') and runtime.snapshots['mspaint'].has('name:Custom 1')
+    assert inspector.stats() == {'full': 2, 'delta': 1, 'unchanged': 1,
+                                 'chars': len(first) + len(again) + len(delta) + len(full)}
+    print(f"✓ Full listing {len(first)} chars, unchanged {len(again)} chars, delta {len(delta)} chars")
+
+
+def test_inspections_crawl_only_after_actions():
+    """Repeated inspections reuse the snapshot; a tool action makes the next one crawl again"""
+    fake = FakeDesktop({'mspaint': fake_paint})
+    window = fake.open_application('mspaint')
+    runtime = ToolRuntime(fake)
+    inspector = runtime.inspector
+
+    inspector.inspect('mspaint')
+    crawl = fake.nodes_visited
+    for _ in range(5):
+        inspector.inspect('mspaint', goal='red')
+    assert crawl > 0 and fake.nodes_visited == crawl
+
+    window.child_elements[0].child_elements.append(FakeElement('Custom 1'))
+    runtime.touched('mspaint')
+    delta = inspector.inspect('mspaint')
+    assert fake.nodes_visited > crawl and "+ 9 Button 'Custom 1'" in delta
+    print(f"✓ 6 inspections without actions walked {crawl} nodes, one re-crawl after an action")
+
+
+def test_goal_lists_controls_cut_from_the_listing():
+    """Asking again with a goal reaches controls the truncated first listing left out"""
+    def big_paint():
+        return FakeElement('Untitled - Paint', control_type='Window', children=[
+            FakeElement(f'Tool {n}', automation_id=f'Tool{n}') for n in range(80)
+        ] + [FakeElement('Red', automation_id='Red')])
+
+    fake = FakeDesktop({'mspaint': big_paint})
+    fake.open_application('mspaint')
+    inspector = ToolRuntime(fake).inspector
+
+    first = inspector.inspect('mspaint')
+    red = inspector.inspect('mspaint', goal='red color')
+    again = inspector.inspect('mspaint', goal='red color')
+    other = inspector.inspect('mspaint')
+
+    assert 'more; inspect again with a goal' in first and "'Red'" not in first
+    assert red.splitlines()[1] == "81 0 'Red'" and again == red
+    assert other.startswith('No UI changes')
+    assert inspector.stats()['full'] == 3
+    print(f"✓ Goal listing reached the control cut from the first {first.split()[0]} listing")
+
+
+if __name__ == "__main__":
+    print("=== UI Tree Diff Test ===\n")
+
+    tests = [
+        ("Identities", test_identities),
+        ("Changed display", test_changed_display),
+        ("Added and removed", test_added_and_removed),
+        ("Incremental inspector", test_incremental_inspector),
+        ("Crawl only after actions", test_inspections_crawl_only_after_actions),
+        ("Goal after truncated listing", test_goal_lists_controls_cut_from_the_listing),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+UI snapshot test script
+Tests one-pass crawling, indexed selector lookups and recorded snapshots
+against the fake desktop backend (no Windows needed)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from fake_desktop import FakeDesktop, fake_calculator, fake_paint
+from tool_runtime import ToolRuntime
+from ui_snapshot import UISnapshot, parse_selector
+
+SELECTORS = ['automationid:CalculatorResults', 'name:Plus', 'name:Seven', 'name:Equals', 'name:Clear']
+
+
+def make_desktop():
+    """Fake desktop with Calculator open"""
+    fake = FakeDesktop({'calc': fake_calculator, 'mspaint': fake_paint})
+    fake.open_application('calc')
+    return fake
+
+
+def test_indexed_lookups():
+    """Selectors resolve from the indexes without walking the tree again"""
+    fake = make_desktop()
+    snapshot = UISnapshot.capture(fake.application('calc'))
+    crawled = fake.nodes_visited
+
+    started = time.perf_counter()
+    for _ in range(100):
+        for selector in SELECTORS:
+            assert snapshot.element(selector) is not None
+    indexed = time.perf_counter() - started
+    visited = fake.nodes_visited - crawled
+
+    started = time.perf_counter()
+    for _ in range(100):
+        for selector in SELECTORS:
+            fake.locator(selector).first()
+    walked = time.perf_counter() - started
+
+    assert visited == 0 and snapshot.element('name:Plus').name == 'Plus'
+    assert snapshot.find('role:Button') == snapshot.find('class:Button')
+    assert len(snapshot.find('class:Button')) == 19
+    assert snapshot.find('class:Button name:Equals') == snapshot.find('name:Equals')
+    assert snapshot.find('class:Text name:Equals') == [] and not snapshot.has('name:Nothing')
+    print(f"✓ {len(snapshot)} nodes crawled in {snapshot.seconds * 1000:.2f} ms; 500 lookups "
+          f"{indexed * 1000:.2f} ms indexed vs {walked * 1000:.2f} ms walking the tree")
+
+
+def test_selector_parsing():
+    """Compound selectors split on kinds, names keep their spaces"""
+    assert parse_selector('class:Button name:Brush') == [('control_type', 'Button'), ('name', 'Brush')]
+    assert parse_selector('name:Untitled - Paint') == [('name', 'Untitled - Paint')]
+    try:
+        parse_selector('colour:Red')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid selector accepted")
+    print("✓ Selectors parsed")
+
+
+def test_bounds():
+    """Depth and node limits bound the crawl"""
+    window = make_desktop().application('calc')
+    shallow = UISnapshot.capture(window, max_depth=1)
+    capped = UISnapshot.capture(window, max_nodes=5)
+    assert len(shallow) == 3 and not shallow.has('name:Plus')
+    assert len(capped) == 5 and capped.truncated
+    assert shallow.children(0) == [1, 2] and shallow.node(2)['parent'] == 0
+    print("✓ Crawl bounded by depth and node count")
+
+
+def test_recorded_snapshot():
+    """A saved snapshot answers the same lookups with no desktop"""
+    original = UISnapshot.capture(make_desktop().application('calc'))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'calculator_tree.json')
+        original.save(path)
+        recorded = UISnapshot.load(path)
+
+    assert recorded.nodes() == original.nodes()
+    for selector in SELECTORS:
+        assert recorded.find(selector) == original.find(selector)
+    assert recorded.element('name:Plus') is None
+    print(f"✓ Recorded snapshot of {len(recorded)} nodes replayed")
+
+
+def test_runtime_snapshots():
+    """The tool runtime keeps the latest snapshot per application"""
+    fake = make_desktop()
+    fake.open_application('mspaint')
+    runtime = ToolRuntime(fake)
+    paint = runtime.snapshot('mspaint')
+    assert runtime.snapshot('mspaint') is paint and paint.has('automationid:Canvas')
+    assert runtime.snapshot('mspaint', refresh=True) is not paint
+    assert runtime.snapshot('calc').has('name:Equals')
+    print("✓ Runtime snapshots cached per application")
+
+
+if __name__ == "__main__":
+    print("=== UI Snapshot Test ===\n")
+
+    tests = [
+        ("Indexed lookups", test_indexed_lookups),
+        ("Selector parsing", test_selector_parsing),
+        ("Bounds", test_bounds),
+        ("Recorded snapshot", test_recorded_snapshot),
+        ("Runtime snapshots", test_runtime_snapshots),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
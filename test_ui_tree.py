@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+UI tree encoder test script
+Tests compact, budgeted UI tree listings against fake element trees
+"""
+
+import sys
+
+from fake_desktop import FakeElement, fake_paint
+from ui_tree import collect, encode, encode_tree, estimate_tokens
+
+
+def big_paint():
+    """Fake Paint window with a ribbon of tool groups around the usual palette and canvas"""
+    window = fake_paint()
+    groups = []
+    for g in range(12):
+        buttons = [FakeElement(f'Tool {g}-{b}', automation_id=f'Tool{g}x{b}') for b in range(15)]
+        label = FakeElement(f'Group {g} label', control_type='Text')
+        groups.append(FakeElement(f'Group {g}', control_type='Group', children=[label] + buttons))
+    brush = FakeElement('Brushes', automation_id='BrushTool', control_type='SplitButton')
+    ribbon = FakeElement('Ribbon', control_type='Pane', children=groups + [brush])
+    window.child_elements.insert(0, ribbon)
+    return window
+
+
+class MethodElement:
+    """Element exposing name()/role()/id() methods like the Terminator SDK"""
+
+    def __init__(self, name, role, element_id='', children=()):
+        self._name, self._role, self._id, self._children = name, role, element_id, list(children)
+
+    def name(self):
+        return self._name
+
+    def role(self):
+        return self._role
+
+    def id(self):
+        return self._id
+
+    def children(self):
+        return self._children
+
+
+def test_prunes_containers():
+    """Groups, labels and the window itself are not listed"""
+    text, ids = encode_tree(fake_paint())
+    assert "'Colors'" not in text and 'Untitled' not in text
+    assert ids[9] == 'automationid:Canvas' and ids[3] == 'name:Red'
+    assert text.splitlines()[0].startswith('9/9 controls (11 nodes read). Types: 0=Button 1=Pane')
+    print(f"✓ 11 nodes read, 9 controls listed in ~{estimate_tokens(text)} tokens")
+
+
+def test_budget_and_goal():
+    """A big tree stays under the budget and goal matches come first"""
+    window = big_paint()
+    nodes = collect(window)
+    text, ids = encode(nodes, goal='brush and red color on the canvas', budget=200)
+
+    lines = text.splitlines()
+    assert estimate_tokens(text) <= 200, estimate_tokens(text)
+    assert len(nodes) == 217 and 0 < len(ids) < 190
+    assert "@BrushTool" in lines[1] and "'Red'" in lines[2] and "'Canvas'" in lines[3]
+    assert 'more; inspect again with a goal' in text
+
+    full, _ = encode(nodes, budget=10000)
+    print(f"✓ {len(ids)} of 190 controls in ~{estimate_tokens(text)} tokens "
+          f"(unbudgeted listing ~{estimate_tokens(full)} tokens)")
+
+
+def test_interned_types_and_ids():
+    """Each control type is named once; numbers stay stable whatever the goal"""
+    nodes = collect(big_paint())
+    plain, plain_ids = encode(nodes, budget=10000)
+    focused, focused_ids = encode(nodes, goal='purple', budget=10000)
+
+    assert plain.count('SplitButton') == 1
+    assert plain_ids == focused_ids
+    number = next(n for n, s in focused_ids.items() if s == 'name:Purple')
+    assert focused.splitlines()[1].startswith(f"{number} ")
+    print("✓ Types interned, IDs independent of goal ordering")
+
+
+def test_method_style_elements():
+    """Elements exposing name()/role()/id() methods are read too"""
+    root = MethodElement('Calculator', 'Window', children=[
+        MethodElement('Display is 0', 'Text', 'CalculatorResults'),
+        MethodElement('Keypad', 'Group', children=[MethodElement('Seven', 'Button', 'num7Button')]),
+    ])
+    text, ids = encode_tree(root)
+    assert ids == {1: 'automationid:CalculatorResults', 2: 'automationid:num7Button'}
+    assert "1 0 'Display is 0' @CalculatorResults" in text
+    print("✓ Method-style elements encoded")
+
+
+if __name__ == "__main__":
+    print("=== UI Tree Encoder Test ===\n")
+
+    tests = [
+        ("Prunes containers", test_prunes_containers),
+        ("Budget and goal", test_budget_and_goal),
+        ("Interned types and IDs", test_interned_types_and_ids),
+        ("Method-style elements", test_method_style_elements),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Vision cache test script
+Tests the content-addressed analysis cache (no Windows or Ollama needed)
+"""
+
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from vision_cache import VisionCache, image_hash
+
+MODEL = "gemma3:4b-it-q4_K_M"
+PROMPT = "Analyze this Paint artwork"
+
+
+def canvas(*stars, size=(896, 537), color='blue'):
+    """Encoded canvas with filled squares standing in for drawn shapes"""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for x, y in stars:
+        draw.rectangle((x - 60, y - 60, x + 60, y + 60), fill=color)
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_identical_canvas_hits_across_runs():
+    """A cached analysis survives a restart and is keyed by prompt and model too"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'vision_cache.json')
+        VisionCache(path).put(canvas((300, 250)), PROMPT, MODEL, "One blue square")
+
+        cache = VisionCache(path)
+        assert cache.get(canvas((300, 250)), PROMPT, MODEL) == "One blue square"
+        assert cache.get(canvas((300, 250)), "Different request", MODEL) is None
+        assert cache.get(canvas((300, 250)), PROMPT, "llava:7b") is None
+        assert cache.get(canvas((300, 250), (600, 300)), PROMPT, MODEL) is None
+
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 3
+    print(f"✓ Persisted hit, hit rate {stats['hit_rate']:.0%}")
+
+
+def test_near_identical_canvas():
+    """The same artwork captured at another resolution is a near hit"""
+    cache = VisionCache(None, max_distance=8)
+    cache.put(canvas((300, 250)), PROMPT, MODEL, "One blue square")
+
+    assert cache.get(canvas((300, 250)), PROMPT, MODEL) == "One blue square"
+    assert cache.get(canvas((200, 166), size=(597, 358)), PROMPT, MODEL) == "One blue square"
+    print(f"✓ Rescaled capture matched ({cache.stats()['near_hits']} near hit)")
+
+
+def test_colors_are_part_of_the_key():
+    """The same outline in another color is a different canvas, even for near matches"""
+    def circle(color):
+        image = Image.new('RGB', (896, 537), 'white')
+        ImageDraw.Draw(image).ellipse((270, 220, 330, 280), outline=color, width=3)
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    cache = VisionCache(None, max_distance=8)
+    assert image_hash(circle('red')) == image_hash(circle('black'))
+    cache.put(circle('red'), PROMPT, MODEL, "A red circle")
+
+    assert cache.get(circle('red'), PROMPT, MODEL) == "A red circle"
+    assert cache.get(circle('black'), PROMPT, MODEL) is None
+    assert cache.get(canvas((300, 250), color='red'), PROMPT, MODEL) is None
+    print("✓ Red and black circles get different keys")
+
+
+def test_lru_eviction_by_count_and_size():
+    """Least recently used entries go first when a cap is hit"""
+    cache = VisionCache(None, max_entries=2, max_bytes=10_000)
+    images = [canvas((150 + i * 200, 250)) for i in range(3)]
+    cache.put(images[0], PROMPT, MODEL, "first")
+    cache.put(images[1], PROMPT, MODEL, "second")
+    cache.get(images[0], PROMPT, MODEL)
+    cache.put(images[2], PROMPT, MODEL, "third")
+
+    assert cache.get(images[1], PROMPT, MODEL) is None
+    assert cache.get(images[0], PROMPT, MODEL) == "first"
+
+    cache.put(images[1], PROMPT, MODEL, "x" * 20_000)
+    assert cache.stats()['entries'] == 1
+    print(f"✓ {cache.stats()['evictions']} evictions kept the cache within its caps")
+
+
+if __name__ == "__main__":
+    print("=== Vision Cache Test ===\n")
+
+    tests = [
+        ("Persistent hits", test_identical_canvas_hits_across_runs),
+        ("Near-identical canvas", test_near_identical_canvas),
+        ("Colors in the key", test_colors_are_part_of_the_key),
+        ("LRU eviction", test_lru_eviction_by_count_and_size),
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+    sys.exit(0 if passed == len(tests) else 1)
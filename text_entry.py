@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Bulk Text Entry - Get long reports into an editor in a handful of calls
+Picks clipboard paste, large-chunk type_text or throttled typing based on the
+text length, verifies the result with a hash of editor.get_text() and reports
+characters per second. A paste puts the user's clipboard text back once the
+pasted text has shown up in the editor.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import subprocess
+import time
+
+# Above this many characters a single clipboard paste beats typing
+PASTE_THRESHOLD = 1000
+# Largest string handed to one type_text() call
+CHUNK_SIZE = 2000
+# Ctrl+V is handled asynchronously; how long to wait for the pasted text
+PASTE_TIMEOUT = 1.0
+PASTE_POLL_INTERVAL = 0.02
+# Pause before restoring the clipboard when the editor text cannot be read
+PASTE_SETTLE = 0.2
+METHODS = ('auto', 'paste', 'chunked', 'throttled')
+
+# Throttled typing pauses after each piece, keyed by how the piece ends
+THROTTLE_PAUSES = {'sentence': 0.1, 'line': 0.05, 'word': 0.01}
+_THROTTLE_PIECE = re.compile(r'[^.!?\n]*[.!?\n]+|[^.!?\n]+')
+
+
+def normalize_text(text):
+    """Editors report CRLF line endings; compare on LF"""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def text_digest(text):
+    """SHA-256 of the normalized text"""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def split_chunks(text, size=CHUNK_SIZE):
+    """Split text into pieces of at most size characters, preferring line breaks"""
+    chunks = []
+    while len(text) > size:
+        cut = text.rfind('\n', 0, size) + 1 or size
+        chunks.append(text[:cut])
+        text = text[cut:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def split_throttled(text):
+    """Split text into sentence/line pieces for typing with a visible rhythm"""
+    pieces = []
+    for piece in _THROTTLE_PIECE.findall(text):
+        if piece.endswith('\n'):
+            pause = THROTTLE_PAUSES['line']
+        elif piece.rstrip()[-1:] in '.!?' and piece.strip():
+            pause = THROTTLE_PAUSES['sentence']
+        else:
+            pause = THROTTLE_PAUSES['word']
+        pieces.append((piece, pause))
+    return pieces
+
+
+def set_clipboard(text):
+    """Put text on the Windows clipboard; returns False where that is not possible"""
+    if os.name != 'nt':
+        return False
+    try:
+        # clip.exe reads UTF-16 with a BOM, which keeps emoji intact
+        subprocess.run(['clip'], input=text.encode('utf-16'), check=True)
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def get_clipboard():
+    """Text currently on the Windows clipboard, or None when there is none or it cannot be read"""
+    if os.name != 'nt':
+        return None
+    try:
+        import ctypes
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+        user32.GetClipboardData.restype = ctypes.c_void_p
+        kernel32.GlobalLock.argtypes = [ctypes.c_void_p]
+        kernel32.GlobalLock.restype = ctypes.c_void_p
+        kernel32.GlobalUnlock.argtypes = [ctypes.c_void_p]
+        if not user32.OpenClipboard(None):
+            return None
+        try:
+            handle = user32.GetClipboardData(13)  # CF_UNICODETEXT
+            pointer = kernel32.GlobalLock(handle) if handle else None
+            if not pointer:
+                return None
+            try:
+                return ctypes.wstring_at(pointer)
+            finally:
+                kernel32.GlobalUnlock(handle)
+        finally:
+            user32.CloseClipboard()
+    except Exception:
+        return None
+
+
+def choose_method(text, method='auto', paste_threshold=PASTE_THRESHOLD):
+    """Resolve 'auto' to a concrete entry method for this text"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown text entry method '{method}', expected one of {METHODS}")
+    if method != 'auto':
+        return method
+    return 'paste' if len(text) >= paste_threshold else 'chunked'
+
+
+def read_text(editor):
+    """Current editor contents, or None when they cannot be read"""
+    try:
+        return normalize_text(editor.get_text().text)
+    except Exception:
+        return None
+
+
+def verify_text(editor, text, before=None):
+    """Check the editor now ends with text by comparing hashes of the new tail"""
+    if not text:
+        return True
+    content = read_text(editor)
+    if content is None:
+        return None
+    expected = normalize_text(text)
+    tail = content[len(before):] if before and content.startswith(before) else content[-len(expected):]
+    return text_digest(tail) == text_digest(expected)
+
+
+class TextWriter:
+    """Writes text into an editor element and keeps per-call throughput stats"""
+
+    def __init__(self, paste_threshold=PASTE_THRESHOLD, chunk_size=CHUNK_SIZE,
+                 clipboard=set_clipboard, verify=True, read_clipboard=get_clipboard,
+                 paste_timeout=PASTE_TIMEOUT, poll_interval=PASTE_POLL_INTERVAL):
+        self.paste_threshold = paste_threshold
+        self.chunk_size = chunk_size
+        self.clipboard = clipboard
+        self.read_clipboard = read_clipboard
+        self.verify = verify
+        self.paste_timeout = paste_timeout
+        self.poll_interval = poll_interval
+        self.history = []
+
+    def _send_paste(self, editor, text):
+        """Put text on the clipboard and press Ctrl+V
+
+        Returns the previous clipboard text ('' when there was none) or None
+        when pasting is unavailable.
+        """
+        previous = self.read_clipboard() or ''
+        if not self.clipboard(text):
+            return None
+        try:
+            editor.press_key('{Ctrl}v')
+        except Exception as e:
+            print(f"⚠ Paste failed ({e}), typing instead")
+            self._restore_clipboard(previous)
+            return None
+        return previous
+
+    def _restore_clipboard(self, previous):
+        """Put the user's clipboard text back"""
+        if previous:
+            self.clipboard(previous)
+
+    def _paste(self, editor, text, before):
+        """Clipboard paste; returns the number of UI calls or None if unavailable"""
+        previous = self._send_paste(editor, text)
+        if previous is None:
+            return None
+        # Restoring before the editor took the paste would paste the old clipboard
+        deadline = time.monotonic() + self.paste_timeout
+        try:
+            pasted = verify_text(editor, text, before)
+            while pasted is False and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                pasted = verify_text(editor, text, before)
+            if pasted is None:
+                time.sleep(PASTE_SETTLE)
+        finally:
+            self._restore_clipboard(previous)
+        return 1
+
+    async def _paste_async(self, editor, text, before):
+        """Async variant of _paste() that yields to the event loop while waiting"""
+        previous = self._send_paste(editor, text)
+        if previous is None:
+            return None
+        deadline = time.monotonic() + self.paste_timeout
+        try:
+            pasted = verify_text(editor, text, before)
+            while pasted is False and time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                pasted = verify_text(editor, text, before)
+            if pasted is None:
+                await asyncio.sleep(PASTE_SETTLE)
+        finally:
+            self._restore_clipboard(previous)
+        return 1
+
+    def _chunked(self, editor, text):
+        chunks = split_chunks(text, self.chunk_size)
+        for chunk in chunks:
+            editor.type_text(chunk)
+        return len(chunks)
+
+    def _report(self, text, method, calls, started, verified):
+        """Record and return throughput stats for one write"""
+        seconds = time.perf_counter() - started
+        result = {
+            'method': method,
+            'chars': len(text),
+            'calls': calls,
+            'seconds': seconds,
+            'chars_per_sec': len(text) / seconds if seconds > 0 else float('inf'),
+            'verified': verified,
+        }
+        self.history.append(result)
+        if verified is False:
+            print(f"⚠ Text check failed after {method} entry ({len(text)} chars)")
+        return result
+
+    def _start(self, editor, text, method):
+        """Pick the method and snapshot the editor for verification"""
+        method = choose_method(text, method, self.paste_threshold)
+        # A paste is waited for by checking the text, so it needs the snapshot too
+        before = read_text(editor) if self.verify or method == 'paste' else None
+        return method, before, time.perf_counter()
+
+    def write(self, editor, text, method='auto'):
+        """Write text into editor; returns method, calls, seconds, chars_per_sec and verified"""
+        method, before, started = self._start(editor, text, method)
+
+        calls = None
+        if method == 'paste':
+            calls = self._paste(editor, text, before)
+            if calls is None:
+                method = 'chunked'
+        if method == 'throttled':
+            calls = 0
+            for piece, pause in split_throttled(text):
+                editor.type_text(piece)
+                calls += 1
+                time.sleep(pause)
+        elif calls is None:
+            calls = self._chunked(editor, text)
+
+        verified = verify_text(editor, text, before) if self.verify else None
+        return self._report(text, method, calls, started, verified)
+
+    async def write_async(self, editor, text, method='auto'):
+        """Async variant of write() that yields to the event loop between throttled pieces"""
+        method, before, started = self._start(editor, text, method)
+
+        calls = None
+        if method == 'paste':
+            calls = await self._paste_async(editor, text, before)
+            if calls is None:
+                method = 'chunked'
+        if method == 'throttled':
+            calls = 0
+            for piece, pause in split_throttled(text):
+                editor.type_text(piece)
+                calls += 1
+                await asyncio.sleep(pause)
+        elif calls is None:
+            calls = self._chunked(editor, text)
+
+        verified = verify_text(editor, text, before) if self.verify else None
+        return self._report(text, method, calls, started, verified)
+
+
+# One writer shared by every script in a process
+_shared = None
+
+
+def shared_writer():
+    """Get the process-wide TextWriter"""
+    global _shared
+    if _shared is None:
+        _shared = TextWriter()
+    return _shared
+
+
+def write_text(editor, text, method='auto'):
+    """Write text into an editor with the shared writer and print the throughput"""
+    result = shared_writer().write(editor, text, method)
+    print(f"✓ Typed {result['chars']} chars via {result['method']} "
+          f"in {result['seconds']:.2f}s ({result['chars_per_sec']:.0f} chars/s)")
+    return result
+
+
+async def write_text_async(editor, text, method='auto'):
+    """Async variant of write_text()"""
+    result = await shared_writer().write_async(editor, text, method)
+    print(f"✓ Typed {result['chars']} chars via {result['method']} "
+          f"in {result['seconds']:.2f}s ({result['chars_per_sec']:.0f} chars/s)")
+    return result
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Tool Runtime - Handles shared by every agent tool call
+One desktop (behind the element cache), the bounded LLM pool, one LLM client
+per model, one instance of each helper tool and the latest UI snapshot per
+application are created on first use and reused afterwards, so a whole agent
+run pays for them once instead of on every tool call. Selector lookups for an
+application go to its snapshot index first and only walk the tree on a miss.
+"""
+
+import threading
+import time
+
+from element_cache import CachedDesktop, is_alive, resolve_element
+from llm_client import shared_llm_pool
+from selector_resolver import shared_resolver
+from ui_diff import IncrementalInspector
+from ui_snapshot import UISnapshot
+
+# An inspection crawls again after this long even if no tool acted on the app
+SNAPSHOT_MAX_AGE = 30.0
+# Selectors a typical Paint tool call looks up (benchmark workload)
+BENCHMARK_SELECTORS = ['automationid:Canvas', 'name:Black']
+
+
+def ollama_llm(model):
+    """Default LLM factory: a LangChain OllamaLLM (imported on first use)"""
+    from langchain_ollama import OllamaLLM
+    return OllamaLLM(model=model)
+
+
+class AppDesktop:
+    """Desktop view of one application whose locator() resolves through the runtime's snapshot
+
+    Pass it wherever a desktop is expected (SelectorResolver.resolve,
+    StrokeExecutor, canvas_bounds); everything else goes to the shared desktop.
+    """
+
+    def __init__(self, runtime, app_name):
+        self.runtime = runtime
+        self.app_name = app_name
+
+    def __getattr__(self, name):
+        if name in ('runtime', 'app_name'):
+            raise AttributeError(name)
+        return getattr(self.runtime.desktop, name)
+
+    def locator(self, selector, window=None):
+        """Live element for a selector, from the snapshot index when it has one"""
+        if window is not None:
+            return self.runtime.desktop.locator(selector, window)
+        return self.runtime.element(self.app_name, selector)
+
+
+class ToolRuntime:
+    """Desktop, element cache, LLM clients, selector ranking and helper tools shared by agent tools"""
+
+    def __init__(self, desktop=None, llm_factory=None, pool=None, validate_after=5.0, resolver=None):
+        """desktop=None opens a terminator.Desktop() the first time one is needed"""
+        if desktop is not None and not isinstance(desktop, CachedDesktop):
+            desktop = CachedDesktop(desktop, validate_after=validate_after)
+        self._desktop = desktop
+        self._pool = pool
+        self._resolver = resolver
+        self.llm_factory = llm_factory or ollama_llm
+        self.validate_after = validate_after
+        self.llms = {}
+        self.tools = {}
+        self.snapshots = {}
+        # Applications a tool acted on since their snapshot was taken
+        self.touched_apps = set()
+        self.apps = {}
+        self._inspector = None
+        self.created = {'desktops': 0, 'llms': 0, 'tools': 0}
+        self.lookups = {'indexed': 0, 'walked': 0}
+        # Tools run on the agent's worker thread, the LLM pool on its own threads
+        self.lock = threading.RLock()
+
+    @property
+    def desktop(self):
+        """The shared CachedDesktop"""
+        with self.lock:
+            if self._desktop is None:
+                self._desktop = CachedDesktop(validate_after=self.validate_after)
+                self.created['desktops'] += 1
+            return self._desktop
+
+    @property
+    def pool(self):
+        """The bounded LLM thread pool (the process-wide one unless injected)"""
+        return self._pool if self._pool is not None else shared_llm_pool()
+
+    @property
+    def resolver(self):
+        """Learned selector order for multi-selector lookups (the process-wide one unless injected)"""
+        return self._resolver if self._resolver is not None else shared_resolver()
+
+    def llm(self, model):
+        """One LLM client per model"""
+        with self.lock:
+            if model not in self.llms:
+                self.llms[model] = self.llm_factory(model)
+                self.created['llms'] += 1
+            return self.llms[model]
+
+    def snapshot(self, app_name, refresh=False):
+        """Indexed snapshot of an application's window, crawled again only when refresh is set"""
+        with self.lock:
+            if refresh or app_name not in self.snapshots:
+                self.snapshots[app_name] = UISnapshot.capture(self.desktop.application(app_name))
+            return self.snapshots[app_name]
+
+    def expand(self, app_name, selector):
+        """Turn a control number from the last inspection ('#12') into its selector"""
+        if not selector.startswith('#'):
+            return selector
+        number = selector[1:].strip()
+        found = self.inspector.selector(app_name, int(number)) if number.isdigit() else None
+        if found is None:
+            raise RuntimeError(f"Unknown control {selector} in {app_name}; inspect the UI to get current numbers")
+        return found
+
+    def element(self, app_name, selector):
+        """Live element for a selector: the app's snapshot index first, a tree walk only on a miss
+
+        selector may also be a control number from the last inspection ('#12').
+        """
+        selector = self.expand(app_name, selector)
+        with self.lock:
+            try:
+                element = self.snapshot(app_name).element(selector)
+            except Exception:
+                # The application is not open (yet); let the locator report it
+                element = None
+            if element is not None:
+                if is_alive(element):
+                    self.lookups['indexed'] += 1
+                    return element
+                # The window went away, so every handle in the snapshot is stale
+                self.forget(app_name)
+            self.lookups['walked'] += 1
+        return resolve_element(self.desktop.locator(selector))
+
+    def touched(self, app_name):
+        """Note that a tool acted on an application, so its next inspection crawls the window again"""
+        with self.lock:
+            self.touched_apps.add(app_name)
+
+    def inspection_snapshot(self, app_name):
+        """Snapshot for an inspection: the cached one unless a tool acted, it aged out or its window closed"""
+        with self.lock:
+            snapshot = self.snapshots.get(app_name)
+            refresh = (snapshot is None or app_name in self.touched_apps
+                       or time.time() - snapshot.taken_at > SNAPSHOT_MAX_AGE
+                       or (snapshot.elements and not is_alive(snapshot.elements[0])))
+            self.touched_apps.discard(app_name)
+            return self.snapshot(app_name, refresh=refresh)
+
+    def forget(self, app_name):
+        """Drop an application's snapshot, e.g. after opening a new window of it"""
+        with self.lock:
+            self.snapshots.pop(app_name, None)
+            self.touched_apps.discard(app_name)
+
+    def app(self, app_name):
+        """AppDesktop whose lookups go through this application's snapshot"""
+        with self.lock:
+            if app_name not in self.apps:
+                self.apps[app_name] = AppDesktop(self, app_name)
+            return self.apps[app_name]
+
+    @property
+    def inspector(self):
+        """Incremental UI inspector that diffs against what the agent was last shown
+
+        It only crawls the window again after a tool reported acting on the
+        app (touched()), otherwise the cached snapshot is diffed at no cost.
+        """
+        with self.lock:
+            if self._inspector is None:
+                self._inspector = IncrementalInspector(self.inspection_snapshot)
+            return self._inspector
+
+    def tool(self, cls):
+        """One instance of a tool class bound to this runtime (e.g. the UI inspector)"""
+        with self.lock:
+            if cls not in self.tools:
+                self.tools[cls] = cls(runtime=self)
+                self.created['tools'] += 1
+            return self.tools[cls]
+
+    def stats(self):
+        """Handles created so far, snapshot vs. tree-walk lookups and the element cache counters"""
+        stats = dict(self.created)
+        stats['lookups'] = dict(self.lookups)
+        if self._desktop is not None:
+            stats['elements'] = self._desktop.stats()
+        return stats
+
+
+def benchmark(calls=25, desktop_factory=None, llm_factory=None, model="gemma3:4b-it-q4_K_M",
+              selectors=BENCHMARK_SELECTORS):
+    """Per-tool-call overhead with fresh handles per call vs. one shared runtime
+
+    Every simulated call gets a desktop, resolves the selectors a drawing
+    tool needs and gets an LLM client. Returns {'before': ..., 'after': ...}
+    with seconds per call and the desktops/LLMs/tree lookups each run made.
+    """
+    if desktop_factory is None:
+        import terminator
+        desktop_factory = terminator.Desktop
+    llm_factory = llm_factory or ollama_llm
+
+    def call(desktop, llm):
+        for selector in selectors:
+            desktop.locator(selector)
+        llm(model)
+
+    def fresh():
+        started = time.perf_counter()
+        misses = 0
+        for _ in range(calls):
+            desktop = CachedDesktop(desktop_factory())
+            call(desktop, llm_factory)
+            misses += desktop.misses
+        return {'seconds_per_call': (time.perf_counter() - started) / calls,
+                'desktops': calls, 'llms': calls, 'lookups': misses}
+
+    def shared():
+        started = time.perf_counter()
+        runtime = ToolRuntime(desktop_factory(), llm_factory=llm_factory)
+        for _ in range(calls):
+            call(runtime.desktop, runtime.llm)
+        return {'seconds_per_call': (time.perf_counter() - started) / calls,
+                'desktops': 1, 'llms': runtime.created['llms'], 'lookups': runtime.desktop.misses}
+
+    return {'calls': calls, 'before': fresh(), 'after': shared()}
+
+
+def describe(result):
+    """One-line summary of a benchmark() result"""
+    before, after = result['before'], result['after']
+    speedup = before['seconds_per_call'] / after['seconds_per_call'] if after['seconds_per_call'] else 0.0
+    return (f"{result['calls']} tool calls: {before['seconds_per_call'] * 1000:.2f} ms/call with fresh handles "
+            f"({before['desktops']} desktops, {before['llms']} LLMs, {before['lookups']} lookups) vs "
+            f"{after['seconds_per_call'] * 1000:.2f} ms/call shared "
+            f"({after['desktops']} desktop, {after['llms']} LLM, {after['lookups']} lookups), {speedup:.1f}x")
+
+
+# One runtime shared by every agent tool in a process
+_shared = None
+
+
+def shared_runtime():
+    """Get the process-wide ToolRuntime"""
+    global _shared
+    if _shared is None:
+        _shared = ToolRuntime()
+    return _shared
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+UI Tree Diff - Report only what changed between two UI inspections
+Matches elements of two snapshots by a stable identity (their path of
+control type plus automation id or name, with an ordinal for look-alike
+siblings) and lists the added, removed and changed controls. Repeated
+inspections then cost the agent a few lines instead of the whole listing.
+"""
+
+from ui_snapshot import FIELDS
+from ui_tree import (CHARS_PER_TOKEN, DEFAULT_BUDGET, encode_snapshot, goal_words, listed, relevance,
+                     selector as node_selector, short_name)
+
+_MORE_CHANGES = "\n… {} more changes; inspect with full listing to see everything."
+
+
+def identities(snapshot):
+    """Stable identity of every node: the path of (control type, automation id or name, ordinal)"""
+    result = []
+    seen = {}
+    types, aids, names = (snapshot.columns[f] for f in ('control_type', 'automation_id', 'name'))
+    for i, parent in enumerate(snapshot.parent):
+        if parent < 0:
+            # The window title changes with the document, so the root is matched on type only
+            result.append(((types[i],),))
+            continue
+        key = (types[i], aids[i] or names[i])
+        parent_identity = result[parent]
+        ordinal = seen.get((parent_identity, key), 0)
+        seen[(parent_identity, key)] = ordinal + 1
+        result.append(parent_identity + ((key, ordinal),))
+    return result
+
+
+def diff(old, new):
+    """{'added': [new index], 'removed': [old index], 'changed': [(old index, new index, fields)]}"""
+    old_index = {identity: i for i, identity in enumerate(identities(old))}
+    added, changed = [], []
+    matched = set()
+    for j, identity in enumerate(identities(new)):
+        i = old_index.get(identity)
+        if i is None:
+            added.append(j)
+            continue
+        matched.add(i)
+        fields = [f for f in FIELDS if old.columns[f][i] != new.columns[f][j]]
+        if fields:
+            changed.append((i, j, fields))
+    removed = [i for i in range(len(old)) if i not in matched]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def encode_diff(old, new, goal=None, budget=DEFAULT_BUDGET):
+    """Compact listing of the listable controls that changed; returns (text, count)
+
+    Added and changed controls carry their number in the new full listing;
+    controls matching the goal are listed first.
+    """
+    delta = diff(old, new)
+    old_nodes, new_nodes = old.nodes(), new.nodes()
+    old_listed = set(listed(old_nodes))
+    numbers = {index: number for number, index in enumerate(listed(new_nodes), 1)}
+
+    entries = []
+    for j in delta['added']:
+        if j in numbers:
+            node = new_nodes[j]
+            entries.append((node, _describe('+', numbers[j], node, f" {node['control_type']}")))
+    for i in delta['removed']:
+        if i in old_listed:
+            node = old_nodes[i]
+            entries.append((node, _describe('-', None, node, f" {node['control_type']}")))
+    for i, j, fields in delta['changed']:
+        if j in numbers:
+            node = new_nodes[j]
+            was = ', '.join(f"{field} was {old.columns[field][i]!r}" for field in fields)
+            entries.append((node, _describe('~', numbers[j], node, '') + f" ({was})"))
+
+    if not entries:
+        return f"No UI changes since the last inspection ({len(numbers)} controls).", 0
+
+    words = goal_words(goal)
+    if words:
+        entries.sort(key=lambda entry: -relevance(entry[0], words))
+
+    lines = []
+    used = 0
+    limit = budget * CHARS_PER_TOKEN - len(_MORE_CHANGES) - 60
+    for _, line in entries:
+        if used + len(line) + 1 > limit:
+            break
+        lines.append(line)
+        used += len(line) + 1
+
+    header = f"UI changes since the last inspection ({len(numbers)} controls now):"
+    footer = _MORE_CHANGES.format(len(entries) - len(lines)) if len(lines) < len(entries) else ''
+    return header + "\n" + "\n".join(lines) + footer, len(entries)
+
+
+def _describe(sign, number, node, kind):
+    name = short_name(node)
+    line = f"{sign} {number}{kind}" if number is not None else f"{sign}{kind}"
+    if name:
+        line += f" {name!r}"
+    if node['automation_id'] and node['automation_id'] != name:
+        line += f" @{node['automation_id']}"
+    return line
+
+
+class IncrementalInspector:
+    """Remembers what the agent was last shown per application and reports only the changes
+
+    A goal the agent has not listed with yet, or a goal after a listing that
+    was cut to the budget, gets a full listing ranked by that goal, since a
+    delta would hide the controls it is looking for.
+    """
+
+    def __init__(self, capture, budget=DEFAULT_BUDGET):
+        """capture(app_name) returns a fresh UISnapshot"""
+        self.capture = capture
+        self.budget = budget
+        self.previous = {}
+        # Per application: (goal words, whether controls were left out) of the last full listing
+        self.shown = {}
+        self.counts = {'full': 0, 'delta': 0, 'unchanged': 0, 'chars': 0}
+
+    def inspect(self, app_name, goal=None, full=False):
+        """Full listing the first time, when asked or for a new goal, otherwise the delta"""
+        snapshot = self.capture(app_name)
+        previous = self.previous.get(app_name)
+        self.previous[app_name] = snapshot
+
+        words = goal_words(goal)
+        shown_words, truncated = self.shown.get(app_name, (set(), False))
+        if words and (words != shown_words or truncated):
+            full = True
+
+        if full or previous is None:
+            text, ids = encode_snapshot(snapshot, goal, self.budget)
+            self.shown[app_name] = (words, len(ids) < len(listed(snapshot.nodes())))
+            self.counts['full'] += 1
+        else:
+            text, changes = encode_diff(previous, snapshot, goal, self.budget)
+            self.counts['delta' if changes else 'unchanged'] += 1
+        self.counts['chars'] += len(text)
+        return text
+
+    def selector(self, app_name, number):
+        """Selector for a control number ('#12') from the last listing or delta of app_name, or None
+
+        Full listings and deltas both number controls by their place in the
+        full listing of the latest snapshot.
+        """
+        snapshot = self.previous.get(app_name)
+        if snapshot is None:
+            return None
+        nodes = snapshot.nodes()
+        kept = listed(nodes)
+        if not 1 <= number <= len(kept):
+            return None
+        return node_selector(nodes[kept[number - 1]])
+
+    def forget(self, app_name=None):
+        """Drop remembered snapshots so the next inspection is a full listing"""
+        if app_name is None:
+            self.previous.clear()
+            self.shown.clear()
+        else:
+            self.previous.pop(app_name, None)
+            self.shown.pop(app_name, None)
+
+    def stats(self):
+        """Inspections by kind and characters returned to the agent"""
+        return dict(self.counts)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+UI Snapshot - One bounded crawl of a window, indexed for selector lookups
+Walks an application window once (limited by depth and node count), keeps
+every element's name, automation id, control type, role, depth and parent in
+flat parallel lists and indexes them, so resolving 'name:Brush' or
+'automationid:CalculatorResults' is a dictionary lookup instead of another
+tree walk. Snapshots save to and load from JSON, so tests can run against
+recorded trees without a desktop.
+"""
+
+import json
+import re
+import time
+
+DEFAULT_DEPTH = 8
+DEFAULT_MAX_NODES = 2000
+
+# Selector kind -> field index it is looked up in
+SELECTOR_FIELDS = {
+    'name': 'name',
+    'window': 'name',
+    'automationid': 'automation_id',
+    'id': 'automation_id',
+    'class': 'control_type',
+    'controltype': 'control_type',
+    'role': 'role',
+}
+FIELDS = ('name', 'automation_id', 'control_type', 'role')
+
+# 'class:Button name:Brush' -> two terms; names may contain spaces themselves
+_TERM_SPLIT = re.compile(r'\s+(?=[a-z]+:)')
+
+
+def element_field(element, *names):
+    """First non-empty attribute (or zero-argument method) of an element, as a string"""
+    for name in names:
+        try:
+            value = getattr(element, name, None)
+            if callable(value):
+                value = value()
+        except Exception:
+            continue
+        if value:
+            return str(value)
+    return ''
+
+
+def parse_selector(selector):
+    """[(field, value), ...] for a selector such as 'class:Button name:Brush'"""
+    terms = []
+    for term in _TERM_SPLIT.split(selector.strip()):
+        kind, _, value = term.partition(':')
+        field = SELECTOR_FIELDS.get(kind.lower())
+        if field is None or not value:
+            raise ValueError(f"Invalid selector: {selector}")
+        terms.append((field, value))
+    return terms
+
+
+class UISnapshot:
+    """Flat, indexed copy of an element tree (tree order, parent -1 for the root)"""
+
+    def __init__(self, name=None, automation_id=None, control_type=None, role=None,
+                 depth=None, parent=None, elements=None, taken_at=None, truncated=False):
+        self.columns = {
+            'name': list(name or []),
+            'automation_id': list(automation_id or []),
+            'control_type': list(control_type or []),
+            'role': list(role or []),
+        }
+        self.depth = list(depth or [])
+        self.parent = list(parent or [])
+        # Live handles when captured from a desktop, None for loaded snapshots
+        self.elements = list(elements) if elements is not None else None
+        self.taken_at = taken_at or time.time()
+        self.truncated = truncated
+        self.seconds = 0.0
+        self._build_indexes()
+
+    @classmethod
+    def capture(cls, root, max_depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES):
+        """Crawl the tree under root once, depth-first in tree order"""
+        started = time.perf_counter()
+        columns = {field: [] for field in FIELDS}
+        depths, parents, elements = [], [], []
+        stack = [(root, 0, -1)]
+        while stack and len(elements) < max_nodes:
+            element, depth, parent = stack.pop()
+            index = len(elements)
+            # Terminator elements only have role(); read it once for both columns
+            role = element_field(element, 'role')
+            control_type = element_field(element, 'control_type') or role or 'Unknown'
+            columns['name'].append(element_field(element, 'name'))
+            columns['automation_id'].append(element_field(element, 'automation_id', 'id'))
+            columns['control_type'].append(control_type)
+            columns['role'].append(role or control_type)
+            depths.append(depth)
+            parents.append(parent)
+            elements.append(element)
+            if depth >= max_depth:
+                continue
+            try:
+                children = element.children() if hasattr(element, 'children') else []
+            except Exception:
+                children = []
+            stack.extend((child, depth + 1, index) for child in reversed(list(children)))
+
+        snapshot = cls(depth=depths, parent=parents, elements=elements, truncated=bool(stack), **columns)
+        snapshot.seconds = time.perf_counter() - started
+        return snapshot
+
+    def _build_indexes(self):
+        self.indexes = {field: {} for field in FIELDS}
+        for field, values in self.columns.items():
+            index = self.indexes[field]
+            for i, value in enumerate(values):
+                if value:
+                    index.setdefault(value, []).append(i)
+        self.child_index = {}
+        for i, parent in enumerate(self.parent):
+            self.child_index.setdefault(parent, []).append(i)
+
+    def __len__(self):
+        return len(self.depth)
+
+    def node(self, i):
+        """One element as a plain dict"""
+        node = {field: values[i] for field, values in self.columns.items()}
+        node['depth'] = self.depth[i]
+        node['parent'] = self.parent[i]
+        return node
+
+    def nodes(self):
+        """Every element as a dict, in tree order"""
+        return [self.node(i) for i in range(len(self))]
+
+    def children(self, i):
+        """Indices of an element's children"""
+        return list(self.child_index.get(i, []))
+
+    def find(self, selector):
+        """Indices of every element matching a selector, in tree order"""
+        matches = None
+        for field, value in parse_selector(selector):
+            found = self.indexes[field].get(value, [])
+            if matches is None:
+                matches = found
+            else:
+                found = set(found)
+                matches = [i for i in matches if i in found]
+        return list(matches or [])
+
+    def first(self, selector):
+        """Index of the first match, or None"""
+        matches = self.find(selector)
+        return matches[0] if matches else None
+
+    def has(self, selector):
+        """True if anything in the snapshot matches"""
+        return self.first(selector) is not None
+
+    def element(self, selector):
+        """Live handle of the first match (None when absent or for loaded snapshots)"""
+        i = self.first(selector)
+        if i is None or self.elements is None:
+            return None
+        return self.elements[i]
+
+    def stats(self):
+        """Size and crawl time of the snapshot"""
+        return {
+            'nodes': len(self),
+            'truncated': self.truncated,
+            'seconds': self.seconds,
+            'names': len(self.indexes['name']),
+            'automation_ids': len(self.indexes['automation_id']),
+        }
+
+    def to_dict(self):
+        """JSON-ready form (live handles are not kept)"""
+        return {'taken_at': self.taken_at, 'truncated': self.truncated, 'depth': self.depth,
+                'parent': self.parent, **self.columns}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a snapshot from to_dict() output"""
+        return cls(**{key: data[key] for key in FIELDS + ('depth', 'parent', 'taken_at', 'truncated')})
+
+    def save(self, path):
+        """Record the snapshot to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Load a recorded snapshot"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
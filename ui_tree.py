@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+UI Tree Encoder - Compact, budgeted UI trees for agent observations
+Reads an application's accessibility tree once and encodes it as one short
+line per element: a numeric ID, an interned control type code, the name and
+the automation id. Non-interactive containers are pruned, elements matching
+the current goal are listed first and the output is cut at a fixed token
+budget, so inspecting the UI does not blow up every following prompt.
+"""
+
+import re
+
+from ui_snapshot import DEFAULT_DEPTH, DEFAULT_MAX_NODES, UISnapshot
+
+# Rough size of a prompt token in characters (good enough for budgeting)
+CHARS_PER_TOKEN = 4
+DEFAULT_BUDGET = 256
+
+# Control types an agent can act on; other nodes are kept only when they carry an automation id
+INTERACTIVE_TYPES = {
+    'Button', 'CheckBox', 'ComboBox', 'Document', 'Edit', 'Hyperlink', 'List', 'ListItem',
+    'Menu', 'MenuItem', 'RadioButton', 'Slider', 'Spinner', 'SplitButton', 'Tab', 'TabItem',
+    'ToggleButton', 'Tree', 'TreeItem',
+}
+
+_WORD = re.compile(r'[a-z0-9]{3,}')
+_SELECT_NOTE = "\nSelect with '#<number>', 'automationid:<@id>' or 'name:<name>'."
+_MORE_NOTE = "\n… {} more; inspect again with a goal to narrow down."
+
+
+def collect(root, max_depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES):
+    """Crawl the tree under root once into a list of node dicts (tree order)"""
+    return UISnapshot.capture(root, max_depth, max_nodes).nodes()
+
+
+def is_interactive(node):
+    """Worth showing to the agent: an actionable control or anything with an automation id"""
+    return node['control_type'] in INTERACTIVE_TYPES or bool(node['automation_id'])
+
+
+def goal_words(goal):
+    """Lower-case words (3+ characters) of a goal, plural 's' dropped"""
+    words = set()
+    for word in _WORD.findall((goal or '').lower()):
+        words.add(word[:-1] if word.endswith('s') and len(word) > 3 else word)
+    return words
+
+
+def relevance(node, words):
+    """How many goal words appear in the node's name or automation id"""
+    text = f"{node['name']} {node['automation_id']}".lower()
+    return sum(1 for word in words if word in text)
+
+
+def listed(nodes):
+    """Indices of the nodes worth listing; a node's listing number is its position here plus one"""
+    return [i for i, node in enumerate(nodes) if is_interactive(node) and (node['name'] or node['automation_id'])]
+
+
+def selector(node):
+    """Most reliable selector for a node"""
+    if node['automation_id']:
+        return f"automationid:{node['automation_id']}"
+    return f"name:{node['name']}"
+
+
+def estimate_tokens(text):
+    """Approximate prompt tokens for a piece of text"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def short_name(node):
+    """Node name on one line, cut to 40 characters"""
+    return node['name'].replace('\n', ' ')[:40]
+
+
+def _line(number, code, node):
+    name = short_name(node)
+    aid = node['automation_id']
+    line = f"{number} {code} {name!r}" if name else f"{number} {code}"
+    if aid and aid != name:
+        line += f" @{aid}"
+    return line
+
+
+def encode(nodes, goal=None, budget=DEFAULT_BUDGET):
+    """Encode node dicts into a compact listing that fits the token budget
+
+    Returns (text, ids) where ids maps each listed number to its selector.
+    """
+    kept = [nodes[i] for i in listed(nodes)]
+    words = goal_words(goal)
+    order = list(range(len(kept)))
+    if words:
+        # Stable sort: most relevant first, tree order otherwise
+        order.sort(key=lambda i: -relevance(kept[i], words))
+
+    types = {}
+    lines = []
+    ids = {}
+    used = 0
+    # Room for the header counts and both footer lines
+    limit = budget * CHARS_PER_TOKEN - len(_SELECT_NOTE) - len(_MORE_NOTE) - 60
+    for i in order:
+        node = kept[i]
+        code = types.get(node['control_type'], len(types))
+        line = _line(i + 1, code, node)
+        legend = '' if node['control_type'] in types else f"{code}={node['control_type']} "
+        if used + len(line) + len(legend) + 1 > limit:
+            break
+        if legend:
+            types[node['control_type']] = code
+        lines.append(line)
+        ids[i + 1] = selector(node)
+        used += len(line) + len(legend) + 1
+
+    legend = ' '.join(f"{code}={name}" for name, code in types.items())
+    header = f"{len(ids)}/{len(kept)} controls ({len(nodes)} nodes read). Types: {legend}"
+    footer = _SELECT_NOTE
+    if len(ids) < len(kept):
+        footer = _MORE_NOTE.format(len(kept) - len(ids)) + footer
+    return header + "\n" + "\n".join(lines) + footer, ids
+
+
+def encode_snapshot(snapshot, goal=None, budget=DEFAULT_BUDGET):
+    """Encode a UISnapshot; returns (text, ids)"""
+    return encode(snapshot.nodes(), goal, budget)
+
+
+def encode_tree(root, goal=None, budget=DEFAULT_BUDGET, max_depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES):
+    """Crawl the tree under root and encode it; returns (text, ids)"""
+    return encode(collect(root, max_depth, max_nodes), goal, budget)
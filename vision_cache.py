@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Vision Analysis Cache - Content-addressed, persistent results for canvas analyses
+Keys are (coarse colors of the image, perceptual hash of the image, hash of
+the prompt, model), so the same or a near-identical canvas analyzed with the
+same request comes back instantly, across runs. The perceptual hash is
+greyscale, so the color part keeps a red and a black copy of a shape apart;
+near matches are only accepted between images with the same colors.
+Entries are evicted least-recently-used once the entry count or total size
+cap is reached.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from change_detection import hamming, load_image, perceptual_hash
+
+DEFAULT_CACHE_PATH = "vision_cache.json"
+# 16x16 difference hash of the greyscale image
+HASH_SIZE = 16
+# Share of the non-background pixels a coarse color needs to count as present
+COLOR_SHARE = 0.05
+
+
+def prompt_digest(prompt):
+    """Short stable hash of a prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]
+
+
+def image_hash(image):
+    """Perceptual hash used as the shape part of a cache key"""
+    return perceptual_hash(image, size=HASH_SIZE)
+
+
+def color_signature(image, share=COLOR_SHARE):
+    """64-bit mask of the coarse colors (4 levels per channel) present in an image
+
+    The background (most common color) is always set; other colors are set
+    when they cover at least share of the remaining pixels.
+    """
+    levels = np.asarray(load_image(image).convert('RGB')) // 64
+    counts = np.bincount((levels[..., 0] * 16 + levels[..., 1] * 4 + levels[..., 2]).ravel(), minlength=64)
+    background = int(counts.argmax())
+    ink = counts.sum() - counts[background]
+    mask = 1 << background
+    if ink:
+        for color in np.flatnonzero(counts >= share * ink):
+            mask |= 1 << int(color)
+    return mask
+
+
+class VisionCache:
+    """LRU cache of vision analyses persisted as JSON"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=256, max_bytes=2 * 1024 * 1024,
+                 max_distance=0):
+        """max_distance > 0 also accepts images whose hashes differ by that many bits"""
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load()
+
+    def _key(self, image, prompt, model):
+        return f"{model}|{prompt_digest(prompt)}|{color_signature(image):x}|{image_hash(image):x}"
+
+    def load(self):
+        """Read cached analyses from disk (missing or broken files start empty)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', [])
+        except (OSError, ValueError) as e:
+            print(f"⚠ Could not read vision cache {self.path}: {e}")
+            return
+
+        for key, analysis in entries:
+            self._store(key, analysis)
+
+    def save(self):
+        """Write the cache to disk, least recently used first"""
+        if not self.path:
+            return
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self.entries.items())}, f)
+
+    def _store(self, key, analysis):
+        """Insert or refresh an entry and evict down to the caps"""
+        if key in self.entries:
+            self.total_bytes -= len(self.entries.pop(key))
+        self.entries[key] = analysis
+        self.total_bytes += len(analysis)
+
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries
+                                         or self.total_bytes > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _near(self, key):
+        """Key of a cached entry for the same prompt, model and colors within max_distance bits"""
+        prefix, _, hash_hex = key.rpartition('|')
+        prefix += '|'
+        hash_value = int(hash_hex, 16)
+        for cached in reversed(self.entries):
+            if cached.startswith(prefix) and hamming(int(cached[len(prefix):], 16), hash_value) <= self.max_distance:
+                return cached
+        return None
+
+    def get(self, image, prompt, model):
+        """Cached analysis for this image/prompt/model, or None"""
+        key = self._key(image, prompt, model)
+
+        if key not in self.entries and self.max_distance:
+            key = self._near(key)
+            if key is not None:
+                self.near_hits += 1
+
+        if key is None or key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, image, prompt, model, analysis):
+        """Cache an analysis and persist the cache"""
+        self._store(self._key(image, prompt, model), str(analysis))
+        self.save()
+
+    def stats(self):
+        """Hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# One cache shared by every analysis tool in a process
+_shared = None
+
+
+def shared_vision_cache():
+    """Get the process-wide VisionCache backed by DEFAULT_CACHE_PATH"""
+    global _shared
+    if _shared is None:
+        _shared = VisionCache()
+    return _shared